@@ -24,31 +24,50 @@ input validation, and security features.
 # Standard library imports for core functionality
 import os
 import uuid
+import functools
+import atexit
+import concurrent.futures
+import queue
 import asyncio
 import json
 import traceback
 import time
+import threading
+import weakref
+from collections import namedtuple
+from types import SimpleNamespace
+from operator import attrgetter
 
 # Flask framework and extensions
 from flask import Flask, request, jsonify, Response, stream_with_context, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, bindparam, event, insert, inspect, lambda_stmt, literal, or_, select, text, type_coerce, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
 # External dependencies
 from dotenv import load_dotenv
 import httpx
+from cachetools import TTLCache
+import orjson
+import msgspec
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Local module imports - AI and content generation
-from llm_utils import call_llm, call_llm_with_review, get_reviewed_response, call_openai_stream
-from image_gen_utils import create_image_generation_request, process_image_generation, get_session_images
+from llm_utils import call_llm, call_llm_with_review, get_reviewed_response, format_review_status, call_openai_stream, close_llm_client
+from image_gen_utils import create_image_generation_request, process_image_generation, get_session_images, image_generator, close_http_client
 from slack_integration import slack_bot, slack_processor
 
 # Character sheet integration system
 from integrations.character_sheet_manager import CharacterSheetManager, IntegrationType
+from integrations.slack_integration import close_slack_client
 
 # Logging and monitoring system
 from utils.logger import logger, timed, detect_crisis_content
@@ -67,9 +86,23 @@ if os.path.exists(env_path):
 # Initialize Flask application
 app = Flask(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Parse request bodies with orjson; responses keep Flask's encoder and its date format"""
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = OrjsonProvider(app)
+
 # Enable Cross-Origin Resource Sharing for frontend integration
 CORS(app)
 
+# Compress larger JSON payloads (character sheets, review queues) on the wire.
+# Streamed responses (SSE, chat) pass through untouched so frames flush immediately.
+app.config['COMPRESS_ALGORITHM'] = ['zstd', 'br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
 """
 Security Configuration
 """
@@ -111,6 +144,8 @@ Database Configuration
 db_path = os.path.join(os.path.dirname(__file__), 'shadowrun.db')
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Room for every distinct statement the API issues in the compiled SQL cache
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'query_cache_size': 2000}
 
 # Initialize SQLAlchemy ORM
 db = SQLAlchemy(app)
@@ -146,7 +181,26 @@ class ChatMemory(db.Model):
     session_id = db.Column(db.String, db.ForeignKey('session.id'), nullable=False)
     user_id = db.Column(db.String, nullable=False)
     role = db.Column(db.String, nullable=False)  # 'player', 'gm', 'observer'
-    messages = db.Column(db.Text, nullable=False, default="[]")  # JSON-encoded list of {role, content}
+    messages = db.Column(db.LargeBinary, nullable=False, default=b"\x90")  # Legacy MessagePack history; imported into ChatMessage on next turn
+    chat_messages = db.relationship('ChatMessage', back_populates='memory', order_by='ChatMessage.seq')
+
+class ChatMessage(db.Model):
+    """
+    Chat Message Model
+    
+    One turn entry in a chat memory stream. Append-only, so a chat turn
+    inserts its rows without rewriting the history before it.
+    
+    @table chat_message
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    memory_id = db.Column(db.Integer, db.ForeignKey('chat_memory.id'), nullable=False)
+    seq = db.Column(db.Integer, nullable=False)  # Position within the memory stream
+    role = db.Column(db.String, nullable=False)  # 'user', 'assistant'
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    memory = db.relationship('ChatMemory', back_populates='chat_messages')
+    __table_args__ = (db.Index('ix_chat_message_memory_seq', 'memory_id', 'seq', unique=True),)
 
 class Session(db.Model):
     """
@@ -161,6 +215,8 @@ class Session(db.Model):
     name = db.Column(db.String, nullable=False)  # Campaign/session name
     gm_user_id = db.Column(db.String, nullable=False)  # Game Master's user ID
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    user_roles = db.relationship('UserRole', back_populates='session')
+    slack_mappings = db.relationship('SlackSession', back_populates='session')
 
 class UserRole(db.Model):
     """
@@ -175,6 +231,8 @@ class UserRole(db.Model):
     session_id = db.Column(db.String, db.ForeignKey('session.id'), nullable=False)
     user_id = db.Column(db.String, nullable=False)  # User identifier
     role = db.Column(db.String, nullable=False)  # 'player', 'gm', 'observer'
+    session = db.relationship('Session', back_populates='user_roles')
+    __table_args__ = (db.Index('ix_userrole_session_user', 'session_id', 'user_id'),)
 
 class Scene(db.Model):
     """
@@ -247,6 +305,14 @@ class Character(db.Model):
     core_traumas = db.Column(db.Text, nullable=True)  # JSON: Psychological wounds
     core_strengths = db.Column(db.Text, nullable=True)  # JSON: Character strengths
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    serialized_json = db.Column(db.LargeBinary, nullable=True)  # Cached API JSON; NULL when stale
+
+# Character sheet columns a player may edit through the API
+CHARACTER_SHEET_FIELDS = (
+    'name', 'handle', 'archetype', 'background_seed', 'gender', 'pronouns', 'essence_anchor', 'build_method',
+    'attributes', 'skills', 'qualities', 'gear', 'lifestyle', 'contacts', 'narrative_hooks', 'core_traumas',
+    'core_strengths'
+)
 
 class PendingResponse(db.Model):
     """
@@ -332,10 +398,28 @@ class GeneratedImage(db.Model):
     status = db.Column(db.String, nullable=False, default='pending')  # 'pending', 'generating', 'completed', 'failed'
     error_message = db.Column(db.Text, nullable=True)  # Error details if generation failed
     generation_time = db.Column(db.Float, nullable=True)  # Time taken to generate (seconds)
-    tags = db.Column(db.Text, nullable=True)  # JSON: scene tags for categorization
+    tags = db.Column(db.LargeBinary, nullable=True)  # MessagePack list of scene tags for categorization
     is_favorite = db.Column(db.Boolean, nullable=False, default=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     completed_at = db.Column(db.DateTime, nullable=True)
+    
+    @hybrid_property
+    def tags_list(self) -> List:
+        """Decoded tags, memoized on the instance until the raw column changes"""
+        cached = self.__dict__.get('_tags_list')
+        if cached is None or cached[0] is not self.tags:
+            cached = self.__dict__['_tags_list'] = (self.tags, unpack_list(self.tags))
+        return cached[1]
+    
+    @tags_list.expression
+    def tags_list(cls):
+        return cls.tags
+    
+    # Gallery listings: newest first, per session and optionally per user
+    __table_args__ = (
+        db.Index('ix_gi_session_created', 'session_id', 'created_at'),
+        db.Index('ix_gi_session_user_created', 'session_id', 'user_id', 'created_at'),
+    )
 
 class ImageGeneration(db.Model):
     """
@@ -374,6 +458,7 @@ class SlackSession(db.Model):
     slack_channel_id = db.Column(db.String, nullable=False)  # Slack channel ID
     session_id = db.Column(db.String, db.ForeignKey('session.id'), nullable=False)
     created_at = db.Column(db.DateTime, server_default=db.func.now())
+    session = db.relationship('Session', back_populates='slack_mappings')
     
     # Ensure unique mapping per channel
     __table_args__ = (db.UniqueConstraint('slack_team_id', 'slack_channel_id'),)
@@ -565,6 +650,372 @@ class IceProgram(db.Model):
     position_z = db.Column(db.Float, nullable=False, default=0)  # Matrix position Z
     last_action = db.Column(db.DateTime, nullable=True)  # Last action timestamp
 
+"""
+Row Serialization
+
+Per-model projections built once at import time. Each attrgetter pulls
+all columns of a row in a single C-level call, so list endpoints only
+pay for zip() + dict() per row instead of re-evaluating a dict display.
+"""
+
+CHARACTER_FIELDS = ('id', 'user_id') + CHARACTER_SHEET_FIELDS
+_character_row = attrgetter(*CHARACTER_FIELDS)
+
+PENDING_RESPONSE_FIELDS = ('id', 'user_id', 'context', 'ai_response', 'response_type', 'priority')
+_pending_response_row = attrgetter(*PENDING_RESPONSE_FIELDS)
+
+# List-valued columns (chat history, image tags) are stored as MessagePack
+_msgpack_encoder = msgspec.msgpack.Encoder()
+_msgpack_list_decoder = msgspec.msgpack.Decoder(list)
+
+def pack_list(items: List) -> bytes:
+    """Encode a list column value as MessagePack"""
+    return _msgpack_encoder.encode(items)
+
+def unpack_list(data) -> List:
+    """Decode a MessagePack list column; rows written before the switch hold JSON text"""
+    if not data:
+        return []
+    if isinstance(data, str) or data[:1] == b'[':
+        return orjson.loads(data)
+    return _msgpack_list_decoder.decode(data)
+
+def serialize_character(char: Character) -> Dict:
+    """Project a Character row into its API dict"""
+    data = dict(zip(CHARACTER_FIELDS, _character_row(char)))
+    data['created_at'] = char.created_at.isoformat() if char.created_at else None
+    return data
+
+_CHARACTER_JSON_COLUMNS = frozenset(CHARACTER_FIELDS + ('created_at',))
+
+def _character_json(char) -> Optional[bytes]:
+    """Encoded API payload of a Character (or a row carrying its columns); None if not all are loaded"""
+    if isinstance(char, Character) and inspect(char).unloaded & _CHARACTER_JSON_COLUMNS:
+        return None
+    return orjson.dumps(serialize_character(char))
+
+_store_character_json = (
+    update(Character.__table__)
+    .where(Character.__table__.c.id == bindparam('character_id'))
+    .values(serialized_json=bindparam('payload'))
+)
+
+@event.listens_for(Character, 'before_update')
+def _refresh_character_json(mapper, connection, target):
+    """ORM edits re-encode the cached JSON inside their own UPDATE"""
+    target.serialized_json = _character_json(target)
+
+@event.listens_for(Character, 'after_insert')
+def _store_new_character_json(mapper, connection, target):
+    """id and created_at only exist once the INSERT has run, so the payload follows it"""
+    # Sheet columns never set were inserted as NULL; read them from the instance
+    # dict so nothing is lazy-loaded mid-flush
+    values = inspect(target).dict
+    row = SimpleNamespace(**{column: values.get(column) for column in _CHARACTER_JSON_COLUMNS})
+    payload = _character_json(row)
+    connection.execute(_store_character_json, {'character_id': target.id, 'payload': payload})
+    set_committed_value(target, 'serialized_json', payload)
+
+def character_json_payloads(*criteria) -> List[bytes]:
+    """
+    Get the cached API JSON of every character matching criteria
+
+    Reads only the serialized_json column. The cache is filled on the
+    write path; rows it does not cover (NULL: written by Core statements
+    that clear it, or before the column existed) are projected on the
+    fly and left for the next write to fill, so reads never write.
+    """
+    rows = db.session.execute(
+        select(Character.id, Character.serialized_json).where(*criteria).order_by(Character.id)
+    ).all()
+    payloads = {row.id: row.serialized_json for row in rows}
+    stale = [char_id for char_id, payload in payloads.items() if payload is None]
+    if stale:
+        for char in Character.query.filter(Character.id.in_(stale)):
+            payloads[char.id] = orjson.dumps(serialize_character(char))
+    return list(payloads.values())
+
+def serialize_pending_response(pending: PendingResponse) -> Dict:
+    """Project a PendingResponse row into the DM review queue dict"""
+    data = dict(zip(PENDING_RESPONSE_FIELDS, _pending_response_row(pending)))
+    data['created_at'] = pending.created_at.isoformat() if pending.created_at else None
+    return data
+
+def ojsonify(obj, status: int = 200) -> Response:
+    """Like jsonify, but hands orjson's UTF-8 bytes straight to the response"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+# Shared by every SSE endpoint; X-Accel-Buffering stops nginx-style proxies from holding frames back
+SSE_HEADERS = {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+def sse_frame(obj) -> bytes:
+    """Encode one Server-Sent Events data frame"""
+    return b'data: ' + orjson.dumps(obj) + b'\n\n'
+
+def sse_error_frame(error: str, error_type: str, details: str, trace: Optional[str] = None) -> bytes:
+    """Encode an SSE error frame as sent by the streaming LLM endpoints"""
+    payload = {'error': error, 'type': error_type, 'details': details}
+    if trace:
+        payload['trace'] = trace
+    return sse_frame(payload)
+
+"""
+Lookup Caches
+
+Permission checks read the session GM and the caller's role on nearly
+every request. Both are effectively immutable, so they are served from
+process-local TTL caches holding plain value snapshots (never ORM
+instances, which would be detached from the next request's session).
+Misses are not cached so freshly created sessions and joins show up
+immediately; writes to either table invalidate the affected keys.
+"""
+
+SESSION_CACHE_TTL = int(os.getenv('SESSION_CACHE_TTL', 30))
+
+SessionInfo = namedtuple('SessionInfo', ['id', 'name', 'gm_user_id'])
+
+_session_cache = TTLCache(maxsize=10_000, ttl=SESSION_CACHE_TTL)
+_user_role_cache = TTLCache(maxsize=50_000, ttl=SESSION_CACHE_TTL)
+# Read-mostly page data; dropped explicitly by the endpoints that write it
+_scene_cache = TTLCache(maxsize=10_000, ttl=300)
+_session_users_cache = TTLCache(maxsize=10_000, ttl=300)
+_lookup_cache_lock = threading.Lock()
+
+def get_session_info(session_id: str) -> Optional[SessionInfo]:
+    """Get the id, name and GM of a session, or None if it does not exist"""
+    with _lookup_cache_lock:
+        info = _session_cache.get(session_id)
+    if info is not None:
+        return info
+    row = db.session.execute(lambda_stmt(
+        lambda: select(Session.id, Session.name, Session.gm_user_id).where(Session.id == session_id)
+    )).first()
+    if row is None:
+        return None
+    info = SessionInfo(*row)
+    with _lookup_cache_lock:
+        _session_cache[session_id] = info
+    return info
+
+def get_user_role(session_id: str, user_id: str) -> Optional[str]:
+    """Get a user's role in a session, or None if they have not joined"""
+    key = (session_id, user_id)
+    with _lookup_cache_lock:
+        role = _user_role_cache.get(key)
+    if role is not None:
+        return role
+    role = db.session.execute(lambda_stmt(
+        lambda: select(UserRole.role).where(UserRole.session_id == session_id, UserRole.user_id == user_id).limit(1)
+    )).scalar()
+    if role is None:
+        return None
+    with _lookup_cache_lock:
+        _user_role_cache[key] = role
+    return role
+
+def invalidate_session_cache(session_id: str, user_id: Optional[str] = None):
+    """Drop cached lookups for a session, or for one user's role in it"""
+    with _lookup_cache_lock:
+        _session_users_cache.pop(session_id, None)
+        if user_id is None:
+            _session_cache.pop(session_id, None)
+            for key in [k for k in _user_role_cache if k[0] == session_id]:
+                _user_role_cache.pop(key, None)
+        else:
+            _user_role_cache.pop((session_id, user_id), None)
+
+def invalidate_scene_cache(session_id: str):
+    """Drop the cached scene summary for a session"""
+    with _lookup_cache_lock:
+        _scene_cache.pop(session_id, None)
+
+"""
+Write-Behind Queue
+
+Inserts nobody waits on (DM notifications) are queued and committed by a
+background thread in batches, so request latency does not include the
+SQLite journal sync. Only use it for rows whose ids the caller never needs.
+"""
+
+WRITE_BEHIND_BATCH = 100      # Max rows per transaction
+WRITE_BEHIND_INTERVAL = 0.02  # Seconds to wait for a batch to fill
+
+_write_queue: "queue.Queue" = queue.Queue()
+_write_thread: Optional[threading.Thread] = None
+_write_thread_lock = threading.Lock()
+
+def queue_insert(model, **values):
+    """Queue a row for insertion by the write-behind thread"""
+    global _write_thread
+    if _write_thread is None:
+        with _write_thread_lock:
+            if _write_thread is None:
+                _write_thread = threading.Thread(target=_write_behind_worker, name='write-behind', daemon=True)
+                _write_thread.start()
+    _write_queue.put((model.__table__, values))
+
+def flush_write_queue():
+    """Block until every queued row has been committed (or dropped on error)"""
+    if _write_thread is not None:
+        _write_queue.join()
+
+def _write_behind_worker():
+    while True:
+        batch = [_write_queue.get()]
+        deadline = time.monotonic() + WRITE_BEHIND_INTERVAL
+        while len(batch) < WRITE_BEHIND_BATCH:
+            try:
+                batch.append(_write_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        try:
+            rows_by_table = {}
+            for table, values in batch:
+                rows_by_table.setdefault(table, []).append(values)
+            with app.app_context():
+                for table, rows in rows_by_table.items():
+                    db.session.execute(insert(table), rows)
+                db.session.commit()
+        except Exception as e:
+            logger.error("WRITE_BEHIND_BATCH_FAILED", exception=e, rows=len(batch))
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
+
+atexit.register(flush_write_queue)
+
+"""
+Chat Turn Writer
+
+A chat turn is committed off the response path so the stream closes without
+waiting on SQLite. One writer thread keeps turns in submission order; each
+turn takes its seq inside its own transaction, and the next request on the
+same memory waits for that memory's pending write before reading history.
+"""
+
+CHAT_WRITE_ATTEMPTS = 3  # Retries when another process claimed the same seq first
+
+# The executor's own exit hook lets queued turns finish before the interpreter stops
+_chat_writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='chat-writer')
+_pending_chat_writes: Dict[int, concurrent.futures.Future] = {}
+_pending_chat_lock = threading.Lock()
+
+def _persist_chat_turn(memory_id: int, turn: List[Dict]):
+    with app.app_context():
+        for attempt in range(CHAT_WRITE_ATTEMPTS):
+            try:
+                next_seq = db.session.execute(
+                    select(db.func.coalesce(db.func.max(ChatMessage.seq) + 1, 0))
+                    .where(ChatMessage.memory_id == memory_id)
+                ).scalar()
+                db.session.execute(insert(ChatMessage), [
+                    {'memory_id': memory_id, 'seq': next_seq + offset, **message}
+                    for offset, message in enumerate(turn)
+                ])
+                db.session.commit()
+                return
+            except IntegrityError:
+                db.session.rollback()
+                if attempt == CHAT_WRITE_ATTEMPTS - 1:
+                    raise
+            except Exception:
+                db.session.rollback()
+                raise
+
+def _chat_write_done(memory_id: int, future: concurrent.futures.Future):
+    with _pending_chat_lock:
+        if _pending_chat_writes.get(memory_id) is future:
+            del _pending_chat_writes[memory_id]
+    if future.exception() is not None:
+        logger.error("CHAT_TURN_WRITE_FAILED", exception=future.exception(), memory_id=memory_id)
+
+def queue_chat_turn(memory_id: int, turn: List[Dict]) -> concurrent.futures.Future:
+    """Append a turn's messages to a chat memory on the writer thread"""
+    with _pending_chat_lock:
+        future = _chat_writer.submit(_persist_chat_turn, memory_id, turn)
+        _pending_chat_writes[memory_id] = future
+    future.add_done_callback(functools.partial(_chat_write_done, memory_id))
+    return future
+
+def wait_for_chat_turn(memory_id: int):
+    """Block until the memory's last queued turn is committed (or has failed)"""
+    with _pending_chat_lock:
+        future = _pending_chat_writes.get(memory_id)
+    if future is not None:
+        concurrent.futures.wait([future])
+
+def flush_chat_writes():
+    """Block until every queued chat turn has been handled"""
+    _chat_writer.submit(lambda: None).result()
+
+"""
+Async Bridging
+
+Flask handlers are synchronous; LLM and Slack clients are async. These
+helpers run coroutines without building an event loop per call.
+"""
+
+# One long-lived loop shared by every request thread
+_async_loop = asyncio.new_event_loop()
+threading.Thread(target=_async_loop.run_forever, name='async-loop', daemon=True).start()
+
+def run_async(coro, timeout: Optional[float] = None):
+    """Run a coroutine on the shared event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop).result(timeout)
+
+# Strong references to fire-and-forget tasks; the loop itself only keeps weak ones
+_background_tasks = set()
+
+def run_in_background(coro) -> asyncio.Task:
+    """Schedule a coroutine on the running loop without waiting for it, in its own app context"""
+    async def run():
+        # The request that scheduled us tears down its app context (and db session) once it replies
+        with app.app_context():
+            try:
+                return await coro
+            except Exception as e:
+                print(f"Background task {getattr(coro, '__qualname__', coro)} failed: {e}")
+
+    task = asyncio.create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+@atexit.register
+def _close_http_clients():
+    for close in (close_http_client, close_llm_client, close_slack_client):
+        try:
+            run_async(close(), timeout=5)
+        except Exception:
+            pass
+
+_STREAM_END = object()
+
+def iterate_async(agen):
+    """
+    Yield the items of an async generator from synchronous code.
+    
+    The generator runs to completion on the shared event loop, handing
+    items over through a queue; its exceptions are re-raised here.
+    """
+    items = queue.Queue()
+    errors = []
+
+    async def pump():
+        try:
+            async for item in agen:
+                items.put(item)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            items.put(_STREAM_END)
+
+    asyncio.run_coroutine_threadsafe(pump(), _async_loop)
+    while (item := items.get()) is not _STREAM_END:
+        yield item
+    if errors:
+        raise errors[0]
+
 """
 API Endpoints
 
@@ -592,32 +1043,8 @@ def get_characters(session_id):
     @return: JSON array of character objects
     @raises 404: Session not found
     """
-    chars = Character.query.filter_by(session_id=session_id).all()
-    return jsonify([
-        {
-            'id': c.id,
-            'user_id': c.user_id,
-            'name': c.name,
-            'handle': c.handle,
-            'archetype': c.archetype,
-            'background_seed': c.background_seed,
-            'gender': c.gender,
-            'pronouns': c.pronouns,
-            'essence_anchor': c.essence_anchor,
-            'build_method': c.build_method,
-            'attributes': c.attributes,
-            'skills': c.skills,
-            'qualities': c.qualities,
-            'gear': c.gear,
-            'lifestyle': c.lifestyle,
-            'contacts': c.contacts,
-            'narrative_hooks': c.narrative_hooks,
-            'core_traumas': c.core_traumas,
-            'core_strengths': c.core_strengths,
-            'created_at': c.created_at.isoformat() if c.created_at else None
-        }
-        for c in chars
-    ])
+    payloads = character_json_payloads(Character.session_id == session_id)
+    return Response(b'[' + b','.join(payloads) + b']', mimetype='application/json')
 
 @app.route('/api/session/<session_id>/character', methods=['POST'])
 def create_character(session_id):
@@ -681,31 +1108,10 @@ def get_character(session_id, char_id):
     @return: Complete character data object
     @raises 404: Character not found
     """
-    char = Character.query.filter_by(session_id=session_id, id=char_id).first()
-    if not char:
+    payloads = character_json_payloads(Character.id == char_id, Character.session_id == session_id)
+    if not payloads:
         return jsonify({'status': 'error', 'error': 'Character not found'}), 404
-    return jsonify({
-        'id': char.id,
-        'user_id': char.user_id,
-        'name': char.name,
-        'handle': char.handle,
-        'archetype': char.archetype,
-        'background_seed': char.background_seed,
-        'gender': char.gender,
-        'pronouns': char.pronouns,
-        'essence_anchor': char.essence_anchor,
-        'build_method': char.build_method,
-        'attributes': char.attributes,
-        'skills': char.skills,
-        'qualities': char.qualities,
-        'gear': char.gear,
-        'lifestyle': char.lifestyle,
-        'contacts': char.contacts,
-        'narrative_hooks': char.narrative_hooks,
-        'core_traumas': char.core_traumas,
-        'core_strengths': char.core_strengths,
-        'created_at': char.created_at.isoformat() if char.created_at else None
-    })
+    return Response(payloads[0], mimetype='application/json')
 
 @app.route('/api/session/<session_id>/character/<int:char_id>', methods=['PUT'])
 def update_character(session_id, char_id):
@@ -723,15 +1129,25 @@ def update_character(session_id, char_id):
     @raises 404: Character not found
     @raises 400: Invalid update data
     """
-    char = Character.query.filter_by(session_id=session_id, id=char_id).first()
-    if not char:
+    data = request.json or {}
+    values = {field: data[field] for field in CHARACTER_SHEET_FIELDS if field in data}
+    match = (Character.session_id == session_id, Character.id == char_id)
+    if not values:
+        # Nothing to write, but still report unknown characters
+        if db.session.execute(select(Character.id).where(*match)).first() is None:
+            return jsonify({'status': 'error', 'error': 'Character not found'}), 404
+        return jsonify({'status': 'success'})
+    # UPDATE ... RETURNING hands back the edited row, so the cached JSON is
+    # re-encoded without a SELECT or ORM hydration
+    row = db.session.execute(
+        update(Character).where(*match).values(**values)
+        .returning(*(getattr(Character, column) for column in _CHARACTER_JSON_COLUMNS))
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        db.session.rollback()
         return jsonify({'status': 'error', 'error': 'Character not found'}), 404
-    data = request.json
-    for field in [
-        'name','handle','archetype','background_seed','gender','pronouns','essence_anchor','build_method',
-        'attributes','skills','qualities','gear','lifestyle','contacts','narrative_hooks','core_traumas','core_strengths']:
-        if field in data:
-            setattr(char, field, data[field])
+    db.session.execute(_store_character_json, {'character_id': row.id, 'payload': _character_json(row)})
     db.session.commit()
     return jsonify({'status': 'success'})
 
@@ -749,8 +1165,8 @@ def delete_character(session_id, char_id):
     @return: Deletion confirmation
     @raises 404: Character not found
     """
-    char = Character.query.filter_by(session_id=session_id, id=char_id).first()
-    if not char:
+    char = db.session.get(Character, char_id)
+    if not char or char.session_id != session_id:
         return jsonify({'status': 'error', 'error': 'Character not found'}), 404
     db.session.delete(char)
     db.session.commit()
@@ -769,11 +1185,15 @@ def get_scene(session_id):
     @param session_id: Session identifier
     @return: Scene data with summary
     """
-    scene = Scene.query.filter_by(session_id=session_id).first()
-    if scene:
-        return jsonify({'session_id': session_id, 'summary': scene.summary})
-    else:
-        return jsonify({'session_id': session_id, 'summary': ''})
+    with _lookup_cache_lock:
+        summary = _scene_cache.get(session_id)
+    if summary is None:
+        summary = db.session.execute(lambda_stmt(
+            lambda: select(Scene.summary).where(Scene.session_id == session_id)
+        )).scalar() or ''
+        with _lookup_cache_lock:
+            _scene_cache[session_id] = summary
+    return jsonify({'session_id': session_id, 'summary': summary})
 
 @app.route('/api/session/<session_id>/scene', methods=['POST'])
 def update_scene(session_id):
@@ -793,7 +1213,7 @@ def update_scene(session_id):
     summary = data.get('summary', '')
     user_id = data.get('user_id')
     # Permission check: only GM can update
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session or session.gm_user_id != user_id:
         return jsonify({'error': 'Only GM can update scene.'}), 403
     scene = Scene.query.filter_by(session_id=session_id).first()
@@ -803,6 +1223,7 @@ def update_scene(session_id):
     else:
         scene.summary = summary
     db.session.commit()
+    invalidate_scene_cache(session_id)
     return jsonify({'session_id': session_id, 'summary': scene.summary})
 
 # --- Entity Management Endpoints ---
@@ -818,8 +1239,10 @@ def get_entities(session_id):
     @param session_id: Session identifier
     @return: Array of entity objects
     """
-    entities = Entity.query.filter_by(session_id=session_id).all()
-    return jsonify([
+    entities = db.session.execute(lambda_stmt(
+        lambda: select(Entity).where(Entity.session_id == session_id)
+    )).scalars().all()
+    return ojsonify([
         {'id': e.id, 'name': e.name, 'type': e.type, 'status': e.status, 'extra_data': e.extra_data}
         for e in entities
     ])
@@ -842,14 +1265,14 @@ def add_or_update_entity(session_id):
     data = request.json
     user_id = data.get('user_id')
     # Permission check: only GM can add/update
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session or session.gm_user_id != user_id:
         return jsonify({'error': 'Only GM can modify entities.'}), 403
     entity_id = data.get('id')
     if entity_id:
         # Update existing
-        entity = Entity.query.filter_by(id=entity_id, session_id=session_id).first()
-        if not entity:
+        entity = db.session.get(Entity, entity_id)
+        if not entity or entity.session_id != session_id:
             return jsonify({'error': 'Entity not found.'}), 404
         entity.name = data.get('name', entity.name)
         entity.type = data.get('type', entity.type)
@@ -886,11 +1309,11 @@ def delete_entity(session_id, entity_id):
     data = request.json
     user_id = data.get('user_id')
     # Permission check: only GM can delete
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session or session.gm_user_id != user_id:
         return jsonify({'error': 'Only GM can delete entities.'}), 403
-    entity = Entity.query.filter_by(id=entity_id, session_id=session_id).first()
-    if not entity:
+    entity = db.session.get(Entity, entity_id)
+    if not entity or entity.session_id != session_id:
         return jsonify({'error': 'Entity not found.'}), 404
     db.session.delete(entity)
     db.session.commit()
@@ -918,23 +1341,17 @@ def get_pending_responses(session_id):
         return jsonify({'error': 'user_id is required'}), 400
     
     # Verify the user is the GM for this session
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session or session.gm_user_id != user_id:
         return jsonify({'error': 'Only GMs can view pending responses'}), 403
     
-    pending = PendingResponse.query.filter_by(session_id=session_id, status='pending').order_by(
-        PendingResponse.priority.desc(), PendingResponse.created_at.asc()
-    ).all()
+    pending = db.session.execute(lambda_stmt(
+        lambda: select(PendingResponse)
+        .where(PendingResponse.session_id == session_id, PendingResponse.status == 'pending')
+        .order_by(PendingResponse.priority.desc(), PendingResponse.created_at.asc())
+    )).scalars().all()
     
-    return jsonify([{
-        'id': p.id,
-        'user_id': p.user_id,
-        'context': p.context,
-        'ai_response': p.ai_response,
-        'response_type': p.response_type,
-        'priority': p.priority,
-        'created_at': p.created_at.isoformat() if p.created_at else None
-    } for p in pending])
+    return ojsonify([serialize_pending_response(p) for p in pending])
 
 @app.route('/api/session/<session_id>/pending-response/<response_id>/review', methods=['POST'])
 def review_response(session_id, response_id):
@@ -949,45 +1366,44 @@ def review_response(session_id, response_id):
         return jsonify({'error': 'user_id and action are required'}), 400
     
     # Verify the user is the GM for this session
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session or session.gm_user_id != dm_user_id:
         return jsonify({'error': 'Only GMs can review responses'}), 403
     
-    pending = PendingResponse.query.filter_by(id=response_id, session_id=session_id).first()
-    if not pending:
-        return jsonify({'error': 'Pending response not found'}), 404
-    
-    # Create review history entry
-    original_response = pending.ai_response
-    
-    # Update pending response based on action
+    # New status and final text for each action; approval keeps the AI text as-is
     if action == 'approve':
-        pending.status = 'approved'
-        pending.final_response = pending.ai_response
+        status, final_value = 'approved', PendingResponse.ai_response
     elif action == 'reject':
-        pending.status = 'rejected'
-        pending.final_response = None
+        status, final_value = 'rejected', None
     elif action == 'edit':
-        pending.status = 'edited'
-        pending.final_response = final_response
+        status, final_value = 'edited', final_response
     else:
         return jsonify({'error': 'Invalid action'}), 400
     
-    pending.dm_notes = dm_notes
-    pending.reviewed_at = db.func.now()
-    
-    # Create review history
-    history = ReviewHistory(
-        pending_response_id=response_id,
-        dm_user_id=dm_user_id,
-        action=action,
-        original_response=original_response,
-        final_response=pending.final_response,
-        notes=dm_notes
+    # Update the pending response in place without loading it
+    result = db.session.execute(
+        update(PendingResponse)
+        .where(PendingResponse.id == response_id, PendingResponse.session_id == session_id)
+        .values(status=status, final_response=final_value, dm_notes=dm_notes, reviewed_at=db.func.now())
+        .execution_options(synchronize_session=False)
     )
+    if result.rowcount == 0:
+        db.session.rollback()
+        return jsonify({'error': 'Pending response not found'}), 404
     
-    db.session.add(history)
+    # Record the review history straight from the updated row
+    history = ReviewHistory.__table__
+    db.session.execute(
+        insert(history).from_select(
+            ['pending_response_id', 'dm_user_id', 'action', 'original_response', 'final_response', 'notes'],
+            select(
+                literal(response_id), literal(dm_user_id), literal(action),
+                PendingResponse.ai_response, PendingResponse.final_response, literal(dm_notes)
+            ).where(PendingResponse.id == response_id)
+        )
+    )
     db.session.commit()
+    notify_review_complete(response_id)
     
     return jsonify({'status': 'success', 'action': action})
 
@@ -999,17 +1415,21 @@ def get_dm_notifications(session_id):
         return jsonify({'error': 'user_id is required'}), 400
     
     # Verify the user is the GM for this session
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session or session.gm_user_id != dm_user_id:
         return jsonify({'error': 'Only GMs can view notifications'}), 403
     
-    notifications = DmNotification.query.filter_by(
-        session_id=session_id, 
-        dm_user_id=dm_user_id,
-        is_read=False
-    ).order_by(DmNotification.created_at.desc()).all()
+    notifications = db.session.execute(lambda_stmt(
+        lambda: select(DmNotification)
+        .where(
+            DmNotification.session_id == session_id,
+            DmNotification.dm_user_id == dm_user_id,
+            DmNotification.is_read.is_(False)
+        )
+        .order_by(DmNotification.created_at.desc())
+    )).scalars().all()
     
-    return jsonify([{
+    return ojsonify([{
         'id': n.id,
         'pending_response_id': n.pending_response_id,
         'notification_type': n.notification_type,
@@ -1017,6 +1437,21 @@ def get_dm_notifications(session_id):
         'created_at': n.created_at.isoformat() if n.created_at else None
     } for n in notifications])
 
+def mark_notifications_read(session_id: str, dm_user_id: str, notification_ids) -> int:
+    """Mark a batch of a DM's notifications as read in one UPDATE, returning the match count"""
+    result = db.session.execute(
+        update(DmNotification)
+        .where(
+            DmNotification.session_id == session_id,
+            DmNotification.dm_user_id == dm_user_id,
+            DmNotification.id.in_(notification_ids)
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
 @app.route('/api/session/<session_id>/dm/notifications/<int:notification_id>/mark-read', methods=['POST'])
 def mark_notification_read(session_id, notification_id):
     """Mark a notification as read"""
@@ -1026,30 +1461,43 @@ def mark_notification_read(session_id, notification_id):
     if not dm_user_id:
         return jsonify({'error': 'user_id is required'}), 400
     
-    notification = DmNotification.query.filter_by(
-        id=notification_id,
-        session_id=session_id,
-        dm_user_id=dm_user_id
-    ).first()
-    
-    if not notification:
+    if not mark_notifications_read(session_id, dm_user_id, [notification_id]):
         return jsonify({'error': 'Notification not found'}), 404
     
-    notification.is_read = True
-    db.session.commit()
-    
     return jsonify({'status': 'success'})
 
+@app.route('/api/session/<session_id>/dm/notifications/mark-read', methods=['POST'])
+def mark_notifications_read_batch(session_id):
+    """Mark several notifications as read with a single statement"""
+    data = request.json
+    dm_user_id = data.get('user_id')
+    notification_ids = data.get('ids')
+    
+    if not dm_user_id:
+        return jsonify({'error': 'user_id is required'}), 400
+    
+    if (not isinstance(notification_ids, list)
+            or not all(isinstance(i, int) and not isinstance(i, bool) for i in notification_ids)):
+        return jsonify({'error': 'ids must be a list of notification ids'}), 400
+    
+    updated = mark_notifications_read(session_id, dm_user_id, notification_ids) if notification_ids else 0
+    
+    return jsonify({'status': 'success', 'updated': updated})
+
 @app.route('/api/session/<session_id>/player/<user_id>/approved-responses', methods=['GET'])
 def get_approved_responses(session_id, user_id):
     """Get approved responses for a specific player"""
-    responses = PendingResponse.query.filter_by(
-        session_id=session_id,
-        user_id=user_id,
-        status='approved'
-    ).order_by(PendingResponse.reviewed_at.desc()).all()
+    responses = db.session.execute(lambda_stmt(
+        lambda: select(PendingResponse)
+        .where(
+            PendingResponse.session_id == session_id,
+            PendingResponse.user_id == user_id,
+            PendingResponse.status == 'approved'
+        )
+        .order_by(PendingResponse.reviewed_at.desc())
+    )).scalars().all()
     
-    return jsonify([{
+    return ojsonify([{
         'id': r.id,
         'context': r.context,
         'final_response': r.final_response,
@@ -1090,16 +1538,16 @@ def llm_with_review(session_id):
         return jsonify({'error': f'Invalid input: {str(e)}'}), 400
     
     # Validate session and user
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session:
         return jsonify({'error': 'Invalid session_id'}), 400
     
-    user_role = UserRole.query.filter_by(session_id=session_id, user_id=user_id).first()
+    user_role = get_user_role(session_id, user_id)
     if not user_role:
         return jsonify({'error': 'User not in session'}), 403
     
     try:
-        result = asyncio.run(call_llm_with_review(
+        result = run_async(call_llm_with_review(
             session_id=session_id,
             user_id=user_id,
             context=context,
@@ -1119,7 +1567,7 @@ def check_pending_response_status(response_id):
     Check the status of a pending response
     """
     try:
-        result = asyncio.run(get_reviewed_response(response_id))
+        result = run_async(get_reviewed_response(response_id))
         if result is None:
             return jsonify({'error': 'Pending response not found'}), 404
         return jsonify(result)
@@ -1127,6 +1575,62 @@ def check_pending_response_status(response_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Seconds between keep-alive comments (and status re-checks) on review streams
+REVIEW_STREAM_KEEPALIVE = 15
+
+# One wake-up event per pending response with at least one open stream;
+# entries vanish on their own once the last stream lets go of the event
+_review_events = weakref.WeakValueDictionary()
+_review_events_lock = threading.Lock()
+
+def _review_event(response_id: str) -> threading.Event:
+    with _review_events_lock:
+        event = _review_events.get(response_id)
+        if event is None:
+            event = _review_events[response_id] = threading.Event()
+        return event
+
+def notify_review_complete(response_id: str):
+    """Wake every status stream waiting on a pending response"""
+    with _review_events_lock:
+        event = _review_events.pop(response_id, None)
+    if event is not None:
+        event.set()
+
+@app.route('/api/pending-response/<response_id>/status/stream', methods=['GET'])
+def stream_pending_response_status(response_id):
+    """
+    Push the review status of a pending response over Server-Sent Events
+
+    Emits the current status immediately, then blocks until the DM
+    reviews the response (or a keep-alive interval passes) instead of
+    having the client poll the status endpoint. The stream ends after
+    the first approved/edited/rejected frame.
+    """
+    if db.session.get(PendingResponse, response_id) is None:
+        return jsonify({'error': 'Pending response not found'}), 404
+
+    def event_stream():
+        announced = False
+        while True:
+            # Subscribe before reading so a review landing in between still wakes us
+            event = _review_event(response_id)
+            pending = db.session.get(PendingResponse, response_id, populate_existing=True)
+            status = format_review_status(pending) if pending else None
+            db.session.rollback()  # End the read transaction while we wait
+            if status is None:
+                yield b'event: error\ndata: {"error": "Pending response not found"}\n\n'
+                return
+            if not announced or status['status'] != 'pending':
+                yield sse_frame(status)
+                if status['status'] != 'pending':
+                    return
+                announced = True
+            if not event.wait(REVIEW_STREAM_KEEPALIVE):
+                yield b': keep-alive\n\n'
+
+    return Response(stream_with_context(event_stream()), headers=SSE_HEADERS)
+
 @app.route('/api/ping')
 def ping():
     return jsonify({'status': 'ok', 'message': 'Shadowrun backend is alive.'})
@@ -1217,15 +1721,24 @@ def join_session(session_id):
     user_role = UserRole(session_id=session_id, user_id=user_id, role=role)
     db.session.add(user_role)
     db.session.commit()
+    invalidate_session_cache(session_id, user_id)
     return jsonify({'session_id': session_id, 'user_id': user_id, 'role': role})
 
 @app.route('/api/session/<session_id>/users', methods=['GET'])
 def get_session_users(session_id):
-    users = UserRole.query.filter_by(session_id=session_id).all()
-    return jsonify([
-        {'user_id': u.user_id, 'role': u.role}
-        for u in users
-    ])
+    with _lookup_cache_lock:
+        users = _session_users_cache.get(session_id)
+    if users is None:
+        rows = db.session.execute(lambda_stmt(
+            lambda: select(UserRole).where(UserRole.session_id == session_id)
+        )).scalars().all()
+        users = [
+            {'user_id': u.user_id, 'role': u.role}
+            for u in rows
+        ]
+        with _lookup_cache_lock:
+            _session_users_cache[session_id] = users
+    return ojsonify(users)
 
 # --- Image Generation Endpoints ---
 @app.route('/api/session/<session_id>/generate-image', methods=['POST'])
@@ -1243,11 +1756,11 @@ def generate_image_endpoint(session_id):
             return jsonify({'error': 'Missing required fields: user_id, prompt'}), 400
         
         # Validate session and user
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if not session:
             return jsonify({'error': 'Invalid session_id'}), 400
         
-        user_role = UserRole.query.filter_by(session_id=session_id, user_id=user_id).first()
+        user_role = get_user_role(session_id, user_id)
         if not user_role:
             return jsonify({'error': 'User not in session'}), 403
         
@@ -1257,7 +1770,7 @@ def generate_image_endpoint(session_id):
             user_id=user_id,
             request_type=request_type,
             context=prompt,
-            style_preferences=json.dumps(style_preferences),
+            style_preferences=orjson.dumps(style_preferences).decode(),
             priority=priority
         )
         
@@ -1288,19 +1801,16 @@ def generate_image_instant(session_id):
             return jsonify({'error': 'Missing required fields: user_id, prompt'}), 400
         
         # Validate session and user
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if not session:
             return jsonify({'error': 'Invalid session_id'}), 400
         
-        user_role = UserRole.query.filter_by(session_id=session_id, user_id=user_id).first()
+        user_role = get_user_role(session_id, user_id)
         if not user_role:
             return jsonify({'error': 'User not in session'}), 403
         
         # Generate image directly
-        from image_gen_utils import ImageGenerator
-        generator = ImageGenerator()
-        
-        result = asyncio.run(generator.generate_image(
+        result = run_async(image_generator.generate_image(
             prompt=prompt,
             provider=provider,
             context=f"Session: {session_id}",
@@ -1334,43 +1844,75 @@ def generate_image_instant(session_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# SQLite keeps server-default timestamps as 'YYYY-MM-DD HH:MM:SS' but ours with microseconds;
+# padding both to one text form lets the cursor compare (and order) exactly
+_IMAGE_CURSOR_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+_image_created_key = db.func.substr(type_coerce(GeneratedImage.created_at, db.String) + '.000000', 1, 26)
+
 @app.route('/api/session/<session_id>/images', methods=['GET'])
 def get_session_images_endpoint(session_id):
     """Get generated images for a session"""
     try:
         user_id = request.args.get('user_id')
         limit = int(request.args.get('limit', 20))
+        before = request.args.get('before')  # next_cursor from the previous page
         
         # Validate session
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if not session:
             return jsonify({'error': 'Invalid session_id'}), 400
         
-        # Get images directly from database
-        query = GeneratedImage.query.filter_by(session_id=session_id)
+        # Only the listed columns, as plain rows rather than ORM instances
+        query = select(
+            GeneratedImage.id, GeneratedImage.prompt, GeneratedImage.image_url, GeneratedImage.provider,
+            GeneratedImage.status, GeneratedImage.created_at, GeneratedImage.is_favorite, GeneratedImage.tags
+        ).where(GeneratedImage.session_id == session_id)
         if user_id:
-            query = query.filter_by(user_id=user_id)
+            query = query.where(GeneratedImage.user_id == user_id)
         
-        images_db = query.order_by(GeneratedImage.created_at.desc()).limit(limit).all()
+        # Keyset pagination: cursor is "<created_at iso>|<id>", the id breaking timestamp ties
+        if before:
+            before_at, _, before_id = before.partition('|')
+            try:
+                before_at = datetime.fromisoformat(before_at).strftime(_IMAGE_CURSOR_FORMAT)
+            except ValueError:
+                return jsonify({'error': 'Invalid before cursor'}), 400
+            if before_id:
+                query = query.where(or_(
+                    _image_created_key < before_at,
+                    and_(_image_created_key == before_at, GeneratedImage.id < before_id)
+                ))
+            else:
+                query = query.where(_image_created_key < before_at)
+        
+        rows = db.session.execute(
+            query.order_by(_image_created_key.desc(), GeneratedImage.id.desc()).limit(limit)
+        ).all()
         
         images = [
             {
-                "id": img.id,
-                "prompt": img.prompt,
-                "image_url": img.image_url,
-                "provider": img.provider,
-                "status": img.status,
-                "created_at": img.created_at.isoformat(),
-                "is_favorite": img.is_favorite,
-                "tags": json.loads(img.tags) if img.tags else []
+                "id": row.id,
+                "prompt": row.prompt,
+                "image_url": row.image_url,
+                "provider": row.provider,
+                "status": row.status,
+                "created_at": row.created_at,
+                "is_favorite": row.is_favorite,
+                "tags": unpack_list(row.tags)
             }
-            for img in images_db
+            for row in rows
         ]
         
-        return jsonify({
+        next_cursor = None
+        if len(rows) == limit and limit > 0:
+            last = rows[-1]
+            next_cursor = f"{last.created_at.isoformat()}|{last.id}"
+        
+        return ojsonify({
             'status': 'success',
             'images': images,
-            'count': len(images)
+            'count': len(images),
+            'next_cursor': next_cursor
         })
         
     except Exception as e:
@@ -1380,11 +1922,11 @@ def get_session_images_endpoint(session_id):
 def get_image_details(session_id, image_id):
     """Get details of a specific generated image"""
     try:
-        image = GeneratedImage.query.filter_by(id=image_id, session_id=session_id).first()
-        if not image:
+        image = db.session.get(GeneratedImage, image_id, options=[raiseload('*')])
+        if not image or image.session_id != session_id:
             return jsonify({'error': 'Image not found'}), 404
         
-        return jsonify({
+        return ojsonify({
             'status': 'success',
             'image': {
                 'id': image.id,
@@ -1394,9 +1936,9 @@ def get_image_details(session_id, image_id):
                 'provider': image.provider,
                 'status': image.status,
                 'generation_time': image.generation_time,
-                'created_at': image.created_at.isoformat(),
+                'created_at': image.created_at,
                 'is_favorite': image.is_favorite,
-                'tags': json.loads(image.tags) if image.tags else []
+                'tags': image.tags_list
             }
         })
         
@@ -1414,14 +1956,14 @@ def toggle_image_favorite(session_id, image_id):
         if not user_id:
             return jsonify({'error': 'Missing user_id'}), 400
         
-        image = GeneratedImage.query.filter_by(id=image_id, session_id=session_id).first()
-        if not image:
+        image = db.session.get(GeneratedImage, image_id, options=[raiseload('*')])
+        if not image or image.session_id != session_id:
             return jsonify({'error': 'Image not found'}), 404
         
         # Check if user has permission to modify this image
         if image.user_id != user_id:
-            user_role = UserRole.query.filter_by(session_id=session_id, user_id=user_id).first()
-            if not user_role or user_role.role != 'gm':
+            user_role = get_user_role(session_id, user_id)
+            if user_role != 'gm':
                 return jsonify({'error': 'Permission denied'}), 403
         
         image.is_favorite = is_favorite
@@ -1436,13 +1978,16 @@ def toggle_image_favorite(session_id, image_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@functools.lru_cache(maxsize=1)
+def available_image_providers() -> tuple:
+    """Image providers configured via API keys; fixed for the life of the process"""
+    return tuple(image_generator.get_available_providers())
+
 @app.route('/api/session/<session_id>/image-providers', methods=['GET'])
 def get_available_providers(session_id):
     """Get list of available image generation providers"""
     try:
-        from image_gen_utils import ImageGenerator
-        generator = ImageGenerator()
-        providers = generator.get_available_providers()
+        providers = available_image_providers()
         
         return jsonify({
             'status': 'success',
@@ -1458,7 +2003,7 @@ def get_available_providers(session_id):
 # --- Command Routing with Model Selection ---
 @app.route('/api/command', methods=['POST'])
 def route_command():
-    data = request.json
+    data = request.get_json(cache=False)
     command = data.get('command')
     session_id = data.get('session_id')
     user_id = data.get('user_id')
@@ -1468,7 +2013,7 @@ def route_command():
         {"role": "user", "content": command}
     ]
     try:
-        llm_response = asyncio.run(call_llm(model, messages, model_name=model_name))
+        llm_response = run_async(call_llm(model, messages, model_name=model_name))
         return jsonify({
             'status': 'success',
             'command': command,
@@ -1508,10 +2053,10 @@ def llm_stream():
         return jsonify({'status': 'error', 'error': f'Invalid input: {str(e)}'}), 400
 
     # Validate session and user
-    session = Session.query.filter_by(id=session_id).first()
+    session = get_session_info(session_id)
     if not session:
         return jsonify({'status': 'error', 'error': 'Invalid session_id'}), 400
-    user_role = UserRole.query.filter_by(session_id=session_id, user_id=user_id).first()
+    user_role = get_user_role(session_id, user_id)
     if not user_role:
         return jsonify({'status': 'error', 'error': 'User not in session'}), 403
 
@@ -1520,39 +2065,45 @@ def llm_stream():
         {"role": "user", "content": user_input}
     ]
 
+    # Tracebacks are only formatted into the stream when the client asks for them
+    debug = request.args.get('debug') == '1'
+
     async def llm_async_gen():
         try:
             agen = await call_llm(model, messages, stream=True, model_name=model_name)
             async for chunk in agen:
                 # Tag output with speaker
-                yield f'data: {{"speaker": "AI", "content": {repr(chunk)} }}\n\n'
+                yield sse_frame({"speaker": "AI", "content": chunk})
         except httpx.HTTPStatusError as e:
             error_msg = f"Upstream API error: {e.response.status_code} {e.response.text}"
-            print(error_msg)
-            yield f'data: {{"error": "Upstream API error", "type": "http", "details": {repr(error_msg)} }}\n\n'
+            logger.warning("LLM_STREAM_UPSTREAM_ERROR", details=error_msg, model=model)
+            yield sse_error_frame("Upstream API error", "http", error_msg)
         except httpx.RequestError as e:
             error_msg = f"Network error: {str(e)}"
-            print(error_msg)
-            yield f'data: {{"error": "Network error", "type": "network", "details": {repr(error_msg)} }}\n\n'
+            logger.warning("LLM_STREAM_NETWORK_ERROR", details=error_msg, model=model)
+            yield sse_error_frame("Network error", "network", error_msg)
         except Exception as e:
-            tb = traceback.format_exc()
-            print(f"Internal error: {str(e)}\n{tb}")
-            yield f'data: {{"error": "Internal server error", "type": "internal", "details": {repr(str(e))}, "trace": {repr(tb)} }}\n\n'
+            logger.error("LLM_STREAM_INTERNAL_ERROR", exception=e, model=model)
+            tb = traceback.format_exc() if debug else None
+            yield sse_error_frame("Internal server error", "internal", str(e), tb)
 
-    def generate():
-        agen = llm_async_gen()
-        while True:
-            try:
-                chunk = asyncio.run(agen.__anext__())
-                yield chunk
-            except StopAsyncIteration:
-                break
-
-    headers = {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'}
-    return Response(generate(), headers=headers)
+    return Response(iterate_async(llm_async_gen()), headers=SSE_HEADERS)
 
 # Imports moved to top of file
 
+CHAT_SYSTEM_PROMPT = "You are an expert Shadowrun GM AI. Answer as a helpful, creative, and rules-savvy Shadowrun game master. Respond in character where appropriate."
+CHAT_CONTEXT_MESSAGES = 40  # Most recent history entries sent to the LLM each turn
+
+def import_legacy_chat_history(memory: ChatMemory, history: List[Dict]):
+    """Move a pre-ChatMessage history blob into ChatMessage rows"""
+    history = [m for m in history if m.get('role') != 'system']
+    db.session.add_all(
+        ChatMessage(memory_id=memory.id, seq=seq, role=m['role'], content=m['content'])
+        for seq, m in enumerate(history)
+    )
+    memory.messages = pack_list([])
+    db.session.commit()
+
 @app.route("/api/chat", methods=["POST"])
 def chat():
     # Accepts: {input, session_id, user_id, role}
@@ -1567,39 +2118,37 @@ def chat():
     # Fetch or initialize chat memory for this session/user/role
     memory = ChatMemory.query.filter_by(session_id=session_id, user_id=user_id, role=role).first()
     if memory is None:
-        # Start with a system prompt
-        messages = [{"role": "system", "content": "You are an expert Shadowrun GM AI. Answer as a helpful, creative, and rules-savvy Shadowrun game master. Respond in character where appropriate."}]
-        memory = ChatMemory(session_id=session_id, user_id=user_id, role=role, messages=json.dumps(messages))
+        memory = ChatMemory(session_id=session_id, user_id=user_id, role=role)
         db.session.add(memory)
         db.session.commit()
     else:
-        messages = json.loads(memory.messages)
-
-    # Append the new user message
+        legacy_history = unpack_list(memory.messages)
+        if legacy_history:
+            import_legacy_chat_history(memory, legacy_history)
+    memory_id = memory.id
+    # The previous turn on this memory may still be on the writer thread
+    wait_for_chat_turn(memory_id)
+
+    # Only the tail of the history is needed for LLM context
+    recent = ChatMessage.query.filter_by(memory_id=memory_id).order_by(
+        ChatMessage.seq.desc()
+    ).limit(CHAT_CONTEXT_MESSAGES).all()
+    messages = [{"role": "system", "content": CHAT_SYSTEM_PROMPT}]
+    messages.extend({"role": m.role, "content": m.content} for m in reversed(recent))
     messages.append({"role": "user", "content": user_input})
 
-    # Imports available at top of file
-
     def event_stream():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        async def stream():
-            async for chunk in call_openai_stream(messages):
-                yield chunk
         content = ""
-        try:
-            for chunk in loop.run_until_complete(stream()):
-                content += chunk
-                yield f"data: {chunk}\n\n"
-        finally:
-            loop.close()
-        # Save the AI message to memory after streaming
-        messages.append({"role": "assistant", "content": content})
-        memory.messages = json.dumps(messages)
-        db.session.commit()
+        for chunk in iterate_async(call_openai_stream(messages)):
+            content += chunk
+            yield f"data: {chunk}\n\n"
+        # Append this turn to memory behind the response; the client already has everything
+        queue_chat_turn(memory_id, [
+            {"role": "user", "content": user_input},
+            {"role": "assistant", "content": content},
+        ])
 
-    headers = {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'}
-    return Response(stream_with_context(event_stream()), headers=headers)
+    return Response(stream_with_context(event_stream()), headers=SSE_HEADERS)
 
 @app.route("/")
 def index():
@@ -1621,7 +2170,7 @@ def handle_slack_command():
     """Handle Slack slash commands"""
     try:
         # Verify the request came from Slack
-        if not slack_bot.verify_slack_request(request.headers, request.get_data(as_text=True)):
+        if not slack_bot.verify_slack_request(request.headers, request.get_data()):
             return jsonify({'error': 'Invalid request signature'}), 401
         
         # Parse form data from Slack
@@ -1638,7 +2187,7 @@ def handle_slack_command():
         }
         
         # Process the command
-        response = asyncio.run(slack_processor.process_command(command_data))
+        response = run_async(slack_processor.process_command(command_data))
         
         return jsonify(response)
         
@@ -1654,7 +2203,7 @@ def handle_slack_events():
     """Handle Slack events (URL verification, app mentions, etc.)"""
     try:
         # Verify the request came from Slack
-        if not slack_bot.verify_slack_request(request.headers, request.get_data(as_text=True)):
+        if not slack_bot.verify_slack_request(request.headers, request.get_data()):
             return jsonify({'error': 'Invalid request signature'}), 401
         
         event_data = request.json
@@ -1669,7 +2218,7 @@ def handle_slack_events():
             
             # Handle app mentions
             if event.get('type') == 'app_mention':
-                asyncio.run(handle_app_mention(event))
+                run_async(handle_app_mention(event))
         
         return jsonify({'status': 'ok'})
         
@@ -1682,7 +2231,7 @@ def handle_slack_interactive():
     """Handle Slack interactive components (buttons, modals, etc.)"""
     try:
         # Verify the request came from Slack
-        if not slack_bot.verify_slack_request(request.headers, request.get_data(as_text=True)):
+        if not slack_bot.verify_slack_request(request.headers, request.get_data()):
             return jsonify({'error': 'Invalid request signature'}), 401
         
         payload = json.loads(request.form.get('payload', '{}'))
@@ -1710,89 +2259,92 @@ def handle_slack_interactive():
         return jsonify({'error': str(e)}), 500
 
 # --- Slack Helper Functions ---
-async def create_session_for_slack(name: str, gm_user_id: str, slack_channel_id: str, slack_team_id: str) -> Dict:
-    """Create a game session for Slack channel"""
-    # Create regular session
-    session = Session(name=name, gm_user_id=gm_user_id)
-    db.session.add(session)
-    db.session.flush()  # Get the ID
-    
-    # Create Slack mapping
-    slack_session = SlackSession(
-        slack_team_id=slack_team_id,
-        slack_channel_id=slack_channel_id,
-        session_id=session.id
-    )
-    db.session.add(slack_session)
-    
-    # Add GM to session
-    gm_role = UserRole(session_id=session.id, user_id=gm_user_id, role='gm')
-    db.session.add(gm_role)
-    
+# Blocking SQLAlchemy work runs via asyncio.to_thread so a slow commit does not
+# stall Slack API calls sharing the event loop.
+
+SLACK_NO_SESSION_TEXT = "Error: No active session in this channel. Use `/sr-session create` first."
+
+def _create_session_for_slack(name: str, gm_user_id: str, slack_channel_id: str, slack_team_id: str) -> Dict:
+    # Pre-generate the ID so all three rows go out in one flush and one commit
+    session_id = str(uuid.uuid4())
+    db.session.add_all([
+        Session(id=session_id, name=name, gm_user_id=gm_user_id),
+        # Slack mapping
+        SlackSession(slack_team_id=slack_team_id, slack_channel_id=slack_channel_id, session_id=session_id),
+        # Add GM to session
+        UserRole(session_id=session_id, user_id=gm_user_id, role='gm'),
+    ])
     db.session.commit()
+    invalidate_session_cache(session_id)
     
     return {
-        'session_id': session.id,
-        'name': session.name,
-        'gm_user_id': session.gm_user_id
+        'session_id': session_id,
+        'name': name,
+        'gm_user_id': gm_user_id
     }
 
-async def get_slack_session_info(slack_session_id: str) -> Optional[Dict]:
-    """Get session info for a Slack channel"""
+async def create_session_for_slack(name: str, gm_user_id: str, slack_channel_id: str, slack_team_id: str) -> Dict:
+    """Create a game session for Slack channel"""
+    return await asyncio.to_thread(_create_session_for_slack, name, gm_user_id, slack_channel_id, slack_team_id)
+
+def lookup_slack_channel_session(slack_session_id: str) -> Optional[str]:
+    """Get the game session id mapped to a '<team>_<channel>' Slack session id"""
+    team_id, channel_id = slack_session_id.split('_', 1)
+    return db.session.execute(
+        select(SlackSession.session_id)
+        .where(SlackSession.slack_team_id == team_id, SlackSession.slack_channel_id == channel_id)
+    ).scalar()
+
+def _get_slack_session_info(slack_session_id: str) -> Optional[Dict]:
     team_id, channel_id = slack_session_id.split('_', 1)
     
-    slack_session = SlackSession.query.filter_by(
-        slack_team_id=team_id,
-        slack_channel_id=channel_id
-    ).first()
-    
-    if not slack_session:
-        return None
+    # Mapping, session and players in a single joined query
+    slack_session = db.session.execute(
+        select(SlackSession)
+        .options(joinedload(SlackSession.session).joinedload(Session.user_roles), raiseload('*'))
+        .where(SlackSession.slack_team_id == team_id, SlackSession.slack_channel_id == channel_id)
+    ).unique().scalar_one_or_none()
     
-    session = Session.query.get(slack_session.session_id)
-    if not session:
+    if not slack_session or not slack_session.session:
         return None
-    
-    # Get players
-    players = UserRole.query.filter_by(session_id=session.id).all()
+    session = slack_session.session
     
     return {
         'session_id': session.id,
         'name': session.name,
         'gm_user_id': session.gm_user_id,
-        'players': [{'user_id': p.user_id, 'role': p.role} for p in players],
+        'players': [{'user_id': p.user_id, 'role': p.role} for p in session.user_roles],
         'created_at': session.created_at.isoformat()
     }
 
+async def get_slack_session_info(slack_session_id: str) -> Optional[Dict]:
+    """Get session info for a Slack channel"""
+    return await asyncio.to_thread(_get_slack_session_info, slack_session_id)
+
 async def process_slack_ai_request(session_id: str, user_id: str, message: str, channel_id: str):
     """Process AI request from Slack and notify when reviewed"""
     try:
         # Get actual session ID from Slack session
-        team_id, slack_channel_id = session_id.split('_', 1)
-        slack_session = SlackSession.query.filter_by(
-            slack_team_id=team_id,
-            slack_channel_id=slack_channel_id
-        ).first()
+        actual_session_id = await asyncio.to_thread(lookup_slack_channel_session, session_id)
         
-        if not slack_session:
+        if not actual_session_id:
             await slack_bot.send_message(
                 channel=channel_id,
-                text="Error: No active session in this channel. Use `/sr-session create` first.",
+                text=SLACK_NO_SESSION_TEXT,
                 ephemeral_user=user_id
             )
             return
         
-        actual_session_id = slack_session.session_id
-        
         # Create pending response using DM review system
         from llm_utils import create_pending_response
-        response_id = create_pending_response(
+        pending = await create_pending_response(
             session_id=actual_session_id,
             user_id=user_id,
             context=message,
             response_type='slack_ai',
             priority=2
         )
+        response_id = pending['pending_response_id']
         
         # Notify in Slack
         await slack_bot.send_message(
@@ -1812,31 +2364,26 @@ async def process_slack_ai_request(session_id: str, user_id: str, message: str,
             ephemeral_user=user_id
         )
 
+def _save_generated_image(generated_image: GeneratedImage) -> None:
+    db.session.add(generated_image)
+    db.session.commit()
+
 async def process_slack_image_request(session_id: str, user_id: str, description: str, channel_id: str):
     """Process image generation request from Slack"""
     try:
         # Get actual session ID from Slack session
-        team_id, slack_channel_id = session_id.split('_', 1)
-        slack_session = SlackSession.query.filter_by(
-            slack_team_id=team_id,
-            slack_channel_id=slack_channel_id
-        ).first()
+        actual_session_id = await asyncio.to_thread(lookup_slack_channel_session, session_id)
         
-        if not slack_session:
+        if not actual_session_id:
             await slack_bot.send_message(
                 channel=channel_id,
-                text="Error: No active session in this channel. Use `/sr-session create` first.",
+                text=SLACK_NO_SESSION_TEXT,
                 ephemeral_user=user_id
             )
             return
         
-        actual_session_id = slack_session.session_id
-        
         # Generate image directly
-        from image_gen_utils import ImageGenerator
-        generator = ImageGenerator()
-        
-        result = await generator.generate_image(
+        result = await image_generator.generate_image(
             prompt=description,
             provider="dalle",  # Default to DALL-E
             context=f"Slack Session: {actual_session_id}"
@@ -1855,8 +2402,7 @@ async def process_slack_image_request(session_id: str, user_id: str, description
             completed_at=datetime.utcnow()
         )
         
-        db.session.add(generated_image)
-        db.session.commit()
+        await asyncio.to_thread(_save_generated_image, generated_image)
         
         # Share image in Slack
         await slack_bot.upload_image(
@@ -1901,40 +2447,41 @@ async def handle_app_mention(event: Dict):
 async def notify_slack_on_dm_review(session_id: str, response_id: str, action: str, final_response: str):
     """Notify Slack channel when DM reviews a response"""
     try:
-        # Find Slack channel for this session
-        slack_session = SlackSession.query.filter_by(session_id=session_id).first()
-        if not slack_session:
-            return
-        
-        # Get the pending response to find the original user
-        pending_response = PendingResponse.query.get(response_id)
-        if not pending_response:
+        # Slack channel for this session and the original requester, in one query
+        row = await asyncio.to_thread(lambda: db.session.execute(
+            select(SlackSession.slack_channel_id, PendingResponse.user_id)
+            .join(PendingResponse, PendingResponse.session_id == SlackSession.session_id)
+            .where(SlackSession.session_id == session_id, PendingResponse.id == response_id)
+            .limit(1)
+        ).first())
+        if not row:
             return
+        channel_id, user_id = row
         
         if action == 'approved':
             message = f"✅ *AI Response Approved*\n" \
-                     f"For: <@{pending_response.user_id}>\n" \
+                     f"For: <@{user_id}>\n" \
                      f"Response: {final_response}"
             
             await slack_bot.send_message(
-                channel=slack_session.slack_channel_id,
+                channel=channel_id,
                 blocks=slack_bot.format_shadowrun_response(message, "success")
             )
         
         elif action == 'rejected':
             await slack_bot.send_message(
-                channel=slack_session.slack_channel_id,
-                text=f"❌ AI response for <@{pending_response.user_id}> was rejected by the DM.",
-                ephemeral_user=pending_response.user_id
+                channel=channel_id,
+                text=f"❌ AI response for <@{user_id}> was rejected by the DM.",
+                ephemeral_user=user_id
             )
         
         elif action == 'edited':
             message = f"✏️ *AI Response (Edited by DM)*\n" \
-                     f"For: <@{pending_response.user_id}>\n" \
+                     f"For: <@{user_id}>\n" \
                      f"Response: {final_response}"
             
             await slack_bot.send_message(
-                channel=slack_session.slack_channel_id,
+                channel=channel_id,
                 blocks=slack_bot.format_shadowrun_response(message, "success")
             )
         
@@ -1960,12 +2507,12 @@ def discover_character_sheets(session_id):
         user_id = request.args.get('user_id')
         
         # Validate session
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if not session:
             return jsonify({'error': 'Invalid session_id'}), 400
         
         manager = get_character_sheet_manager()
-        sheets = asyncio.run(manager.discover_character_sheets(session_id, user_id))
+        sheets = run_async(manager.discover_character_sheets(session_id, user_id))
         
         return jsonify({
             'status': 'success',
@@ -1990,16 +2537,16 @@ def import_character_sheet(session_id):
             return jsonify({'error': 'Missing required fields'}), 400
         
         # Validate session and user
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if not session:
             return jsonify({'error': 'Invalid session_id'}), 400
         
-        user_role = UserRole.query.filter_by(session_id=session_id, user_id=user_id).first()
+        user_role = get_user_role(session_id, user_id)
         if not user_role:
             return jsonify({'error': 'User not in session'}), 403
         
         manager = get_character_sheet_manager()
-        result = asyncio.run(manager.import_character_sheet(
+        result = run_async(manager.import_character_sheet(
             session_id, user_id, source_type, source_reference
         ))
         
@@ -2022,17 +2569,17 @@ def update_character_sheet_integrated(session_id, character_id):
             return jsonify({'error': 'Missing user_id'}), 400
         
         # Validate permissions
-        character = Character.query.filter_by(id=character_id, session_id=session_id).first()
-        if not character:
+        character = db.session.get(Character, character_id)
+        if not character or character.session_id != session_id:
             return jsonify({'error': 'Character not found'}), 404
         
         # Check if user owns character or is GM
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if character.user_id != user_id and session.gm_user_id != user_id:
             return jsonify({'error': 'Permission denied'}), 403
         
         manager = get_character_sheet_manager()
-        result = asyncio.run(manager.update_character_sheet(
+        result = run_async(manager.update_character_sheet(
             character_id, updates, sync_to_external
         ))
         
@@ -2053,16 +2600,16 @@ def create_wren_managed_copy(session_id, character_id):
             return jsonify({'error': 'Missing user_id'}), 400
         
         # Validate permissions (only GM or character owner)
-        character = Character.query.filter_by(id=character_id, session_id=session_id).first()
-        if not character:
+        character = db.session.get(Character, character_id)
+        if not character or character.session_id != session_id:
             return jsonify({'error': 'Character not found'}), 404
         
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if character.user_id != user_id and session.gm_user_id != user_id:
             return jsonify({'error': 'Permission denied'}), 403
         
         manager = get_character_sheet_manager()
-        result = asyncio.run(manager.create_wren_managed_copy(character_id))
+        result = run_async(manager.create_wren_managed_copy(character_id))
         
         return jsonify(result)
         
@@ -2081,12 +2628,12 @@ def sync_all_character_sheets(session_id):
             return jsonify({'error': 'Missing user_id'}), 400
         
         # Validate GM permissions
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if not session or session.gm_user_id != user_id:
             return jsonify({'error': 'Only GMs can sync all character sheets'}), 403
         
         manager = get_character_sheet_manager()
-        result = asyncio.run(manager.sync_all_character_sheets(session_id))
+        result = run_async(manager.sync_all_character_sheets(session_id))
         
         return jsonify(result)
         
@@ -2120,18 +2667,18 @@ def get_character_integration_info(session_id, character_id):
             return jsonify({'error': 'Missing user_id'}), 400
         
         # Validate permissions
-        character = Character.query.filter_by(id=character_id, session_id=session_id).first()
-        if not character:
+        character = db.session.get(Character, character_id)
+        if not character or character.session_id != session_id:
             return jsonify({'error': 'Character not found'}), 404
         
-        session = Session.query.filter_by(id=session_id).first()
-        user_role = UserRole.query.filter_by(session_id=session_id, user_id=user_id).first()
+        session = get_session_info(session_id)
+        user_role = get_user_role(session_id, user_id)
         
         if not user_role:
             return jsonify({'error': 'User not in session'}), 403
         
         manager = get_character_sheet_manager()
-        info = asyncio.run(manager.get_character_integration_info(character_id))
+        info = run_async(manager.get_character_integration_info(character_id))
         
         return jsonify(info)
         
@@ -2179,7 +2726,7 @@ def configure_slack_integration(session_id):
             return jsonify({'error': 'Missing required fields'}), 400
         
         # Validate GM permissions
-        session = Session.query.filter_by(id=session_id).first()
+        session = get_session_info(session_id)
         if not session or session.gm_user_id != user_id:
             return jsonify({'error': 'Only GMs can configure Slack integration'}), 403
         
@@ -2207,7 +2754,45 @@ def configure_slack_integration(session_id):
         logger.error(f"Error configuring Slack integration: {e}")
         return jsonify({'error': str(e)}), 500
 
+"""
+Schema Upgrades
+
+db.create_all() creates missing tables but never alters existing ones.
+Columns added to a model later are added here, idempotently, so older
+database files keep working.
+"""
+
+# (table, column, DDL type) added after the table first shipped
+_ADDED_COLUMNS = (
+    ('character', 'serialized_json', 'BLOB'),
+)
+
+def _make_chat_seq_unique(connection):
+    """Renumber any duplicate chat seqs in insertion order, then make the index unique"""
+    duplicates = connection.execute(text(
+        'SELECT 1 FROM chat_message GROUP BY memory_id, seq HAVING COUNT(*) > 1 LIMIT 1'
+    )).first()
+    if duplicates:
+        connection.execute(text(
+            'UPDATE chat_message SET seq = (SELECT COUNT(*) FROM chat_message AS earlier '
+            'WHERE earlier.memory_id = chat_message.memory_id AND earlier.id < chat_message.id)'
+        ))
+    connection.execute(text('DROP INDEX IF EXISTS ix_chat_message_memory_seq'))
+    connection.execute(text('CREATE UNIQUE INDEX ix_chat_message_memory_seq ON chat_message (memory_id, seq)'))
+
+def upgrade_schema():
+    """Create missing tables, add columns missing from existing ones and tighten old indexes"""
+    db.create_all()
+    inspector = inspect(db.engine)
+    with db.engine.begin() as connection:
+        for table, column, ddl_type in _ADDED_COLUMNS:
+            if column not in {c['name'] for c in inspector.get_columns(table)}:
+                connection.execute(text(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {ddl_type}'))
+        chat_indexes = {index['name']: index for index in inspector.get_indexes('chat_message')}
+        if not chat_indexes.get('ix_chat_message_memory_seq', {}).get('unique'):
+            _make_chat_seq_unique(connection)
+
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
     app.run(host="0.0.0.0", port=5000, debug=True)
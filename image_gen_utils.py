@@ -1,11 +1,193 @@
 import os
-import json
 import time
 import asyncio
 import httpx
+import orjson
 import base64
+import hashlib
+import random
+import re
+import uuid
+import weakref
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from cachetools import TLRUCache, TTLCache
+
+ENHANCEMENT_CACHE_TTL = 24 * 60 * 60
+_SHADOWRUN_SUFFIX = ", cyberpunk aesthetic, neon lighting, urban decay, cinematic lighting, detailed, 4k"
+_PROMPT_NOISE = re.compile(r"[^a-z0-9]+")
+
+def _enhancement_key(prompt: str, context: str) -> str:
+    """Cache key that ignores case, punctuation and spacing differences"""
+    normalized = "|".join(_PROMPT_NOISE.sub(" ", part.lower()).strip() for part in (prompt, context))
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+# One pooled HTTP/2 client per event loop so provider calls reuse TLS sessions
+_HTTP: Optional[httpx.AsyncClient] = None
+_HTTP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared provider client, creating it on first use"""
+    global _HTTP, _HTTP_LOOP
+    loop = asyncio.get_running_loop()
+    if _HTTP is None or _HTTP.is_closed or _HTTP_LOOP is not loop:
+        _HTTP = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+        )
+        _HTTP_LOOP = loop
+    return _HTTP
+
+async def close_http_client() -> None:
+    """Close the shared provider client"""
+    global _HTTP
+    if _HTTP is not None and _HTTP_LOOP is asyncio.get_running_loop():
+        await _HTTP.aclose()
+        _HTTP = None
+
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+PROVIDER_MAX_ATTEMPTS = 4
+PROVIDER_RETRY_MAX_DELAY = 16.0
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before the next attempt: Retry-After, else exponential backoff with jitter"""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), PROVIDER_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    return min(2 ** attempt + random.uniform(0, 1), PROVIDER_RETRY_MAX_DELAY)
+
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+class _Breaker:
+    """Per-provider circuit breaker: opens after consecutive outages, lets one trial through per cooldown"""
+    
+    def __init__(self):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    def check(self, provider: str) -> None:
+        if self.opened_at is None:
+            return
+        now = time.monotonic()
+        if now - self.opened_at < BREAKER_COOLDOWN:
+            raise ImageGenerationError(f"{provider} circuit open after {self.failures} consecutive failures")
+        # Half-open: this call is the trial, everyone else keeps failing fast
+        self.opened_at = now
+    
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.failures >= BREAKER_THRESHOLD:
+            self.opened_at = time.monotonic()
+
+_BREAKERS = {"dalle": _Breaker(), "stability": _Breaker()}
+
+# Concurrent requests allowed per provider; excess callers queue locally instead of collecting 429s
+PROVIDER_CONCURRENCY = {"dalle": 5, "stability": 3}
+_SEMAPHORES = weakref.WeakKeyDictionary()
+
+def _provider_slots(provider: str) -> asyncio.Semaphore:
+    """Semaphore limiting in-flight requests to a provider on the running loop"""
+    per_loop = _SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    if provider not in per_loop:
+        per_loop[provider] = asyncio.Semaphore(PROVIDER_CONCURRENCY[provider])
+    return per_loop[provider]
+
+async def _post_with_retry(provider: str, url: str, **kwargs) -> httpx.Response:
+    """POST to a provider, retrying rate limits, transient 5xx and transport errors"""
+    breaker = _BREAKERS[provider]
+    breaker.check(provider)
+    try:
+        async with _provider_slots(provider):
+            response = await _post_attempts(url, **kwargs)
+    except httpx.TransportError:
+        breaker.record(ok=False)
+        raise
+    except httpx.HTTPStatusError as e:
+        # Only outages count against the provider, not rejected prompts
+        breaker.record(ok=e.response.status_code not in RETRYABLE_STATUS)
+        raise
+    breaker.record(ok=True)
+    return response
+
+async def _post_attempts(url: str, **kwargs) -> httpx.Response:
+    client = _get_client()
+    for attempt in range(PROVIDER_MAX_ATTEMPTS):
+        last_attempt = attempt == PROVIDER_MAX_ATTEMPTS - 1
+        try:
+            response = await client.post(url, **kwargs)
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+            await asyncio.sleep(_retry_delay(attempt))
+            continue
+        if response.status_code not in RETRYABLE_STATUS or last_attempt:
+            response.raise_for_status()
+            return response
+        await asyncio.sleep(_retry_delay(attempt, response))
+
+class ImageStore:
+    """Uploads generated images to S3 when S3_BUCKET is configured"""
+    
+    def __init__(self, bucket: Optional[str] = None, public_base_url: Optional[str] = None):
+        self.bucket = bucket
+        self.public_base_url = (public_base_url or f"https://{bucket}.s3.amazonaws.com").rstrip("/") if bucket else None
+        self._client = None
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.bucket)
+    
+    def _s3(self):
+        if self._client is None:
+            import boto3  # Optional dependency, only needed when S3_BUCKET is set
+            self._client = boto3.client("s3")
+        return self._client
+    
+    async def put(self, data: bytes, content_type: str = "image/png") -> str:
+        """Store image bytes and return their public URL"""
+        key = f"gen/{uuid.uuid4()}.png"
+        await asyncio.to_thread(self._s3().put_object, Bucket=self.bucket, Key=key, Body=data, ContentType=content_type)
+        return f"{self.public_base_url}/{key}"
+
+class ImageResultCache:
+    """In-memory cache of provider results keyed by the exact request body"""
+    
+    MAX_ENTRY_BYTES = 2 * 1024 * 1024
+    # DALL-E's own URLs expire after an hour; unmirrored results must be gone well before that
+    PROVIDER_URL_TTL = 45 * 60
+    
+    def __init__(self, maxsize: int = 500, ttl: int = 24 * 60 * 60, timer=time.monotonic):
+        self.ttl = ttl
+        self._entries = TLRUCache(maxsize=maxsize, ttu=lambda _key, entry, now: now + entry[1], timer=timer)
+        self.stats = {"hits": 0, "misses": 0}
+    
+    @staticmethod
+    def key(provider: str, body: Dict[str, Any]) -> str:
+        return hashlib.sha256(orjson.dumps({"provider": provider, **body}, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return {**entry[0], "cached": True, "generation_time": 0}
+    
+    def set(self, key: str, result: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        # Large inline images (Stability base64 plus its decoded bytes) are not worth holding in memory
+        size = len(result.get("image_url") or "") + len(result.get("image_data") or b"")
+        if size > self.MAX_ENTRY_BYTES:
+            return
+        self._entries[key] = (result, min(ttl or self.ttl, self.ttl))
 
 class ImageGenerationError(Exception):
     """Custom exception for image generation errors"""
@@ -18,9 +200,43 @@ class ImageGenerator:
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.stability_api_key = os.getenv("STABILITY_API_KEY")
         self.replicate_api_key = os.getenv("REPLICATE_API_TOKEN")
+        self._enhancement_cache = TTLCache(maxsize=5_000, ttl=ENHANCEMENT_CACHE_TTL)
+        self._enhancement_inflight: Dict[str, asyncio.Future] = {}
+        self.enhancement_stats = {"hits": 0, "misses": 0}
+        self.result_cache = ImageResultCache()
+        self.image_store = ImageStore(os.getenv("S3_BUCKET"), os.getenv("S3_PUBLIC_URL"))
         
     async def enhance_prompt_for_shadowrun(self, original_prompt: str, context: str = "") -> str:
         """Use LLM to enhance prompts specifically for Shadowrun imagery"""
+        key = _enhancement_key(original_prompt, context)
+        cached = self._enhancement_cache.get(key)
+        if cached is not None:
+            self.enhancement_stats["hits"] += 1
+            return cached
+        # Concurrent misses for the same prompt share one LLM call
+        inflight = self._enhancement_inflight.get(key)
+        if inflight is not None:
+            self.enhancement_stats["hits"] += 1
+            return await asyncio.shield(inflight)
+        self.enhancement_stats["misses"] += 1
+        
+        future = asyncio.get_running_loop().create_future()
+        self._enhancement_inflight[key] = future
+        try:
+            enhanced = await self._enhance_with_llm(original_prompt, context)
+            if enhanced is not None:
+                self._enhancement_cache[key] = enhanced
+            else:
+                enhanced = self._basic_prompt_enhancement(original_prompt)
+            future.set_result(enhanced)
+            return enhanced
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._enhancement_inflight[key]
+    
+    async def _enhance_with_llm(self, original_prompt: str, context: str) -> Optional[str]:
+        """Ask the LLM for an enhanced prompt; None when the call fails"""
         enhancement_prompt = f"""
         Transform this Shadowrun scene description into a detailed, visual prompt for AI image generation.
         Focus on cyberpunk aesthetics, neon lighting, urban decay, and high-tech/low-life atmosphere.
@@ -45,118 +261,175 @@ class ImageGenerator:
             return enhanced.strip()
         except Exception as e:
             print(f"Prompt enhancement failed: {e}")
-            # Fallback to basic enhancement
-            return self._basic_prompt_enhancement(original_prompt)
+            # Caller falls back to basic enhancement; not cached
+            return None
     
     def _basic_prompt_enhancement(self, prompt: str) -> str:
         """Basic prompt enhancement without LLM"""
-        shadowrun_keywords = [
-            "cyberpunk aesthetic", "neon lighting", "urban decay", 
-            "high-tech low-life", "dystopian atmosphere", "chrome and shadows",
-            "rain-soaked streets", "holographic displays", "corporate towers"
-        ]
-        
-        enhanced = f"{prompt}, {', '.join(shadowrun_keywords[:3])}, cinematic lighting, detailed, 4k"
-        return enhanced
+        return f"{prompt}{_SHADOWRUN_SUFFIX}"
     
     async def generate_with_dalle(self, prompt: str, size: str = "1024x1024", quality: str = "standard", **kwargs) -> Dict[str, Any]:
         """Generate image using DALL-E 3"""
         if not self.openai_api_key:
             raise ImageGenerationError("OpenAI API key not configured")
         
+        body = {
+            "model": "dall-e-3",
+            "prompt": prompt,
+            "n": 1,
+            "size": size,
+            "quality": quality,
+            "response_format": "url"
+        }
+        cache_key = self.result_cache.key("dalle", body)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         start_time = time.time()
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                response = await client.post(
-                    "https://api.openai.com/v1/images/generations",
-                    headers={
-                        "Authorization": f"Bearer {self.openai_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "dall-e-3",
-                        "prompt": prompt,
-                        "n": 1,
-                        "size": size,
-                        "quality": quality,
-                        "response_format": "url"
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                generation_time = time.time() - start_time
-                
-                return {
-                    "success": True,
-                    "image_url": data["data"][0]["url"],
-                    "revised_prompt": data["data"][0].get("revised_prompt", prompt),
-                    "generation_time": generation_time,
-                    "provider": "dalle"
-                }
-                
-            except httpx.HTTPStatusError as e:
-                error_detail = e.response.text if e.response else str(e)
-                raise ImageGenerationError(f"DALL-E API error: {e.response.status_code} - {error_detail}")
-            except Exception as e:
-                raise ImageGenerationError(f"DALL-E generation failed: {str(e)}")
+        try:
+            response = await _post_with_retry(
+                "dalle",
+                "https://api.openai.com/v1/images/generations",
+                headers={
+                    "Authorization": f"Bearer {self.openai_api_key}",
+                    "Content-Type": "application/json"
+                },
+                content=orjson.dumps(body)
+            )
+            data = orjson.loads(response.content)
+            
+            generation_time = time.time() - start_time
+            
+            provider_url = data["data"][0]["url"]
+            result = {
+                "success": True,
+                "image_url": await self._mirror_to_storage(provider_url),
+                "revised_prompt": data["data"][0].get("revised_prompt", prompt),
+                "generation_time": generation_time,
+                "provider": "dalle"
+            }
+            mirrored = result["image_url"] != provider_url
+            self.result_cache.set(cache_key, result, None if mirrored else ImageResultCache.PROVIDER_URL_TTL)
+            return result
+            
+        except httpx.HTTPStatusError as e:
+            error_detail = e.response.text if e.response else str(e)
+            raise ImageGenerationError(f"DALL-E API error: {e.response.status_code} - {error_detail}")
+        except Exception as e:
+            raise ImageGenerationError(f"DALL-E generation failed: {str(e)}")
     
     async def generate_with_stability(self, prompt: str, style_preset: str = "cyberpunk", **kwargs) -> Dict[str, Any]:
         """Generate image using Stability AI"""
         if not self.stability_api_key:
             raise ImageGenerationError("Stability AI API key not configured")
         
+        body = {
+            "text_prompts": [{"text": prompt}],
+            "cfg_scale": 7,
+            "height": 1024,
+            "width": 1024,
+            "samples": 1,
+            "steps": 30,
+            "style_preset": style_preset
+        }
+        cache_key = self.result_cache.key("stability", body)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         start_time = time.time()
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                response = await client.post(
-                    "https://api.stability.ai/v1/generation/stable-diffusion-xl-1024-v1-0/text-to-image",
-                    headers={
-                        "Authorization": f"Bearer {self.stability_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "text_prompts": [{"text": prompt}],
-                        "cfg_scale": 7,
-                        "height": 1024,
-                        "width": 1024,
-                        "samples": 1,
-                        "steps": 30,
-                        "style_preset": style_preset
-                    }
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                generation_time = time.time() - start_time
-                
-                # Stability returns base64 encoded images
-                image_data = base64.b64decode(data["artifacts"][0]["base64"])
-                
-                # In production, you'd save this to cloud storage
-                # For now, we'll return a placeholder URL
+        try:
+            response = await _post_with_retry(
+                "stability",
+                "https://api.stability.ai/v1/generation/stable-diffusion-xl-1024-v1-0/text-to-image",
+                headers={
+                    "Authorization": f"Bearer {self.stability_api_key}",
+                    "Content-Type": "application/json"
+                },
+                content=orjson.dumps(body)
+            )
+            data = orjson.loads(response.content)
+            
+            generation_time = time.time() - start_time
+            
+            # Stability returns base64 encoded images; decoding MBs off the event loop
+            image_data = await asyncio.to_thread(base64.b64decode, data["artifacts"][0]["base64"])
+            
+            image_url = None
+            if self.image_store.enabled:
+                try:
+                    image_url = await self.image_store.put(image_data)
+                except Exception as e:
+                    print(f"Image upload failed: {e}")
+            if image_url is None:
+                # No storage configured: inline the image
                 image_url = f"data:image/png;base64,{data['artifacts'][0]['base64']}"
-                
-                return {
-                    "success": True,
-                    "image_url": image_url,
-                    "image_data": image_data,
-                    "generation_time": generation_time,
-                    "provider": "stability"
-                }
-                
-            except httpx.HTTPStatusError as e:
-                error_detail = e.response.text if e.response else str(e)
-                raise ImageGenerationError(f"Stability AI error: {e.response.status_code} - {error_detail}")
-            except Exception as e:
-                raise ImageGenerationError(f"Stability AI generation failed: {str(e)}")
+            
+            result = {
+                "success": True,
+                "image_url": image_url,
+                "image_data": image_data,
+                "generation_time": generation_time,
+                "provider": "stability"
+            }
+            self.result_cache.set(cache_key, result)
+            return result
+            
+        except httpx.HTTPStatusError as e:
+            error_detail = e.response.text if e.response else str(e)
+            raise ImageGenerationError(f"Stability AI error: {e.response.status_code} - {error_detail}")
+        except Exception as e:
+            raise ImageGenerationError(f"Stability AI generation failed: {str(e)}")
+    
+    async def _mirror_to_storage(self, url: str) -> str:
+        """Copy a provider-hosted image (DALL-E URLs expire after an hour) into our storage"""
+        if not self.image_store.enabled:
+            return url
+        try:
+            response = await _get_client().get(url)
+            response.raise_for_status()
+            return await self.image_store.put(response.content, response.headers.get("Content-Type", "image/png"))
+        except Exception as e:
+            print(f"Image mirroring failed: {e}")
+            return url
     
     async def generate_image(self, prompt: str, provider: str = "dalle", **kwargs) -> Dict[str, Any]:
-        """Generate image with specified provider"""
+        """Generate image with specified provider ("auto" races every configured one)"""
+        if provider == "auto":
+            return await self.generate_image_race(prompt, **kwargs)
+        
         enhanced_prompt = await self.enhance_prompt_for_shadowrun(prompt, kwargs.get("context", ""))
+        return await self._generate_with(provider, enhanced_prompt, **kwargs)
+    
+    async def generate_image_race(self, prompt: str, providers: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+        """Generate with several providers at once and return the first success"""
+        providers = providers or self.get_available_providers()
+        if not providers:
+            raise ImageGenerationError("No image providers configured")
         
+        # Enhancement is shared, so compute it once before fanning out
+        enhanced_prompt = await self.enhance_prompt_for_shadowrun(prompt, kwargs.get("context", ""))
+        pending = {
+            asyncio.create_task(self._generate_with(name, enhanced_prompt, **kwargs)) for name in providers
+        }
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(str(task.exception()))
+        finally:
+            # Losers are cancelled so they stop holding connections
+            for task in pending:
+                task.cancel()
+        raise ImageGenerationError(f"All providers failed: {'; '.join(errors)}")
+    
+    async def _generate_with(self, provider: str, enhanced_prompt: str, **kwargs) -> Dict[str, Any]:
         if provider == "dalle":
             return await self.generate_with_dalle(enhanced_prompt, **kwargs)
         elif provider == "stability":
@@ -173,6 +446,10 @@ class ImageGenerator:
             providers.append("stability")
         return providers
 
+# Shared instance: API keys are read once at import, and the prompt and result caches
+# and their stats accumulate across every request
+image_generator = ImageGenerator()
+
 # Utility functions for database operations
 async def create_image_generation_request(session_id: str, user_id: str, prompt: str, 
                                         request_type: str = "scene", priority: int = 1, 
@@ -185,7 +462,7 @@ async def create_image_generation_request(session_id: str, user_id: str, prompt:
         user_id=user_id,
         request_type=request_type,
         context=prompt,
-        style_preferences=json.dumps(style_preferences or {}),
+        style_preferences=orjson.dumps(style_preferences or {}).decode(),
         priority=priority
     )
     
@@ -198,30 +475,32 @@ async def process_image_generation(request_id: str) -> Dict[str, Any]:
     """Process a queued image generation request"""
     from app import db, ImageGeneration, GeneratedImage
     
-    request = ImageGeneration.query.get(request_id)
+    # Blocking database work goes through to_thread so the shared event loop keeps serving other requests
+    request = await asyncio.to_thread(db.session.get, ImageGeneration, request_id)
     if not request:
         raise ImageGenerationError("Generation request not found")
     
-    # Update status to processing
+    # Transient state, written together with the outcome in a single commit
     request.status = "processing"
     request.started_at = datetime.utcnow()
-    db.session.commit()
+    style_prefs = {}
     
     try:
-        generator = ImageGenerator()
-        style_prefs = json.loads(request.style_preferences or "{}")
+        style_prefs = orjson.loads(request.style_preferences or "{}")
         provider = style_prefs.get("provider", "dalle")
         
         # Generate the image
-        result = await generator.generate_image(
+        result = await image_generator.generate_image(
             request.context,
             provider=provider,
             context=f"Session: {request.session_id}, Type: {request.request_type}",
             **style_prefs
         )
         
-        # Create GeneratedImage record
+        # Create GeneratedImage record; the id is known up front so no flush is needed to link it
+        image_id = str(uuid.uuid4())
         generated_image = GeneratedImage(
+            id=image_id,
             session_id=request.session_id,
             user_id=request.user_id,
             prompt=request.context,
@@ -237,15 +516,15 @@ async def process_image_generation(request_id: str) -> Dict[str, Any]:
         
         # Update request status
         request.status = "completed"
-        request.result_image_id = generated_image.id
+        request.result_image_id = image_id
         request.completed_at = datetime.utcnow()
         
-        db.session.commit()
+        await asyncio.to_thread(db.session.commit)
         
         return {
             "success": True,
             "request_id": request_id,
-            "image_id": generated_image.id,
+            "image_id": image_id,
             "image_url": result["image_url"],
             "generation_time": result["generation_time"]
         }
@@ -258,6 +537,7 @@ async def process_image_generation(request_id: str) -> Dict[str, Any]:
         
         # Create failed GeneratedImage record for tracking
         failed_image = GeneratedImage(
+            id=str(uuid.uuid4()),
             session_id=request.session_id,
             user_id=request.user_id,
             prompt=request.context,
@@ -269,7 +549,7 @@ async def process_image_generation(request_id: str) -> Dict[str, Any]:
         
         db.session.add(failed_image)
         request.result_image_id = failed_image.id
-        db.session.commit()
+        await asyncio.to_thread(db.session.commit)
         
         return {
             "success": False,
@@ -279,24 +559,29 @@ async def process_image_generation(request_id: str) -> Dict[str, Any]:
 
 async def get_session_images(session_id: str, user_id: str = None, limit: int = 20) -> List[Dict]:
     """Get generated images for a session"""
-    from app import GeneratedImage
+    from sqlalchemy import select
+    from app import db, GeneratedImage, unpack_list
     
-    query = GeneratedImage.query.filter_by(session_id=session_id)
+    # Project only the listed columns; served by the (session_id, user_id, created_at) index
+    query = select(
+        GeneratedImage.id, GeneratedImage.prompt, GeneratedImage.image_url, GeneratedImage.provider,
+        GeneratedImage.status, GeneratedImage.created_at, GeneratedImage.is_favorite, GeneratedImage.tags
+    ).where(GeneratedImage.session_id == session_id)
     if user_id:
-        query = query.filter_by(user_id=user_id)
+        query = query.where(GeneratedImage.user_id == user_id)
     
-    images = query.order_by(GeneratedImage.created_at.desc()).limit(limit).all()
+    rows = db.session.execute(query.order_by(GeneratedImage.created_at.desc()).limit(limit))
     
     return [
         {
-            "id": img.id,
-            "prompt": img.prompt,
-            "image_url": img.image_url,
-            "provider": img.provider,
-            "status": img.status,
-            "created_at": img.created_at.isoformat(),
-            "is_favorite": img.is_favorite,
-            "tags": json.loads(img.tags) if img.tags else []
+            "id": row.id,
+            "prompt": row.prompt,
+            "image_url": row.image_url,
+            "provider": row.provider,
+            "status": row.status,
+            "created_at": row.created_at.isoformat(),
+            "is_favorite": row.is_favorite,
+            "tags": unpack_list(row.tags)
         }
-        for img in images
-    ] 
\ No newline at end of file
+        for row in rows
+    ]
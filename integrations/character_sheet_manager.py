@@ -3,8 +3,14 @@ Unified Character Sheet Manager
 Manages character sheets across Google Docs, Slack, and local database
 """
 
-import json
+import asyncio
 import logging
+import os
+import time
+import orjson
+from cachetools import TTLCache
+from sqlalchemy import and_, select
+from sqlalchemy.orm import load_only
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 from enum import Enum
@@ -14,6 +20,69 @@ from .slack_integration import SlackCharacterSheet, SlackCharacterSheetSync
 
 logger = logging.getLogger(__name__)
 
+# Characters synced in parallel; kept modest for Google and Slack rate limits
+SYNC_CONCURRENCY = int(os.getenv('WREN_SYNC_CONCURRENCY', 8))
+DISCOVERY_CACHE_TTL = 30
+
+# Requests per minute we allow ourselves, just under the services' documented quotas
+GOOGLE_RATE_LIMIT = int(os.getenv('GOOGLE_RATE_LIMIT', 60))
+SLACK_RATE_LIMIT = int(os.getenv('SLACK_RATE_LIMIT', 50))
+
+class _RateLimiter:
+    """Token bucket: bursts up to max_rate, then paces callers locally instead of being throttled remotely"""
+    
+    def __init__(self, max_rate: int, period: float = 60.0):
+        self.capacity = max_rate
+        self.rate = max_rate / period
+        self.tokens = float(max_rate)
+        self.updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # Take the token now, even on credit, so concurrent callers queue up in arrival order
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+async def _paced(limiter: _RateLimiter, coro):
+    await limiter.acquire()
+    return await coro
+
+def _dumps(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+def _loads(raw: Optional[str]) -> Any:
+    return orjson.loads(raw) if raw else {}
+
+_JSON_FIELDS = frozenset({'attributes', 'skills', 'qualities', 'gear', 'contacts'})
+_WRITABLE_FIELDS: Optional[frozenset] = None
+
+def _writable_fields() -> frozenset:
+    """Character columns external sheets may write, resolved on first use"""
+    global _WRITABLE_FIELDS
+    if _WRITABLE_FIELDS is None:
+        from app import CHARACTER_SHEET_FIELDS
+        _WRITABLE_FIELDS = frozenset(CHARACTER_SHEET_FIELDS)
+    return _WRITABLE_FIELDS
+
+def _load_extra(character) -> Dict[str, Any]:
+    """Parsed extra_data, memoized on the instance until the raw string changes"""
+    # Not a mapped Character column; only present once an integration has stored references
+    raw = getattr(character, 'extra_data', None) or '{}'
+    cached = character.__dict__.get('_extra_cache')
+    if cached is not None and cached[0] is raw:
+        return cached[1]
+    extra = _loads(raw)
+    character.__dict__['_extra_cache'] = (raw, extra)
+    return extra
+
+def _store_extra(character, extra: Dict[str, Any]) -> None:
+    """Serialize extra_data once and keep the parsed copy memoized"""
+    character.extra_data = _dumps(extra)
+    character.__dict__['_extra_cache'] = (character.extra_data, extra)
+
 class IntegrationType(Enum):
     GOOGLE_DOCS = "google_docs"
     SLACK = "slack"
@@ -23,7 +92,16 @@ class CharacterSheetManager:
     """Unified manager for character sheets across all platforms"""
     
     def __init__(self, db_session):
+        # Resolved once here; app imports this module, so a module-level import would be circular
+        from app import Character, Session, SlackSession
+        self._Character = Character
+        self._Session = Session
+        self._SlackSession = SlackSession
+        
         self.db = db_session
+        self._discover_cache = TTLCache(maxsize=512, ttl=DISCOVERY_CACHE_TTL)
+        self._google_limiter = _RateLimiter(GOOGLE_RATE_LIMIT)
+        self._slack_limiter = _RateLimiter(SLACK_RATE_LIMIT)
         
         # Initialize integration services
         try:
@@ -45,90 +123,124 @@ class CharacterSheetManager:
             self.slack = None
             self.slack_sync = None
             self.slack_available = False
+        
+        self._refresh_integration_status()
     
     async def discover_character_sheets(self, session_id: str, user_id: str = None) -> Dict[str, List[Dict]]:
         """Discover character sheets across all platforms"""
-        discovered_sheets = {
-            'google_docs': [],
-            'slack': [],
-            'local': []
-        }
-        
-        # Discover Google Docs sheets
-        if self.google_available:
-            try:
-                from app import UserRole, Session
-                session = Session.query.get(session_id)
-                if session:
-                    # Get user email if available for targeted search
-                    user_email = None
-                    if user_id:
-                        # This would need to be implemented based on your user system
-                        pass
-                    
-                    docs = await self.google_docs.list_accessible_documents(user_email)
-                    discovered_sheets['google_docs'] = [
-                        {
-                            'id': doc['id'],
-                            'name': doc['name'],
-                            'type': 'google_docs',
-                            'modified': doc['modified'],
-                            'owner': doc['owner'],
-                            'source': 'Google Docs'
-                        }
-                        for doc in docs
-                    ]
-                    
-            except Exception as e:
-                logger.error(f"Error discovering Google Docs sheets: {e}")
-        
-        # Discover Slack sheets
-        if self.slack_available:
-            try:
-                from app import SlackSession
-                slack_session = SlackSession.query.filter_by(session_id=session_id).first()
-                if slack_session:
-                    sheets = await self.slack.find_character_sheets(
-                        slack_session.slack_channel_id, user_id
-                    )
-                    discovered_sheets['slack'] = [
-                        {
-                            **sheet,
-                            'type': 'slack',
-                            'source': 'Slack'
-                        }
-                        for sheet in sheets
-                    ]
-                    
-            except Exception as e:
-                logger.error(f"Error discovering Slack sheets: {e}")
+        key = (session_id, user_id)
+        cached = self._discover_cache.get(key)
+        if cached is not None:
+            return cached
         
-        # Get local database sheets
+        # One round trip answers "does the session exist", its Slack channel and its characters
         try:
-            from app import Character
-            query = Character.query.filter_by(session_id=session_id)
-            if user_id:
-                query = query.filter_by(user_id=user_id)
-            
-            local_characters = query.all()
-            discovered_sheets['local'] = [
+            rows = self._discovery_rows(session_id, user_id)
+            local = [
                 {
-                    'id': char.id,
-                    'name': char.name,
-                    'handle': char.handle,
+                    'id': row.character_id,
+                    'name': row.name,
+                    'handle': row.handle,
                     'type': 'local',
-                    'user_id': char.user_id,
-                    'created_at': char.created_at.isoformat() if char.created_at else None,
+                    'user_id': row.user_id,
+                    'created_at': row.created_at.isoformat() if row.created_at else None,
                     'source': 'Local Database'
                 }
-                for char in local_characters
+                for row in rows if row.character_id is not None
             ]
-            
         except Exception as e:
-            logger.error(f"Error getting local sheets: {e}")
+            rows, local = [], e
+        session_exists = bool(rows)
+        slack_channel_id = rows[0].slack_channel_id if rows else None
+        
+        google, slack = await asyncio.gather(
+            self._discover_google(session_exists, user_id),
+            self._discover_slack(slack_channel_id, user_id),
+            return_exceptions=True
+        )
         
+        discovered_sheets = {}
+        complete = True
+        for source, found, label in (('google_docs', google, 'Google Docs sheets'),
+                                     ('slack', slack, 'Slack sheets'),
+                                     ('local', local, 'local sheets')):
+            if isinstance(found, Exception):
+                logger.error(f"Error discovering {label}: {found}")
+                found = []
+                complete = False
+            discovered_sheets[source] = found
+        
+        # Partial results are not cached, so the next poll retries the failed source
+        if complete:
+            self._discover_cache[key] = discovered_sheets
         return discovered_sheets
     
+    def invalidate_discovery(self, session_id: str) -> None:
+        """Drop cached discovery results for every user in a session"""
+        for key in [key for key in self._discover_cache.keys() if key[0] == session_id]:
+            self._discover_cache.pop(key, None)
+    
+    async def _discover_google(self, session_exists: bool, user_id: str = None) -> List[Dict]:
+        if not self.google_available or not session_exists:
+            return []
+        
+        # Get user email if available for targeted search
+        user_email = None
+        if user_id:
+            # This would need to be implemented based on your user system
+            pass
+        
+        docs = await _paced(self._google_limiter, self.google_docs.list_accessible_documents(user_email))
+        return [
+            {
+                'id': doc['id'],
+                'name': doc['name'],
+                'type': 'google_docs',
+                'modified': doc['modified'],
+                'owner': doc['owner'],
+                'source': 'Google Docs'
+            }
+            for doc in docs
+        ]
+    
+    async def _discover_slack(self, slack_channel_id: Optional[str], user_id: str = None) -> List[Dict]:
+        if not self.slack_available or not slack_channel_id:
+            return []
+        
+        sheets = await _paced(self._slack_limiter, self.slack.find_character_sheets(slack_channel_id, user_id))
+        return [
+            {
+                **sheet,
+                'type': 'slack',
+                'source': 'Slack'
+            }
+            for sheet in sheets
+        ]
+    
+    def _discovery_rows(self, session_id: str, user_id: str = None) -> list:
+        """Session row outer-joined to its characters, with the Slack channel as a scalar subquery"""
+        Session, SlackSession, Character = self._Session, self._SlackSession, self._Character
+        slack_channel = (
+            select(SlackSession.slack_channel_id)
+            .where(SlackSession.session_id == Session.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        join_on = Character.session_id == Session.id
+        if user_id:
+            join_on = and_(join_on, Character.user_id == user_id)
+        
+        return self.db.execute(
+            select(
+                slack_channel.label('slack_channel_id'), Character.id.label('character_id'), Character.name,
+                Character.handle, Character.user_id, Character.created_at
+            )
+            .select_from(Session)
+            .outerjoin(Character, join_on)
+            .where(Session.id == session_id)
+            .order_by(Character.id)
+        ).all()
+    
     async def import_character_sheet(self, session_id: str, user_id: str, 
                                    source_type: str, source_reference: Dict[str, Any]) -> Dict[str, Any]:
         """Import a character sheet from external source to local database"""
@@ -137,24 +249,23 @@ class CharacterSheetManager:
                 if not self.google_available:
                     return {'status': 'error', 'error': 'Google Docs integration not available'}
                 
-                result = await self.google_sync.sync_character_sheet(
+                result = await _paced(self._google_limiter, self.google_sync.sync_character_sheet(
                     source_reference['document_id'], session_id, user_id
-                )
+                ))
                 
                 # Create a WREN-managed copy
                 if result['status'] == 'success':
-                    copy_id = await self.google_docs.create_character_sheet_copy(
+                    copy_id = await _paced(self._google_limiter, self.google_docs.create_character_sheet_copy(
                         source_reference['document_id'], session_id
-                    )
+                    ))
                     
                     # Update character with copy reference
-                    from app import Character
-                    character = Character.query.get(result['character_id'])
+                    character = self.db.get(self._Character, result['character_id'])
                     if character:
-                        extra_data = json.loads(character.extra_data or '{}')
+                        extra_data = _load_extra(character)
                         extra_data['google_docs']['wren_copy_id'] = copy_id
-                        character.extra_data = json.dumps(extra_data)
-                        self.db.session.commit()
+                        _store_extra(character, extra_data)
+                        self.db.commit()
                         
                         result['wren_copy_id'] = copy_id
                 
@@ -164,9 +275,9 @@ class CharacterSheetManager:
                 if not self.slack_available:
                     return {'status': 'error', 'error': 'Slack integration not available'}
                 
-                return await self.slack_sync.sync_from_slack(
+                return await _paced(self._slack_limiter, self.slack_sync.sync_from_slack(
                     source_reference['channel_id'], user_id, session_id, source_reference
-                )
+                ))
                 
             else:
                 return {'status': 'error', 'error': f'Unknown source type: {source_type}'}
@@ -174,34 +285,21 @@ class CharacterSheetManager:
         except Exception as e:
             logger.error(f"Error importing character sheet: {e}")
             return {'status': 'error', 'error': str(e)}
+        finally:
+            self.invalidate_discovery(session_id)
     
     async def update_character_sheet(self, character_id: int, updates: Dict[str, Any], 
                                    sync_to_external: bool = True) -> Dict[str, Any]:
         """Update character sheet and optionally sync to external sources"""
         try:
-            from app import Character
-            
-            character = Character.query.get(character_id)
+            character = self.db.get(self._Character, character_id)
             if not character:
                 return {'status': 'error', 'error': 'Character not found'}
             
-            # Apply updates to local character
-            update_count = 0
-            for field, value in updates.items():
-                if hasattr(character, field):
-                    if field in ['attributes', 'skills', 'qualities', 'gear', 'contacts']:
-                        # JSON fields
-                        if isinstance(value, dict) or isinstance(value, list):
-                            setattr(character, field, json.dumps(value))
-                        else:
-                            setattr(character, field, value)
-                    else:
-                        setattr(character, field, value)
-                    update_count += 1
-            
-            # Update timestamp
-            character.updated_at = datetime.utcnow()
-            self.db.session.commit()
+            session_id = character.session_id
+            update_count = self._apply_updates_local(character, updates)
+            self.db.commit()
+            self.invalidate_discovery(session_id)
             
             result = {
                 'status': 'success',
@@ -212,78 +310,91 @@ class CharacterSheetManager:
             
             # Sync to external sources if requested
             if sync_to_external:
-                extra_data = json.loads(character.extra_data or '{}')
-                
-                # Sync to Google Docs
-                if 'google_docs' in extra_data and self.google_available:
-                    google_result = await self.google_sync.push_updates_to_docs(character_id, updates)
-                    result['sync_results']['google_docs'] = google_result
-                
-                # Sync to Slack
-                if 'slack' in extra_data and self.slack_available:
-                    slack_result = await self.slack_sync.push_updates_to_slack(character_id, updates)
-                    result['sync_results']['slack'] = slack_result
+                result['sync_results'] = await self._push_external(character, updates)
             
             return result
             
         except Exception as e:
             logger.error(f"Error updating character sheet: {e}")
-            self.db.session.rollback()
+            self.db.rollback()
             return {'status': 'error', 'error': str(e)}
     
+    async def _push_external(self, character, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """Push updates to the external sheets linked to a loaded character"""
+        extra_data = _load_extra(character)
+        
+        # Google Docs and Slack are independent services, so push to both at once
+        pushes = {}
+        if 'google_docs' in extra_data and self.google_available:
+            pushes['google_docs'] = _paced(self._google_limiter, self.google_sync.push_updates_to_docs(character.id, updates))
+        if 'slack' in extra_data and self.slack_available:
+            pushes['slack'] = _paced(self._slack_limiter, self.slack_sync.push_updates_to_slack(character.id, updates))
+        
+        outcomes = await asyncio.gather(*pushes.values(), return_exceptions=True)
+        return {
+            platform: {'status': 'error', 'error': str(outcome)} if isinstance(outcome, Exception) else outcome
+            for platform, outcome in zip(pushes, outcomes)
+        }
+    
+    def _apply_updates_local(self, character, updates: Dict[str, Any]) -> int:
+        """Stage field writes on a loaded character without committing; returns the count applied"""
+        writable = _writable_fields()
+        update_count = 0
+        for field, value in updates.items():
+            if field not in writable:
+                continue
+            if field in _JSON_FIELDS and isinstance(value, (dict, list)):
+                value = _dumps(value)
+            setattr(character, field, value)
+            update_count += 1
+        
+        # Update timestamp
+        character.updated_at = datetime.utcnow()
+        return update_count
+    
     async def create_wren_managed_copy(self, character_id: int) -> Dict[str, Any]:
         """Create WREN-managed copies in external platforms"""
         try:
-            from app import Character
-            
-            character = Character.query.get(character_id)
+            # The copies serialize the whole sheet, so load the full row in one statement
+            character = self.db.get(self._Character, character_id)
             if not character:
                 return {'status': 'error', 'error': 'Character not found'}
             
-            extra_data = json.loads(character.extra_data or '{}')
+            extra_data = _load_extra(character)
             result = {'status': 'success', 'copies_created': {}}
             
-            # Create Google Docs copy
-            if 'google_docs' in extra_data and self.google_available:
-                google_info = extra_data['google_docs']
+            # Google Docs copy and Slack managed thread are created concurrently
+            creations = {}
+            google_info = extra_data.get('google_docs')
+            if google_info is not None and self.google_available:
                 if 'document_id' in google_info and 'wren_copy_id' not in google_info:
-                    try:
-                        copy_id = await self.google_docs.create_character_sheet_copy(
-                            google_info['document_id'], character.session_id
-                        )
-                        google_info['wren_copy_id'] = copy_id
-                        result['copies_created']['google_docs'] = copy_id
-                    except Exception as e:
-                        logger.error(f"Error creating Google Docs copy: {e}")
-                        result['copies_created']['google_docs'] = f"Error: {str(e)}"
+                    creations['google_docs'] = _paced(self._google_limiter, self.google_docs.create_character_sheet_copy(
+                        google_info['document_id'], character.session_id
+                    ))
             
-            # Create Slack managed thread
-            if 'slack' in extra_data and self.slack_available:
-                slack_info = extra_data['slack']
+            slack_info = extra_data.get('slack')
+            if slack_info is not None and self.slack_available:
                 if 'channel_id' in slack_info and 'wren_thread_ts' not in slack_info:
-                    try:
-                        # Get current character data
-                        character_data = {
-                            'name': character.name,
-                            'handle': character.handle,
-                            'archetype': character.archetype,
-                            'attributes': json.loads(character.attributes or '{}'),
-                            'skills': json.loads(character.skills or '{}'),
-                            'qualities': json.loads(character.qualities or '{}')
-                        }
-                        
-                        thread_ts = await self.slack.create_character_sheet_thread(
-                            slack_info['channel_id'], character_data
-                        )
-                        slack_info['wren_thread_ts'] = thread_ts
-                        result['copies_created']['slack'] = thread_ts
-                    except Exception as e:
-                        logger.error(f"Error creating Slack thread: {e}")
-                        result['copies_created']['slack'] = f"Error: {str(e)}"
+                    creations['slack'] = self._create_slack_thread(slack_info['channel_id'], character)
+            
+            outcomes = await asyncio.gather(*creations.values(), return_exceptions=True)
+            for platform, outcome in zip(creations, outcomes):
+                if isinstance(outcome, Exception):
+                    label = 'Google Docs copy' if platform == 'google_docs' else 'Slack thread'
+                    logger.error(f"Error creating {label}: {outcome}")
+                    result['copies_created'][platform] = f"Error: {str(outcome)}"
+                    continue
+                if platform == 'google_docs':
+                    google_info['wren_copy_id'] = outcome
+                else:
+                    slack_info['wren_thread_ts'] = outcome
+                result['copies_created'][platform] = outcome
             
             # Update character with new copy references
-            character.extra_data = json.dumps(extra_data)
-            self.db.session.commit()
+            session_id = character.session_id
+            _store_extra(character, extra_data)
+            self.db.commit()
+            self.invalidate_discovery(session_id)
             
             return result
             
@@ -291,57 +402,41 @@ class CharacterSheetManager:
             logger.error(f"Error creating WREN managed copies: {e}")
             return {'status': 'error', 'error': str(e)}
     
+    async def _create_slack_thread(self, channel_id: str, character) -> str:
+        # Get current character data
+        character_data = {
+            'name': character.name,
+            'handle': character.handle,
+            'archetype': character.archetype,
+            'attributes': _loads(character.attributes),
+            'skills': _loads(character.skills),
+            'qualities': _loads(character.qualities)
+        }
+        return await _paced(self._slack_limiter, self.slack.create_character_sheet_thread(channel_id, character_data))
+    
     async def sync_all_character_sheets(self, session_id: str) -> Dict[str, Any]:
         """Sync all character sheets for a session"""
         try:
-            from app import Character
-            
-            characters = Character.query.filter_by(session_id=session_id).all()
+            characters = self._Character.query.filter_by(session_id=session_id).all()
             results = {
                 'status': 'success',
                 'total_characters': len(characters),
                 'sync_results': {}
             }
             
-            for character in characters:
-                char_result = {
-                    'character_name': character.name,
-                    'google_docs': None,
-                    'slack': None
-                }
-                
-                extra_data = json.loads(character.extra_data or '{}')
-                
-                # Sync from Google Docs
-                if 'google_docs' in extra_data and self.google_available:
-                    try:
-                        google_info = extra_data['google_docs']
-                        if 'document_id' in google_info:
-                            char_data = await self.google_docs.parse_character_sheet(
-                                google_info['document_id']
-                            )
-                            # Apply updates to character
-                            await self.update_character_sheet(character.id, char_data, sync_to_external=False)
-                            char_result['google_docs'] = 'success'
-                    except Exception as e:
-                        char_result['google_docs'] = f'error: {str(e)}'
-                
-                # Sync from Slack
-                if 'slack' in extra_data and self.slack_available:
-                    try:
-                        slack_info = extra_data['slack']
-                        if 'reference' in slack_info:
-                            sync_result = await self.slack_sync.sync_from_slack(
-                                slack_info['channel_id'],
-                                character.user_id,
-                                character.session_id,
-                                slack_info['reference']
-                            )
-                            char_result['slack'] = sync_result['status']
-                    except Exception as e:
-                        char_result['slack'] = f'error: {str(e)}'
-                
+            semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+            # Characters copied from one template share a document; fetch each just once
+            doc_cache: Dict[str, asyncio.Future] = {}
+            per_character = await asyncio.gather(
+                *(self._sync_one(character, semaphore, doc_cache) for character in characters),
+                return_exceptions=True
+            )
+            for character, char_result in zip(characters, per_character):
+                if isinstance(char_result, Exception):
+                    char_result = {'character_name': character.name, 'error': str(char_result)}
                 results['sync_results'][str(character.id)] = char_result
+            self.db.commit()
+            self.invalidate_discovery(session_id)
             
             return results
             
@@ -349,9 +444,57 @@ class CharacterSheetManager:
             logger.error(f"Error syncing all character sheets: {e}")
             return {'status': 'error', 'error': str(e)}
     
-    def get_integration_status(self) -> Dict[str, Any]:
-        """Get status of all integrations"""
-        return {
+    async def _sync_one(self, character, semaphore: asyncio.Semaphore,
+                        doc_cache: Dict[str, asyncio.Future]) -> Dict[str, Any]:
+        """Pull one character's external sheets into the local row"""
+        async with semaphore:
+            char_result = {
+                'character_name': character.name,
+                'google_docs': None,
+                'slack': None
+            }
+            
+            extra_data = _load_extra(character)
+            
+            # Sync from Google Docs
+            if 'google_docs' in extra_data and self.google_available:
+                try:
+                    google_info = extra_data['google_docs']
+                    if 'document_id' in google_info:
+                        document_id = google_info['document_id']
+                        parsed = doc_cache.get(document_id)
+                        if parsed is None:
+                            parsed = asyncio.ensure_future(
+                                _paced(self._google_limiter, self.google_docs.parse_character_sheet(document_id))
+                            )
+                            doc_cache[document_id] = parsed
+                        char_data = await asyncio.shield(parsed)
+                        # Staged on the loaded row; committed once for the whole session
+                        self._apply_updates_local(character, char_data)
+                        char_result['google_docs'] = 'success'
+                except Exception as e:
+                    char_result['google_docs'] = f'error: {str(e)}'
+            
+            # Sync from Slack
+            if 'slack' in extra_data and self.slack_available:
+                try:
+                    slack_info = extra_data['slack']
+                    if 'reference' in slack_info:
+                        sync_result = await _paced(self._slack_limiter, self.slack_sync.sync_from_slack(
+                            slack_info['channel_id'],
+                            character.user_id,
+                            character.session_id,
+                            slack_info['reference']
+                        ))
+                        char_result['slack'] = sync_result['status']
+                except Exception as e:
+                    char_result['slack'] = f'error: {str(e)}'
+            
+            return char_result
+    
+    def _refresh_integration_status(self) -> None:
+        """Rebuild the status snapshot; call again after swapping or re-initializing an integration"""
+        self._integration_status = {
             'google_docs': {
                 'available': self.google_available,
                 'authenticated': self.google_docs is not None,
@@ -364,16 +507,21 @@ class CharacterSheetManager:
             }
         }
     
+    def get_integration_status(self) -> Dict[str, Any]:
+        """Get status of all integrations (shared snapshot; do not mutate)"""
+        return self._integration_status
+    
     async def get_character_integration_info(self, character_id: int) -> Dict[str, Any]:
         """Get integration information for a specific character"""
         try:
-            from app import Character
-            
-            character = Character.query.get(character_id)
+            # Only the name is read here; leave the sheet's JSON blobs unloaded
+            character = self.db.get(
+                self._Character, character_id, options=[load_only(self._Character.name)]
+            )
             if not character:
                 return {'status': 'error', 'error': 'Character not found'}
             
-            extra_data = json.loads(character.extra_data or '{}')
+            extra_data = _load_extra(character)
             
             info = {
                 'character_id': character_id,
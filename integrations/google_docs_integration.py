@@ -4,12 +4,18 @@ Allows WREN to read, parse, and update character sheets stored in Google Docs
 """
 
 import os
-import json
+import asyncio
+import copy
 import logging
+import orjson
+import threading
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
+from cachetools import LRUCache
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -24,14 +30,121 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive.metadata.readonly'
 ]
 
+PARSED_SHEET_CACHE_SIZE = 256
+
+def _dumps(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+# Response field masks: only what the parser and update builder read
+_DOC_TEXT_FIELDS = 'body(content(endIndex,paragraph(elements(textRun(content)))))'
+_DRIVE_LIST_FIELDS = 'nextPageToken,files(id,name,modifiedTime,owners(emailAddress))'
+# Drive's maximum for files.list; fewer pages means fewer round trips
+DRIVE_PAGE_SIZE = 1000
+
+# SR6E standard attributes
+_ATTRIBUTES = ('Body', 'Agility', 'Reaction', 'Strength', 'Willpower', 'Logic', 'Intuition', 'Charisma', 'Edge')
+
+# Single-line sheet fields, matched in one pass and dispatched on the alternative that hit.
+# Each alternative exposes its value as <field>_value.
+_FIELD_PATTERNS = (
+    ('name', r'(?:Name|Character):\s*(?P<name_value>[^\n\r]+)'),
+    ('handle', r'(?:Handle|Street Name):\s*(?P<handle_value>[^\n\r]+)'),
+    ('archetype', r'Archetype:\s*(?P<archetype_value>[^\n\r]+)'),
+    # Word boundary so e.g. "Antibody: 2" is not read as Body
+    ('attribute', rf'\b(?P<attribute_name>{"|".join(map(re.escape, _ATTRIBUTES))})\s*:\s*(?P<attribute_value>\d+)'),
+    ('karma', r'Karma:\s*(?P<karma_value>\d+)'),
+    # Thousands may be grouped with commas, underscores or (non-breaking) spaces
+    ('nuyen', r'(?:Nuyen|\u00a5)\s*:\s*(?P<nuyen_value>\d[\d,_ \u00a0]*)'),
+)
+_DIGIT_SEPARATORS = str.maketrans('', '', ',_ \u00a0')
+_FIELD_RE = re.compile('|'.join(f'(?P<{field}>{pattern})' for field, pattern in _FIELD_PATTERNS), re.IGNORECASE)
+_FIELD_PARSERS = {
+    'name': str.strip,
+    'handle': str.strip,
+    'archetype': str.strip,
+    'karma': int,
+    'nuyen': lambda value: int(value.translate(_DIGIT_SEPARATORS)),
+}
+
+_KNOWN_SKILLS = (
+    'Astral', 'Athletics', 'Biotech', 'Close Combat', 'Con', 'Conjuring', 'Cracking',
+    'Electronics', 'Enchanting', 'Engineering', 'Exotic Weapons', 'Firearms', 'Influence',
+    'Outdoors', 'Perception', 'Piloting', 'Sorcery', 'Stealth', 'Tasking'
+)
+# Matched skill name (lowercased) -> stored key
+_SKILL_KEYS = {skill.lower(): skill.lower().replace(' ', '_') for skill in _KNOWN_SKILLS}
+
+def _trie_pattern(words) -> str:
+    """Alternation factored on shared prefixes (lowercase; compile with IGNORECASE).
+    
+    Each character of the input is tested against one trie level instead of every word,
+    so scan cost stays flat as the word list grows.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if '' in node:
+            return '(?:' + '|'.join(branches) + ')?'
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    
+    return build(trie)
+
+# Literal names and bounded, same-line separators: no nested or open-ended repetition for
+# document text to backtrack through, and a rating is never taken from a later line
+_SKILL_RE = re.compile(
+    r'\b(' + _trie_pattern(_KNOWN_SKILLS) + r')\b[ \t]{0,16}:[ \t]{0,16}(\d{1,3})\b',
+    re.IGNORECASE
+)
+# Qualities run from their label to the next Equipment/Gear heading line (or the end).
+# Two plain searches instead of a lazy DOTALL scan that retries the terminator at every character.
+_QUALITIES_START_RE = re.compile(r'Qualities:', re.IGNORECASE)
+_QUALITIES_END_RE = re.compile(r'^[^\S\n]*(?:Equipment|Gear)\b', re.IGNORECASE | re.MULTILINE)
+# Non-blank lines, captured already stripped
+_NONEMPTY_LINE_RE = re.compile(r'^[^\S\n]*(\S(?:.*\S)?)[^\S\n]*$', re.MULTILINE)
+
+def _iter_text_runs(document: Dict):
+    """Yield the non-empty text runs of a document body; tables, breaks and other structure are skipped"""
+    for element in document.get('body', {}).get('content', ()):
+        paragraph = element.get('paragraph')
+        if not paragraph:
+            continue
+        for element_content in paragraph.get('elements', ()):
+            text_run = element_content.get('textRun')
+            if text_run is None:
+                continue
+            text = text_run.get('content')
+            if text:
+                yield text
+
 class GoogleDocsCharacterSheet:
-    """Manages character sheet integration with Google Docs"""
+    """Manages character sheet integration with Google Docs
+    
+    googleapiclient is synchronous: every request executes in a worker thread via
+    asyncio.to_thread so a slow API round trip never stalls the event loop. httplib2
+    connections are not thread-safe, so each worker thread keeps its own authorized
+    connection and reuses it (and its TLS session) across requests.
+    """
     
     def __init__(self, credentials_file: str = 'credentials.json', token_file: str = 'token.json'):
         self.credentials_file = credentials_file
         self.token_file = token_file
         self.service = None
         self.drive_service = None
+        self._credentials = None
+        self._thread_http = threading.local()
+        # document_id -> (revisionId, parsed sheet); a new revision replaces the entry
+        self._parsed_sheets = LRUCache(maxsize=PARSED_SHEET_CACHE_SIZE)
         self._authenticate()
     
     def _authenticate(self):
@@ -59,26 +172,50 @@ class GoogleDocsCharacterSheet:
             with open(self.token_file, 'w') as token:
                 token.write(creds.to_json())
         
+        self._credentials = creds
         self.service = build('docs', 'v1', credentials=creds)
         self.drive_service = build('drive', 'v3', credentials=creds)
         logger.info("Google Docs API authenticated successfully")
     
+    def _execute(self, request):
+        """Execute a googleapiclient request on this thread's persistent connection"""
+        http = getattr(self._thread_http, 'http', None)
+        if http is None:
+            http = self._thread_http.http = AuthorizedHttp(self._credentials, http=httplib2.Http(timeout=60))
+        return request.execute(http=http)
+    
+    def _fetch_and_parse(self, request):
+        """Download and parse a sheet in one worker-thread hop; regex work on large documents stays off the loop"""
+        document = self._execute(request)
+        # Parse character data using regex patterns
+        return document.get('revisionId'), self._parse_shadowrun_data(self._extract_text_content(document))
+    
     async def parse_character_sheet(self, document_id: str) -> Dict[str, Any]:
         """Parse a character sheet from a Google Doc"""
         try:
-            # Get document content
-            document = self.service.documents().get(documentId=document_id).execute()
-            content = self._extract_text_content(document)
-            
-            # Parse character data using regex patterns
-            character_data = self._parse_shadowrun_data(content)
+            # The revision id is tiny to fetch; an unchanged document skips the download and parse
+            head = await asyncio.to_thread(
+                self._execute, self.service.documents().get(documentId=document_id, fields='revisionId')
+            )
+            revision = head.get('revisionId')
+            cached = self._parsed_sheets.get(document_id)
+            parsed = cached[1] if cached and revision and cached[0] == revision else None
             
-            # Add metadata
-            character_data['source'] = 'google_docs'
-            character_data['document_id'] = document_id
-            character_data['last_updated'] = datetime.utcnow().isoformat()
+            if parsed is None:
+                # Get document content, with the revision it actually reflects
+                revision, parsed = await asyncio.to_thread(
+                    self._fetch_and_parse,
+                    self.service.documents().get(documentId=document_id, fields=f'revisionId,{_DOC_TEXT_FIELDS}')
+                )
+                parsed['source'] = 'google_docs'
+                parsed['document_id'] = document_id
+                if revision:
+                    self._parsed_sheets[document_id] = (revision, parsed)
+                logger.info(f"Successfully parsed character sheet from document {document_id}")
             
-            logger.info(f"Successfully parsed character sheet from document {document_id}")
+            # Callers modify the result; keep the cached copy pristine
+            character_data = copy.deepcopy(parsed)
+            character_data['last_updated'] = _now_iso()
             return character_data
             
         except HttpError as e:
@@ -90,17 +227,7 @@ class GoogleDocsCharacterSheet:
     
     def _extract_text_content(self, document: Dict) -> str:
         """Extract plain text from Google Docs document structure"""
-        content = ""
-        body = document.get('body', {})
-        
-        for element in body.get('content', []):
-            if 'paragraph' in element:
-                paragraph = element['paragraph']
-                for element_content in paragraph.get('elements', []):
-                    if 'textRun' in element_content:
-                        content += element_content['textRun'].get('content', '')
-        
-        return content
+        return ''.join(_iter_text_runs(document))
     
     def _parse_shadowrun_data(self, content: str) -> Dict[str, Any]:
         """Parse Shadowrun 6E character data from document text"""
@@ -119,67 +246,32 @@ class GoogleDocsCharacterSheet:
             'nuyen': 0
         }
         
-        # Extract character name
-        name_match = re.search(r'(?:Name|Character):\s*([^\n\r]+)', content, re.IGNORECASE)
-        if name_match:
-            character_data['name'] = name_match.group(1).strip()
-        
-        # Extract handle/street name
-        handle_match = re.search(r'(?:Handle|Street Name):\s*([^\n\r]+)', content, re.IGNORECASE)
-        if handle_match:
-            character_data['handle'] = handle_match.group(1).strip()
-        
-        # Extract archetype
-        archetype_match = re.search(r'Archetype:\s*([^\n\r]+)', content, re.IGNORECASE)
-        if archetype_match:
-            character_data['archetype'] = archetype_match.group(1).strip()
-        
-        # Extract attributes (SR6E standard attributes)
-        attributes = ['Body', 'Agility', 'Reaction', 'Strength', 'Willpower', 'Logic', 'Intuition', 'Charisma', 'Edge']
-        for attr in attributes:
-            pattern = f'{attr}:\s*(\d+)'
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                character_data['attributes'][attr.lower()] = int(match.group(1))
-        
-        # Extract skills (look for skill: rating patterns)
-        skill_pattern = r'([A-Za-z\s]+?):\s*(\d+)(?:\s*\([^)]+\))?'
-        skill_matches = re.findall(skill_pattern, content)
-        
-        # Filter out attributes and focus on skills
-        known_skills = [
-            'Astral', 'Athletics', 'Biotech', 'Close Combat', 'Con', 'Conjuring', 'Cracking',
-            'Electronics', 'Enchanting', 'Engineering', 'Exotic Weapons', 'Firearms', 'Influence',
-            'Outdoors', 'Perception', 'Piloting', 'Sorcery', 'Stealth', 'Tasking'
-        ]
+        # Name, handle, archetype, attributes, karma and nuyen in one scan; the first occurrence of each wins
+        seen = set()
+        attributes = character_data['attributes']
+        for match in _FIELD_RE.finditer(content):
+            field = match.lastgroup
+            if field == 'attribute':
+                attr = match.group('attribute_name').lower()
+                if attr not in attributes:
+                    attributes[attr] = int(match.group('attribute_value'))
+            elif field not in seen:
+                seen.add(field)
+                character_data[field] = _FIELD_PARSERS[field](match.group(f'{field}_value'))
+        character_data['edge'] = attributes.get('edge', 0)
         
-        for skill_name, rating in skill_matches:
-            skill_name = skill_name.strip()
-            if any(known_skill.lower() in skill_name.lower() for known_skill in known_skills):
-                character_data['skills'][skill_name.lower().replace(' ', '_')] = int(rating)
-        
-        # Extract Edge
-        edge_match = re.search(r'Edge:\s*(\d+)', content, re.IGNORECASE)
-        if edge_match:
-            character_data['edge'] = int(edge_match.group(1))
-        
-        # Extract Karma
-        karma_match = re.search(r'Karma:\s*(\d+)', content, re.IGNORECASE)
-        if karma_match:
-            character_data['karma'] = int(karma_match.group(1))
-        
-        # Extract Nuyen
-        nuyen_match = re.search(r'(?:Nuyen|¥):\s*([0-9,]+)', content, re.IGNORECASE)
-        if nuyen_match:
-            character_data['nuyen'] = int(nuyen_match.group(1).replace(',', ''))
+        # Extract skills (known skill names followed by a rating)
+        for skill_name, rating in _SKILL_RE.findall(content):
+            character_data['skills'][_SKILL_KEYS[skill_name.lower()]] = int(rating)
         
         # Extract qualities
-        qualities_section = re.search(r'Qualities:(.*?)(?:Equipment|Gear|$)', content, re.IGNORECASE | re.DOTALL)
-        if qualities_section:
-            qualities_text = qualities_section.group(1)
+        qualities_start = _QUALITIES_START_RE.search(content)
+        if qualities_start:
+            start = qualities_start.end()
+            qualities_end = _QUALITIES_END_RE.search(content, start)
+            qualities_text = content[start:qualities_end.start() if qualities_end else len(content)]
             # Simple extraction - could be enhanced with more sophisticated parsing
-            quality_lines = [line.strip() for line in qualities_text.split('\n') if line.strip()]
-            character_data['qualities']['positive'] = quality_lines
+            character_data['qualities']['positive'] = _NONEMPTY_LINE_RE.findall(qualities_text)
         
         return character_data
     
@@ -187,17 +279,19 @@ class GoogleDocsCharacterSheet:
         """Update a character sheet in Google Docs with new data"""
         try:
             # Get current document
-            document = self.service.documents().get(documentId=document_id).execute()
+            document = await asyncio.to_thread(
+                self._execute, self.service.documents().get(documentId=document_id, fields=_DOC_TEXT_FIELDS)
+            )
             
             # Create update requests
             requests = self._build_update_requests(document, character_data)
             
             if requests:
                 # Execute batch update
-                result = self.service.documents().batchUpdate(
+                result = await asyncio.to_thread(self._execute, self.service.documents().batchUpdate(
                     documentId=document_id,
                     body={'requests': requests}
-                ).execute()
+                ))
                 
                 logger.info(f"Successfully updated character sheet {document_id}")
                 return True
@@ -214,36 +308,30 @@ class GoogleDocsCharacterSheet:
     
     def _build_update_requests(self, document: Dict, character_data: Dict[str, Any]) -> List[Dict]:
         """Build Google Docs API update requests based on character data changes"""
-        requests = []
-        content = self._extract_text_content(document)
+        # Docs indexes count structure (tables, lists, breaks) as well as text, so take the
+        # position from the body itself; insertions go before the document's final newline
+        body_content = document.get('body', {}).get('content')
+        end_index = body_content[-1].get('endIndex', 2) - 1 if body_content else 1
         
-        # Add timestamp update
-        timestamp = f"\n\nLast updated by WREN: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+        # Timestamp, plus edge tracking if changed, appended as one insertion
+        text = f"\n\nLast updated by WREN: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}"
+        if 'current_edge' in character_data:
+            text += f"\nCurrent Edge: {character_data['current_edge']}/{character_data.get('edge', 0)}"
         
-        requests.append({
+        return [{
             'insertText': {
-                'location': {'index': len(content)},
-                'text': timestamp
+                'location': {'index': end_index},
+                'text': text
             }
-        })
-        
-        # Add edge tracking update if changed
-        if 'current_edge' in character_data:
-            edge_text = f"\nCurrent Edge: {character_data['current_edge']}/{character_data.get('edge', 0)}"
-            requests.append({
-                'insertText': {
-                    'location': {'index': len(content) + len(timestamp)},
-                    'text': edge_text
-                }
-            })
-        
-        return requests
+        }]
     
     async def create_character_sheet_copy(self, document_id: str, session_id: str) -> str:
         """Create a copy of character sheet for WREN to manage"""
         try:
             # Get original document metadata
-            original = self.drive_service.files().get(fileId=document_id).execute()
+            original = await asyncio.to_thread(
+                self._execute, self.drive_service.files().get(fileId=document_id, fields='name,parents')
+            )
             
             # Create copy
             copy_metadata = {
@@ -251,10 +339,11 @@ class GoogleDocsCharacterSheet:
                 'parents': [original.get('parents', [None])[0]] if original.get('parents') else None
             }
             
-            copied_file = self.drive_service.files().copy(
+            copied_file = await asyncio.to_thread(self._execute, self.drive_service.files().copy(
                 fileId=document_id,
-                body=copy_metadata
-            ).execute()
+                body=copy_metadata,
+                fields='id'
+            ))
             
             logger.info(f"Created character sheet copy: {copied_file['id']}")
             return copied_file['id']
@@ -266,25 +355,37 @@ class GoogleDocsCharacterSheet:
     async def list_accessible_documents(self, user_email: str = None) -> List[Dict[str, str]]:
         """List character sheets accessible to WREN"""
         try:
-            query = "name contains 'character' or name contains 'shadowrun'"
+            # The mimeType clause narrows to Docs before the name match; the parentheses keep the
+            # writer filter applying to both name terms
+            query = (
+                "mimeType = 'application/vnd.google-apps.document' and "
+                "(name contains 'character' or name contains 'shadowrun')"
+            )
             if user_email:
-                query += f" and '{user_email}' in writers"
-            
-            results = self.drive_service.files().list(
-                q=query,
-                fields="files(id, name, modifiedTime, owners)"
-            ).execute()
+                escaped = user_email.replace('\\', '\\\\').replace("'", "\\'")
+                query += f" and '{escaped}' in writers"
             
             documents = []
-            for file in results.get('files', []):
-                documents.append({
-                    'id': file['id'],
-                    'name': file['name'],
-                    'modified': file['modifiedTime'],
-                    'owner': file.get('owners', [{}])[0].get('emailAddress', 'Unknown')
-                })
-            
-            return documents
+            page_token = None
+            while True:
+                results = await asyncio.to_thread(self._execute, self.drive_service.files().list(
+                    q=query,
+                    fields=_DRIVE_LIST_FIELDS,
+                    pageSize=DRIVE_PAGE_SIZE,
+                    pageToken=page_token
+                ))
+                
+                for file in results.get('files', []):
+                    documents.append({
+                        'id': file['id'],
+                        'name': file['name'],
+                        'modified': file['modifiedTime'],
+                        'owner': file.get('owners', [{}])[0].get('emailAddress', 'Unknown')
+                    })
+                
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    return documents
             
         except HttpError as e:
             logger.error(f"Error listing documents: {e}")
@@ -299,57 +400,63 @@ class CharacterSheetSync:
     
     async def sync_character_sheet(self, document_id: str, session_id: str, user_id: str) -> Dict[str, Any]:
         """Sync character sheet from Google Docs to local database"""
+        # Import the Character model here to avoid circular imports
+        from app import Character, db
+        from .character_sheet_manager import _load_extra, _store_extra
+        
         try:
-            # Parse character data from Google Docs
-            character_data = await self.google_docs.parse_character_sheet(document_id)
-            
-            # Import the Character model here to avoid circular imports
-            from app import Character, db
+            # Parse character data from Google Docs; the download runs off-loop while we look up the row
+            parsing = asyncio.ensure_future(self.google_docs.parse_character_sheet(document_id))
             
             # Check if character already exists
-            existing_character = Character.query.filter_by(
-                session_id=session_id,
-                user_id=user_id
-            ).first()
+            try:
+                existing_character = Character.query.filter_by(
+                    session_id=session_id,
+                    user_id=user_id
+                ).first()
+            except BaseException:
+                parsing.cancel()
+                raise
+            character_data = await parsing
+            now_iso = _now_iso()
+            
+            # Sheet columns encoded once; the same payload serves the update and insert paths
+            payload = {
+                'name': character_data.get('name', ''),
+                'handle': character_data.get('handle', ''),
+                'archetype': character_data.get('archetype', ''),
+                'attributes': _dumps(character_data.get('attributes', {})),
+                'skills': _dumps(character_data.get('skills', {})),
+                'qualities': _dumps(character_data.get('qualities', {})),
+            }
             
             if existing_character:
-                # Update existing character
-                for field in ['name', 'handle', 'archetype', 'attributes', 'skills', 'qualities']:
-                    if field in character_data:
-                        if field in ['attributes', 'skills', 'qualities']:
-                            setattr(existing_character, field, json.dumps(character_data[field]))
-                        else:
-                            setattr(existing_character, field, character_data[field])
+                # Update existing character; the flush issues a single UPDATE
+                for field, value in payload.items():
+                    setattr(existing_character, field, value)
                 
                 # Add integration metadata
-                extra_data = json.loads(existing_character.extra_data or '{}')
+                extra_data = _load_extra(existing_character)
                 extra_data['google_docs'] = {
                     'document_id': document_id,
-                    'last_sync': datetime.utcnow().isoformat()
+                    'last_sync': now_iso
                 }
-                existing_character.extra_data = json.dumps(extra_data)
+                _store_extra(existing_character, extra_data)
                 
                 character = existing_character
             else:
                 # Create new character
-                character = Character(
-                    session_id=session_id,
-                    user_id=user_id,
-                    name=character_data.get('name', ''),
-                    handle=character_data.get('handle', ''),
-                    archetype=character_data.get('archetype', ''),
-                    attributes=json.dumps(character_data.get('attributes', {})),
-                    skills=json.dumps(character_data.get('skills', {})),
-                    qualities=json.dumps(character_data.get('qualities', {})),
-                    extra_data=json.dumps({
-                        'google_docs': {
-                            'document_id': document_id,
-                            'last_sync': datetime.utcnow().isoformat()
-                        }
-                    })
-                )
+                character = Character(session_id=session_id, user_id=user_id, **payload)
+                # extra_data is not a mapped column, so it cannot go through the constructor
+                _store_extra(character, {
+                    'google_docs': {
+                        'document_id': document_id,
+                        'last_sync': now_iso
+                    }
+                })
                 db.session.add(character)
             
+            # The Flask-SQLAlchemy session is synchronous; this commit does block the loop briefly
             db.session.commit()
             
             logger.info(f"Successfully synced character sheet for user {user_id}")
@@ -357,7 +464,7 @@ class CharacterSheetSync:
                 'status': 'success',
                 'character_id': character.id,
                 'character_name': character.name,
-                'sync_time': datetime.utcnow().isoformat()
+                'sync_time': now_iso
             }
             
         except Exception as e:
@@ -372,12 +479,14 @@ class CharacterSheetSync:
         """Push character updates back to Google Docs"""
         try:
             from app import Character
+            from .character_sheet_manager import _load_extra, _store_extra
             
             character = Character.query.get(character_id)
             if not character:
                 return False
             
-            extra_data = json.loads(character.extra_data or '{}')
+            # Memoized on the instance, so repeated pushes skip the parse
+            extra_data = _load_extra(character)
             google_docs_info = extra_data.get('google_docs')
             
             if not google_docs_info or 'document_id' not in google_docs_info:
@@ -392,10 +501,10 @@ class CharacterSheetSync:
             
             if success:
                 # Update sync timestamp
-                google_docs_info['last_update_push'] = datetime.utcnow().isoformat()
+                google_docs_info['last_update_push'] = _now_iso()
                 extra_data['google_docs'] = google_docs_info
-                character.extra_data = json.dumps(extra_data)
-                self.db.session.commit()
+                _store_extra(character, extra_data)
+                self.db.commit()
             
             return success
             
@@ -4,18 +4,125 @@ Allows WREN to access, parse, and manage character sheets shared in Slack
 """
 
 import os
-import json
 import logging
 import asyncio
+import copy
+import time
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
 import re
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-import requests
+import httpx
+import orjson
+from cachetools import LRUCache
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PARSED_SHEET_CACHE_SIZE = 256
+
+def _dumps(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+# Timestamps carry whole seconds, so a burst of syncs shares one formatted string
+_last_iso = (0, '')
+
+def _now_iso() -> str:
+    global _last_iso
+    second = int(time.time())
+    if _last_iso[0] != second:
+        _last_iso = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+    return _last_iso[1]
+
+# One pooled client per event loop so sheet downloads reuse the files.slack.com connection
+_HTTP: Optional[httpx.AsyncClient] = None
+_HTTP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared download client, creating it on first use"""
+    global _HTTP, _HTTP_LOOP
+    loop = asyncio.get_running_loop()
+    if _HTTP is None or _HTTP.is_closed or _HTTP_LOOP is not loop:
+        _HTTP = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=60)
+        )
+        _HTTP_LOOP = loop
+    return _HTTP
+
+async def close_slack_client() -> None:
+    """Close the shared download client"""
+    global _HTTP
+    if _HTTP is not None and _HTTP_LOOP is asyncio.get_running_loop():
+        await _HTTP.aclose()
+        _HTTP = None
+
+_ATTRIBUTES = ('Body', 'Agility', 'Reaction', 'Strength', 'Willpower', 'Logic', 'Intuition', 'Charisma', 'Edge')
+
+_KNOWN_SKILLS = (
+    'Astral', 'Athletics', 'Biotech', 'Close Combat', 'Con', 'Conjuring', 'Cracking',
+    'Electronics', 'Enchanting', 'Engineering', 'Exotic Weapons', 'Firearms', 'Influence',
+    'Outdoors', 'Perception', 'Piloting', 'Sorcery', 'Stealth', 'Tasking'
+)
+
+# Sheet signatures, each a named zero-width alternative so one scan sees every
+# signal even where a greedy one (Handle, Archetype) would swallow the next line
+_SHEET_SIGNATURES = (
+    r'(?:Body|Agility|Reaction|Strength|Willpower|Logic|Intuition|Charisma|Edge):\s*\d+',
+    r'(?:Firearms|Close Combat|Athletics|Stealth|Electronics):\s*\d+',
+    r'Handle:\s*[\w\s"]+',
+    r'Archetype:\s*[\w\s]+',
+    r'Essence:\s*[\d.]+',
+    r'Initiative:\s*\d+',
+    r'Physical Monitor|Stun Monitor',
+    r'Karma:\s*\d+',
+    r'Nuyen|¥',
+)
+_SHEET_SIGNATURE_RE = re.compile('|'.join(f'(?=(?P<s{i}>{p}))' for i, p in enumerate(_SHEET_SIGNATURES)), re.IGNORECASE)
+
+_NAME_PATTERNS = (
+    re.compile(r'(?:Name|Character):\s*([^\n\r]+)', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'Character Name:\s*([^\n\r]+)', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'^([A-Za-z\s]+)(?:\s*-\s*Shadowrun)', re.IGNORECASE | re.MULTILINE),
+)
+_HANDLE_PATTERNS = (
+    re.compile(r'(?:Handle|Street Name|Runner Name):\s*["\']?([^"\'\n\r]+)["\']?', re.IGNORECASE),
+    re.compile(r'aka\s*["\']([^"\'\n\r]+)["\']', re.IGNORECASE),
+)
+# Single-value fields scanned together; zero-width alternatives so a field
+# running to the end of its line cannot hide another on the same line
+_FIELD_PATTERNS = (
+    ('archetype', r'Archetype:\s*(?P<archetype_value>[^\n\r]+)'),
+    ('essence', r'Essence:\s*(?P<essence_value>[\d.]+)'),
+    ('karma', r'Karma:\s*(?P<karma_value>\d+)'),
+    ('nuyen', r'(?:Nuyen|¥):\s*(?P<nuyen_value>[0-9,]+)'),
+    ('initiative', r'Initiative:\s*(?P<initiative_value>\d+)'),
+)
+_FIELD_RE = re.compile(
+    '|'.join(f'(?=(?P<{field}>{pattern}))' for field, pattern in _FIELD_PATTERNS), re.IGNORECASE
+)
+_FIELD_PARSERS = {
+    'archetype': str.strip,
+    'essence': float,
+    'karma': int,
+    'nuyen': lambda value: int(value.replace(',', '')),
+    'initiative': int,
+}
+# Every attribute as "Body: 5", "Body = 5" or "Body 5" in one scan
+_ATTRIBUTE_RE = re.compile(
+    r'\b(?P<name>' + '|'.join(_ATTRIBUTES) + r')\b(?:\s*[:=]\s*|\s+)(?P<value>\d+)', re.IGNORECASE
+)
+# Only known skills, as "Firearms: 6", "Firearms = 6" or "Firearms 6"; longest
+# names first so "Conjuring" is not read as "Con"
+_SKILL_KEYS = {skill.lower(): skill.lower().replace(' ', '_') for skill in _KNOWN_SKILLS}
+_SKILL_RE = re.compile(
+    r'\b(' + '|'.join(map(re.escape, sorted(_KNOWN_SKILLS, key=len, reverse=True))) + r')\b'
+    r'(?:[ \t]*[:=][ \t]*|[ \t]+)(\d{1,3})\b',
+    re.IGNORECASE
+)
+
 class SlackCharacterSheet:
     """Manages character sheet integration with Slack"""
     
@@ -24,8 +131,12 @@ class SlackCharacterSheet:
         if not self.slack_token:
             raise ValueError("Slack token not provided and SLACK_BOT_TOKEN environment variable not set")
         
+        # WebClient is blocking: every call goes through asyncio.to_thread so a
+        # Slack round-trip never stalls the event loop
         self.client = WebClient(token=self.slack_token)
         self.user_client = WebClient(token=os.getenv('SLACK_USER_TOKEN'))  # For file access
+        # Parses keyed by file id or (channel, ts), stored with the revision they reflect
+        self._parsed_sheets = LRUCache(maxsize=PARSED_SHEET_CACHE_SIZE)
         
     async def find_character_sheets(self, channel_id: str, user_id: str = None) -> List[Dict[str, Any]]:
         """Find character sheets shared in a Slack channel"""
@@ -41,43 +152,45 @@ class SlackCharacterSheet:
             
             sheets = []
             
-            for query in query_terms:
-                try:
-                    # Search for messages
-                    response = await self._search_messages(channel_id, query, user_id)
-                    
-                    for message in response.get('messages', []):
-                        # Check for file attachments
-                        if 'files' in message:
-                            for file in message['files']:
-                                if self._is_character_sheet_file(file):
-                                    sheets.append({
-                                        'type': 'file',
-                                        'file_id': file['id'],
-                                        'file_name': file['name'],
-                                        'file_type': file['filetype'],
-                                        'user_id': message['user'],
-                                        'timestamp': message['ts'],
-                                        'channel_id': channel_id,
-                                        'url': file.get('url_private', ''),
-                                        'size': file.get('size', 0)
-                                    })
-                        
-                        # Check for text-based character sheets
-                        text = message.get('text', '')
-                        if self._is_character_sheet_text(text):
-                            sheets.append({
-                                'type': 'message',
-                                'message_ts': message['ts'],
-                                'user_id': message['user'],
-                                'channel_id': channel_id,
-                                'text': text,
-                                'timestamp': message['ts']
-                            })
-                            
-                except SlackApiError as e:
-                    logger.warning(f"Slack search error for query '{query}': {e}")
+            # Run every search at once; a failed query only drops its own results
+            responses = await asyncio.gather(
+                *(self._search_messages(channel_id, query, user_id) for query in query_terms),
+                return_exceptions=True
+            )
+            
+            for query, response in zip(query_terms, responses):
+                if isinstance(response, Exception):
+                    logger.warning(f"Slack search error for query '{query}': {response}")
                     continue
+                
+                for message in response.get('messages', []):
+                    # Check for file attachments
+                    if 'files' in message:
+                        for file in message['files']:
+                            if self._is_character_sheet_file(file):
+                                sheets.append({
+                                    'type': 'file',
+                                    'file_id': file['id'],
+                                    'file_name': file['name'],
+                                    'file_type': file['filetype'],
+                                    'user_id': message['user'],
+                                    'timestamp': message['ts'],
+                                    'channel_id': channel_id,
+                                    'url': file.get('url_private', ''),
+                                    'size': file.get('size', 0)
+                                })
+                    
+                    # Check for text-based character sheets
+                    text = message.get('text', '')
+                    if self._is_character_sheet_text(text):
+                        sheets.append({
+                            'type': 'message',
+                            'message_ts': message['ts'],
+                            'user_id': message['user'],
+                            'channel_id': channel_id,
+                            'text': text,
+                            'timestamp': message['ts']
+                        })
             
             # Remove duplicates and sort by timestamp
             unique_sheets = {sheet['file_id'] if sheet['type'] == 'file' else sheet['message_ts']: sheet for sheet in sheets}
@@ -97,7 +210,8 @@ class SlackCharacterSheet:
             if user_id:
                 search_query += f" from:{user_id}"
             
-            response = self.client.search_messages(
+            response = await asyncio.to_thread(
+                self.client.search_messages,
                 query=search_query,
                 count=50,
                 sort='timestamp',
@@ -131,43 +245,59 @@ class SlackCharacterSheet:
     
     def _is_character_sheet_text(self, text: str) -> bool:
         """Check if message text contains character sheet data"""
-        # Look for common Shadowrun character sheet patterns
-        patterns = [
-            r'(?:Body|Agility|Reaction|Strength|Willpower|Logic|Intuition|Charisma|Edge):\s*\d+',
-            r'(?:Firearms|Close Combat|Athletics|Stealth|Electronics):\s*\d+',
-            r'Handle:\s*[\w\s"]+',
-            r'Archetype:\s*[\w\s]+',
-            r'Essence:\s*[\d.]+',
-            r'Initiative:\s*\d+',
-            r'Physical Monitor|Stun Monitor',
-            r'Karma:\s*\d+',
-            r'Nuyen|¥'
-        ]
+        # All but two signals (monitors, nuyen) need a colon, so without one
+        # chat messages can never reach three
+        if ':' not in text:
+            return False
         
-        # Need at least 3 patterns to consider it a character sheet
-        matches = sum(1 for pattern in patterns if re.search(pattern, text, re.IGNORECASE))
-        return matches >= 3
+        # Need at least 3 distinct signals to consider it a character sheet
+        signals = set()
+        for match in _SHEET_SIGNATURE_RE.finditer(text):
+            signals.add(match.lastgroup)
+            if len(signals) >= 3:
+                return True
+        return False
     
-    async def download_character_sheet_file(self, file_id: str) -> Tuple[bytes, str]:
+    async def download_character_sheet_file(self, file_id: str, file_data: Dict = None) -> Tuple[bytes, str]:
         """Download a character sheet file from Slack"""
         try:
             # Get file info
-            file_info = self.client.files_info(file=file_id)
-            file_data = file_info['file']
+            if file_data is None:
+                file_info = await asyncio.to_thread(self.client.files_info, file=file_id)
+                file_data = file_info['file']
             
             # Download file content
             download_url = file_data['url_private']
             headers = {'Authorization': f'Bearer {self.slack_token}'}
             
-            response = requests.get(download_url, headers=headers)
-            response.raise_for_status()
+            content = bytearray()
+            async with _get_client().stream('GET', download_url, headers=headers, follow_redirects=True) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    content.extend(chunk)
             
-            return response.content, file_data['filetype']
+            return bytes(content), file_data['filetype']
             
         except Exception as e:
             logger.error(f"Error downloading file {file_id}: {e}")
             raise
     
+    async def parse_character_sheet_file(self, file_id: str) -> Dict[str, Any]:
+        """Download and parse a shared sheet file, reusing the parse while the file is unchanged"""
+        file_info = await asyncio.to_thread(self.client.files_info, file=file_id)
+        file_data = file_info['file']
+        revision = file_data.get('updated') or file_data.get('timestamp')
+        cached = self._parsed_sheets.get(file_id)
+        if cached and revision and cached[0] == revision:
+            parsed = cached[1]
+        else:
+            file_content, file_type = await self.download_character_sheet_file(file_id, file_data)
+            parsed = await self.parse_character_sheet_from_file(file_content, file_type)
+            if revision:
+                self._parsed_sheets[file_id] = (revision, parsed)
+        # Callers modify the result; keep the cached copy pristine
+        return copy.deepcopy(parsed)
+    
     async def parse_character_sheet_from_file(self, file_content: bytes, file_type: str) -> Dict[str, Any]:
         """Parse character data from downloaded file"""
         try:
@@ -210,7 +340,8 @@ class SlackCharacterSheet:
         """Parse character data from a Slack message"""
         try:
             # Get message content
-            response = self.client.conversations_history(
+            response = await asyncio.to_thread(
+                self.client.conversations_history,
                 channel=channel_id,
                 latest=message_ts,
                 inclusive=True,
@@ -221,17 +352,24 @@ class SlackCharacterSheet:
                 raise ValueError("Message not found")
             
             message = response['messages'][0]
-            text = message.get('text', '')
             
-            # Parse character data
-            character_data = self._parse_shadowrun_data(text)
+            # An edit bumps edited.ts; until then the earlier parse still holds
+            key = (channel_id, message_ts)
+            revision = message.get('edited', {}).get('ts', message_ts)
+            cached = self._parsed_sheets.get(key)
+            if cached and cached[0] == revision:
+                parsed = cached[1]
+            else:
+                parsed = self._parse_shadowrun_data(message.get('text', ''))
+                self._parsed_sheets[key] = (revision, parsed)
+            character_data = copy.deepcopy(parsed)
             
             # Add Slack metadata
             character_data['source'] = 'slack_message'
             character_data['channel_id'] = channel_id
             character_data['message_ts'] = message_ts
             character_data['user_id'] = message.get('user')
-            character_data['last_updated'] = datetime.utcnow().isoformat()
+            character_data['last_updated'] = _now_iso()
             
             return character_data
             
@@ -259,87 +397,36 @@ class SlackCharacterSheet:
         }
         
         # Extract character name (multiple possible formats)
-        name_patterns = [
-            r'(?:Name|Character):\s*([^\n\r]+)',
-            r'Character Name:\s*([^\n\r]+)',
-            r'^([A-Za-z\s]+)(?:\s*-\s*Shadowrun)',
-        ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
+        for pattern in _NAME_PATTERNS:
+            match = pattern.search(content)
             if match:
                 character_data['name'] = match.group(1).strip()
                 break
         
         # Extract handle/street name
-        handle_patterns = [
-            r'(?:Handle|Street Name|Runner Name):\s*["\']?([^"\'\n\r]+)["\']?',
-            r'aka\s*["\']([^"\'\n\r]+)["\']'
-        ]
-        
-        for pattern in handle_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
+        for pattern in _HANDLE_PATTERNS:
+            match = pattern.search(content)
             if match:
                 character_data['handle'] = match.group(1).strip()
                 break
         
-        # Extract archetype
-        archetype_match = re.search(r'Archetype:\s*([^\n\r]+)', content, re.IGNORECASE)
-        if archetype_match:
-            character_data['archetype'] = archetype_match.group(1).strip()
-        
         # Extract attributes
-        attributes = ['Body', 'Agility', 'Reaction', 'Strength', 'Willpower', 'Logic', 'Intuition', 'Charisma', 'Edge']
-        for attr in attributes:
-            patterns = [
-                f'{attr}:\s*(\d+)',
-                f'{attr}\s*=\s*(\d+)',
-                f'{attr}\s+(\d+)'
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    character_data['attributes'][attr.lower()] = int(match.group(1))
-                    break
+        attributes = character_data['attributes']
+        for match in _ATTRIBUTE_RE.finditer(content):
+            # The first rating listed for an attribute wins
+            attributes.setdefault(match.group('name').lower(), int(match.group('value')))
         
         # Extract skills
-        skill_patterns = [
-            r'([A-Za-z\s]+?):\s*(\d+)(?:\s*\([^)]+\))?',
-            r'([A-Za-z\s]+?)\s*=\s*(\d+)',
-            r'([A-Za-z\s]+?)\s+(\d+)(?:\s*\([^)]+\))?'
-        ]
-        
-        known_skills = [
-            'Astral', 'Athletics', 'Biotech', 'Close Combat', 'Con', 'Conjuring', 'Cracking',
-            'Electronics', 'Enchanting', 'Engineering', 'Exotic Weapons', 'Firearms', 'Influence',
-            'Outdoors', 'Perception', 'Piloting', 'Sorcery', 'Stealth', 'Tasking'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for skill_name, rating in matches:
-                skill_name = skill_name.strip()
-                if any(known_skill.lower() in skill_name.lower() for known_skill in known_skills):
-                    if skill_name.lower() not in [attr.lower() for attr in attributes]:  # Exclude attributes
-                        character_data['skills'][skill_name.lower().replace(' ', '_')] = int(rating)
-        
-        # Extract other values
-        essence_match = re.search(r'Essence:\s*([\d.]+)', content, re.IGNORECASE)
-        if essence_match:
-            character_data['essence'] = float(essence_match.group(1))
-        
-        karma_match = re.search(r'Karma:\s*(\d+)', content, re.IGNORECASE)
-        if karma_match:
-            character_data['karma'] = int(karma_match.group(1))
+        for skill_name, rating in _SKILL_RE.findall(content):
+            character_data['skills'][_SKILL_KEYS[skill_name.lower()]] = int(rating)
         
-        nuyen_match = re.search(r'(?:Nuyen|¥):\s*([0-9,]+)', content, re.IGNORECASE)
-        if nuyen_match:
-            character_data['nuyen'] = int(nuyen_match.group(1).replace(',', ''))
-        
-        initiative_match = re.search(r'Initiative:\s*(\d+)', content, re.IGNORECASE)
-        if initiative_match:
-            character_data['initiative'] = int(initiative_match.group(1))
+        # Extract archetype and other values in one scan; the first occurrence wins
+        seen = set()
+        for match in _FIELD_RE.finditer(content):
+            field = match.lastgroup
+            if field not in seen:
+                seen.add(field)
+                character_data[field] = _FIELD_PARSERS[field](match.group(f'{field}_value'))
         
         return character_data
     
@@ -350,10 +437,12 @@ class SlackCharacterSheet:
             updated_text = self._format_character_sheet(character_data)
             
             # Add WREN update notice
-            updated_text += f"\n\n_Updated by WREN at {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}_"
+            now_iso = _now_iso()
+            updated_text += f"\n\n_Updated by WREN at {now_iso[:10]} {now_iso[11:19]} UTC_"
             
             # Update the message
-            response = self.client.chat_update(
+            response = await asyncio.to_thread(
+                self.client.chat_update,
                 channel=channel_id,
                 ts=message_ts,
                 text=updated_text
@@ -405,7 +494,8 @@ class SlackCharacterSheet:
             formatted_sheet = self._format_character_sheet(character_data)
             formatted_sheet += "\n\n_This character sheet is managed by WREN_"
             
-            response = self.client.chat_postMessage(
+            response = await asyncio.to_thread(
+                self.client.chat_postMessage,
                 channel=channel_id,
                 text=formatted_sheet,
                 thread_ts=None  # This will create a new thread
@@ -427,97 +517,117 @@ class SlackCharacterSheetSync:
     async def sync_from_slack(self, channel_id: str, user_id: str, session_id: str, 
                              sheet_reference: Dict[str, Any]) -> Dict[str, Any]:
         """Sync character sheet from Slack to local database"""
+        results = await self.sync_many_from_slack(channel_id, session_id, [(user_id, sheet_reference)])
+        return results[0]
+    
+    async def _parse_reference(self, channel_id: str, sheet_reference: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse character data based on type"""
+        if sheet_reference['type'] == 'file':
+            return await self.slack.parse_character_sheet_file(sheet_reference['file_id'])
+        return await self.slack.parse_character_sheet_from_message(channel_id, sheet_reference['message_ts'])
+    
+    async def sync_many_from_slack(self, channel_id: str, session_id: str,
+                                   sheets: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Sync (user_id, sheet_reference) pairs from Slack with one lookup and one commit.
+        
+        Returns one result per pair, in order; a sheet that fails to download or
+        parse gets an error result without holding back the rest.
+        """
+        # Import the Character model here to avoid circular imports
+        from app import Character, db
+        from .character_sheet_manager import _load_extra, _store_extra
+        
+        # Downloads and parses overlap; the shared client pools the connections
+        parsed = await asyncio.gather(
+            *(self._parse_reference(channel_id, reference) for _, reference in sheets),
+            return_exceptions=True
+        )
+        results: List[Optional[Dict[str, Any]]] = [None] * len(sheets)
+        
         try:
-            # Parse character data based on type
-            if sheet_reference['type'] == 'file':
-                file_content, file_type = await self.slack.download_character_sheet_file(
-                    sheet_reference['file_id']
-                )
-                character_data = await self.slack.parse_character_sheet_from_file(
-                    file_content, file_type
-                )
-            else:  # message
-                character_data = await self.slack.parse_character_sheet_from_message(
-                    channel_id, sheet_reference['message_ts']
+            # Existing characters for every user in one query
+            user_ids = {user_id for user_id, _ in sheets}
+            characters = {
+                character.user_id: character
+                for character in Character.query.filter(
+                    Character.session_id == session_id,
+                    Character.user_id.in_(user_ids)
                 )
+            }
+            now_iso = _now_iso()
+            new_characters = []
             
-            # Import the Character model
-            from app import Character, db
-            
-            # Check if character already exists
-            existing_character = Character.query.filter_by(
-                session_id=session_id,
-                user_id=user_id
-            ).first()
-            
-            if existing_character:
-                # Update existing character
-                for field in ['name', 'handle', 'archetype', 'attributes', 'skills', 'qualities']:
-                    if field in character_data:
-                        if field in ['attributes', 'skills', 'qualities']:
-                            setattr(existing_character, field, json.dumps(character_data[field]))
-                        else:
-                            setattr(existing_character, field, character_data[field])
+            for index, ((user_id, sheet_reference), character_data) in enumerate(zip(sheets, parsed)):
+                if isinstance(character_data, Exception):
+                    logger.error(f"Error syncing character sheet from Slack for user {user_id}: {character_data}")
+                    results[index] = {'status': 'error', 'error': str(character_data)}
+                    continue
                 
-                # Add Slack metadata
-                extra_data = json.loads(existing_character.extra_data or '{}')
-                extra_data['slack'] = {
+                # Sheet columns encoded once; the same payload serves the update and insert paths
+                payload = {
+                    'name': character_data.get('name', ''),
+                    'handle': character_data.get('handle', ''),
+                    'archetype': character_data.get('archetype', ''),
+                    'attributes': _dumps(character_data.get('attributes', {})),
+                    'skills': _dumps(character_data.get('skills', {})),
+                    'qualities': _dumps(character_data.get('qualities', {})),
+                }
+                slack_info = {
                     'channel_id': channel_id,
                     'reference': sheet_reference,
-                    'last_sync': datetime.utcnow().isoformat()
+                    'last_sync': now_iso
                 }
-                existing_character.extra_data = json.dumps(extra_data)
                 
-                character = existing_character
-            else:
-                # Create new character
-                character = Character(
-                    session_id=session_id,
-                    user_id=user_id,
-                    name=character_data.get('name', ''),
-                    handle=character_data.get('handle', ''),
-                    archetype=character_data.get('archetype', ''),
-                    attributes=json.dumps(character_data.get('attributes', {})),
-                    skills=json.dumps(character_data.get('skills', {})),
-                    qualities=json.dumps(character_data.get('qualities', {})),
-                    extra_data=json.dumps({
-                        'slack': {
-                            'channel_id': channel_id,
-                            'reference': sheet_reference,
-                            'last_sync': datetime.utcnow().isoformat()
-                        }
-                    })
-                )
-                db.session.add(character)
-            
+                character = characters.get(user_id)
+                if character:
+                    # Update existing character
+                    for field, value in payload.items():
+                        setattr(character, field, value)
+                    
+                    # Add Slack metadata; memoized on the instance, so only the write serializes
+                    extra_data = _load_extra(character)
+                    extra_data['slack'] = slack_info
+                    _store_extra(character, extra_data)
+                else:
+                    # Create new character
+                    character = Character(session_id=session_id, user_id=user_id, **payload)
+                    # extra_data is not a constructor argument: it is not a mapped column here
+                    _store_extra(character, {'slack': slack_info})
+                    characters[user_id] = character
+                    new_characters.append(character)
+                results[index] = character
+            
+            db.session.add_all(new_characters)
             db.session.commit()
             
-            logger.info(f"Successfully synced character sheet from Slack for user {user_id}")
-            return {
-                'status': 'success',
-                'character_id': character.id,
-                'character_name': character.name,
-                'sync_time': datetime.utcnow().isoformat()
-            }
-            
         except Exception as e:
-            logger.error(f"Error syncing character sheet from Slack: {e}")
+            logger.error(f"Error syncing character sheets from Slack: {e}")
             db.session.rollback()
-            return {
-                'status': 'error',
-                'error': str(e)
+            return [result if isinstance(result, dict) else {'status': 'error', 'error': str(e)} for result in results]
+        
+        for index, result in enumerate(results):
+            if isinstance(result, dict):
+                continue
+            logger.info(f"Successfully synced character sheet from Slack for user {result.user_id}")
+            results[index] = {
+                'status': 'success',
+                'character_id': result.id,
+                'character_name': result.name,
+                'sync_time': now_iso
             }
+        return results
     
     async def push_updates_to_slack(self, character_id: int, updates: Dict[str, Any]) -> bool:
         """Push character updates back to Slack"""
         try:
             from app import Character
+            from .character_sheet_manager import _load_extra, _store_extra
             
             character = Character.query.get(character_id)
             if not character:
                 return False
             
-            extra_data = json.loads(character.extra_data or '{}')
+            extra_data = _load_extra(character)
             slack_info = extra_data.get('slack')
             
             if not slack_info:
@@ -540,10 +650,10 @@ class SlackCharacterSheetSync:
             
             if success:
                 # Update sync timestamp
-                slack_info['last_update_push'] = datetime.utcnow().isoformat()
+                slack_info['last_update_push'] = _now_iso()
                 extra_data['slack'] = slack_info
-                character.extra_data = json.dumps(extra_data)
-                self.db.session.commit()
+                _store_extra(character, extra_data)
+                self.db.commit()
             
             return success
             
@@ -1,5 +1,7 @@
 import os
+import asyncio
 import httpx
+from typing import Optional
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
@@ -14,7 +16,47 @@ ANTHROPIC_CHAT_URL = "https://api.anthropic.com/v1/messages"
 MISTRAL_CHAT_URL = "https://api.mistral.ai/v1/chat/completions"
 OPENROUTER_CHAT_URL = "https://openrouter.ai/api/v1/chat/completions"
 
-import json
+import orjson
+
+# One pooled HTTP/2 client per event loop so LLM calls skip the per-request TLS handshake
+_HTTP: Optional[httpx.AsyncClient] = None
+_HTTP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared LLM client, creating it on first use"""
+    global _HTTP, _HTTP_LOOP
+    loop = asyncio.get_running_loop()
+    if _HTTP is None or _HTTP.is_closed or _HTTP_LOOP is not loop:
+        _HTTP = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=32, keepalive_expiry=60)
+        )
+        _HTTP_LOOP = loop
+    return _HTTP
+
+async def close_llm_client() -> None:
+    """Close the shared LLM client"""
+    global _HTTP
+    if _HTTP is not None and _HTTP_LOOP is asyncio.get_running_loop():
+        await _HTTP.aclose()
+        _HTTP = None
+
+async def _sse_data(resp):
+    """Yield the payload of each SSE data line as bytes, without decoding lines to str"""
+    # Raw network chunks, not a fixed chunk size: each token is forwarded as soon as it arrives
+    buffer = bytearray()
+    async for chunk in resp.aiter_bytes():
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) >= 0:
+            if buffer.startswith(b"data:", start):
+                # Optional space after the colon; tolerate CRLF line endings
+                data = bytes(buffer[start + 5:end]).strip()
+                if data:
+                    yield data
+            start = end + 1
+        del buffer[:start]
 
 async def call_openai_stream(messages):
     headers = {
@@ -26,21 +68,17 @@ async def call_openai_stream(messages):
         "messages": messages,
         "stream": True
     }
-    async with httpx.AsyncClient() as client:
-        async with client.stream("POST", OPENAI_CHAT_URL, headers=headers, json=payload, timeout=60) as resp:
-            resp.raise_for_status()
-            async for line in resp.aiter_lines():
-                if line.startswith("data: "):
-                    data = line[len("data: "):]
-                    if data.strip() == "[DONE]":
-                        break
-                    try:
-                        chunk = json.loads(data)
-                        content = chunk["choices"][0]["delta"].get("content", "")
-                        if content:
-                            yield content
-                    except Exception:
-                        continue
+    async with _get_client().stream("POST", OPENAI_CHAT_URL, headers=headers, json=payload, timeout=60) as resp:
+        resp.raise_for_status()
+        async for data in _sse_data(resp):
+            if data == b"[DONE]":
+                break
+            try:
+                content = orjson.loads(data)["choices"][0]["delta"].get("content", "")
+                if content:
+                    yield content
+            except Exception:
+                continue
 
 async def call_openai(messages, stream=False):
     if stream:
@@ -54,10 +92,9 @@ async def call_openai(messages, stream=False):
         "messages": messages,
         "stream": False
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(OPENAI_CHAT_URL, headers=headers, json=payload, timeout=60)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _get_client().post(OPENAI_CHAT_URL, headers=headers, json=payload, timeout=60)
+    resp.raise_for_status()
+    return resp.json()
 
 async def call_deepseek(messages, stream=False):
     headers = {
@@ -69,10 +106,9 @@ async def call_deepseek(messages, stream=False):
         "messages": messages,
         "stream": stream
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(DEEPSEEK_CHAT_URL, headers=headers, json=payload, timeout=60)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _get_client().post(DEEPSEEK_CHAT_URL, headers=headers, json=payload, timeout=60)
+    resp.raise_for_status()
+    return resp.json()
 
 # Anthropic Claude
 async def call_anthropic(messages, stream=False):
@@ -90,10 +126,9 @@ async def call_anthropic(messages, stream=False):
         ],
         "stream": stream
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(ANTHROPIC_CHAT_URL, headers=headers, json=payload, timeout=60)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _get_client().post(ANTHROPIC_CHAT_URL, headers=headers, json=payload, timeout=60)
+    resp.raise_for_status()
+    return resp.json()
 
 # Mistral
 async def call_mistral(messages, stream=False):
@@ -106,10 +141,9 @@ async def call_mistral(messages, stream=False):
         "messages": messages,
         "stream": stream
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(MISTRAL_CHAT_URL, headers=headers, json=payload, timeout=60)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _get_client().post(MISTRAL_CHAT_URL, headers=headers, json=payload, timeout=60)
+    resp.raise_for_status()
+    return resp.json()
 
 # OpenRouter
 async def call_openrouter(messages, model_name="openai/gpt-4o", stream=False):
@@ -122,10 +156,9 @@ async def call_openrouter(messages, model_name="openai/gpt-4o", stream=False):
         "messages": messages,
         "stream": stream
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(OPENROUTER_CHAT_URL, headers=headers, json=payload, timeout=60)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await _get_client().post(OPENROUTER_CHAT_URL, headers=headers, json=payload, timeout=60)
+    resp.raise_for_status()
+    return resp.json()
 
 # Utility to select model
 async def call_llm(model, messages, stream=False, model_name=None):
@@ -152,7 +185,7 @@ async def create_pending_response(session_id, user_id, context, response_type='n
     Create a pending AI response that requires DM review.
     Returns the pending response ID for tracking.
     """
-    from app import db, PendingResponse, DmNotification, Session
+    from app import db, PendingResponse, DmNotification, get_session_info, queue_insert
     import uuid
     
     # Generate AI response
@@ -178,22 +211,21 @@ async def create_pending_response(session_id, user_id, context, response_type='n
             priority=priority
         )
         
+        db.session.add(pending)
+        await asyncio.to_thread(db.session.commit)
+        
         # Get the GM for this session
-        session = Session.query.filter_by(id=session_id).first()
+        session = await asyncio.to_thread(get_session_info, session_id)
         if session:
-            # Create notification for the DM
-            notification = DmNotification(
+            # Notify the DM; nothing waits on this row, so it is written behind
+            queue_insert(
+                DmNotification,
                 session_id=session_id,
                 dm_user_id=session.gm_user_id,
                 pending_response_id=pending_id,
                 notification_type='new_review' if priority <= 2 else 'urgent_review',
                 message=f"New {response_type} response needs review from player {user_id}"
             )
-            
-            db.session.add(notification)
-        
-        db.session.add(pending)
-        db.session.commit()
         
         return {
             'status': 'pending_review',
@@ -205,16 +237,10 @@ async def create_pending_response(session_id, user_id, context, response_type='n
         print(f"Error creating pending response: {str(e)}")
         raise e
 
-async def get_reviewed_response(pending_response_id):
+def format_review_status(pending):
     """
-    Get a reviewed response by ID. Returns None if still pending.
+    Build the client-facing status payload for a PendingResponse row.
     """
-    from app import PendingResponse
-    
-    pending = PendingResponse.query.filter_by(id=pending_response_id).first()
-    if not pending:
-        return None
-    
     if pending.status in ['approved', 'edited']:
         return {
             'status': pending.status,
@@ -234,6 +260,18 @@ async def get_reviewed_response(pending_response_id):
             'message': 'Still awaiting DM review'
         }
 
+async def get_reviewed_response(pending_response_id):
+    """
+    Get a reviewed response by ID. Returns None if still pending.
+    """
+    from app import db, PendingResponse
+    
+    pending = db.session.get(PendingResponse, pending_response_id)
+    if not pending:
+        return None
+    
+    return format_review_status(pending)
+
 async def call_llm_with_review(session_id, user_id, context, model='openai', response_type='narrative', priority=1, require_review=True):
     """
     Enhanced LLM call that can either require DM review or provide immediate response.
@@ -107,11 +107,16 @@ def init_request_logging(app):
             else:
                 log_func = logger.info
             
-            # Log response
+            # Log response (streamed bodies are not measured; reading them
+            # here would buffer the whole stream before the client sees it)
+            if response.is_streamed:
+                response_size = response.content_length
+            else:
+                response_size = response.content_length or len(response.data or b'')
             log_func("REQUEST_COMPLETED",
                     status_code=response.status_code,
                     duration_ms=round(duration_ms, 2),
-                    response_size=response.content_length or len(response.data or b''),
+                    response_size=response_size,
                     content_type=response.content_type)
             
             # Add performance warning for slow requests
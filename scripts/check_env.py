@@ -54,7 +54,8 @@ OPTIONAL_VARS = {
     'MAIL_PASSWORD': 'Email password',
     'AWS_ACCESS_KEY_ID': 'AWS access key for S3',
     'AWS_SECRET_ACCESS_KEY': 'AWS secret key',
-    'S3_BUCKET': 'S3 bucket for file storage'
+    'S3_BUCKET': 'S3 bucket for file storage',
+    'S3_PUBLIC_URL': 'Public base URL (e.g. CDN) for objects in S3_BUCKET'
 }
 
 def check_environment() -> Tuple[List[str], List[str], Dict[str, str]]:
@@ -264,7 +264,7 @@ class DebugCLI:
             data['chat_memory'].append({
                 'user_id': memory.user_id,
                 'role': memory.role,
-                'messages': memory.messages
+                'messages': [{'role': m.role, 'content': m.content} for m in memory.chat_messages]
             })
         
         # Export images
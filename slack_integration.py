@@ -1,5 +1,4 @@
 import os
-import json
 import hmac
 import hashlib
 import time
@@ -8,7 +7,11 @@ from datetime import datetime
 import asyncio
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-from slack_sdk.signature import SignatureVerifier
+
+# Slack retries are rejected once the signed timestamp is this old (seconds)
+SLACK_REQUEST_MAX_AGE = 300
+# Tolerated clock skew for timestamps in the future (seconds)
+SLACK_REQUEST_MAX_SKEW = 60
 
 class SlackBot:
     """Slack bot integration for Shadowrun system"""
@@ -18,7 +21,7 @@ class SlackBot:
         self.signing_secret = None
         self.bot_token = None
         self.app_token = None
-        self.signature_verifier = None
+        self.signing_key = None
         self._setup_credentials()
     
     def _setup_credentials(self):
@@ -31,45 +34,35 @@ class SlackBot:
             self.client = WebClient(token=self.bot_token)
         
         if self.signing_secret:
-            self.signature_verifier = SignatureVerifier(self.signing_secret)
+            self.signing_key = self.signing_secret.encode()
     
     def is_configured(self) -> bool:
         """Check if Slack integration is properly configured"""
         return self.bot_token is not None and self.signing_secret is not None
     
-    def verify_slack_request(self, headers: Dict, body: str) -> bool:
+    def verify_slack_request(self, headers: Dict, body: bytes) -> bool:
         """Verify that the request came from Slack with enhanced security"""
-        if not self.signature_verifier:
+        if not self.signing_key:
             return False
         
+        timestamp = headers.get("X-Slack-Request-Timestamp", "")
+        signature = headers.get("X-Slack-Signature", "")
+        
+        # Reject stale or future-dated requests (replay protection)
         try:
-            from utils.validators import SlackRequestSchema
-            from pydantic import ValidationError
-            
-            timestamp = headers.get("X-Slack-Request-Timestamp", "")
-            signature = headers.get("X-Slack-Signature", "")
-            
-            # Validate request with enhanced security checks
-            try:
-                # Validate timestamp format and freshness
-                SlackRequestSchema(
-                    timestamp=timestamp,
-                    signature=signature,
-                    body=json.loads(body) if isinstance(body, str) else body
-                )
-            except ValidationError as e:
-                print(f"Slack request validation failed: {e}")
-                return False
-            
-            # Verify signature
-            return self.signature_verifier.is_valid(
-                timestamp=timestamp,
-                signature=signature,
-                body=body
-            )
-        except Exception as e:
-            print(f"Slack verification error: {e}")
+            age = time.time() - int(timestamp)
+        except ValueError:
+            return False
+        if age > SLACK_REQUEST_MAX_AGE or age < -SLACK_REQUEST_MAX_SKEW:
             return False
+        
+        # HMAC over the raw body bytes, compared in constant time
+        if isinstance(body, str):
+            body = body.encode()
+        expected = 'v0=' + hmac.new(
+            self.signing_key, b'v0:' + timestamp.encode() + b':' + body, hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(expected.encode(), signature.encode())
     
     async def send_message(self, channel: str, text: str, blocks: List[Dict] = None, 
                           thread_ts: str = None, ephemeral_user: str = None) -> Dict:
@@ -77,10 +70,12 @@ class SlackBot:
         if not self.client:
             raise Exception("Slack client not configured")
         
+        # WebClient is synchronous; keep its HTTP round trip off the shared event loop
         try:
             if ephemeral_user:
                 # Send ephemeral message (only visible to specific user)
-                response = self.client.chat_postEphemeral(
+                response = await asyncio.to_thread(
+                    self.client.chat_postEphemeral,
                     channel=channel,
                     user=ephemeral_user,
                     text=text,
@@ -89,7 +84,8 @@ class SlackBot:
                 )
             else:
                 # Send public message
-                response = self.client.chat_postMessage(
+                response = await asyncio.to_thread(
+                    self.client.chat_postMessage,
                     channel=channel,
                     text=text,
                     blocks=blocks,
@@ -284,15 +280,14 @@ class SlackCommandProcessor:
             # Call backend to create session  
             try:
                 # Import here to avoid circular imports
-                import asyncio
                 from app import create_session_for_slack
                 
-                session_data = asyncio.run(create_session_for_slack(
+                session_data = await create_session_for_slack(
                     name=session_name,
                     gm_user_id=context['user_id'],
                     slack_channel_id=context['channel_id'],
                     slack_team_id=context['team_id']
-                ))
+                )
                 
                 response_text = f"Session '{session_name}' created successfully!\n" \
                               f"Session ID: {session_data['session_id']}\n" \
@@ -313,7 +308,7 @@ class SlackCommandProcessor:
             # Get session info
             try:
                 from app import get_slack_session_info
-                session_info = asyncio.run(get_slack_session_info(slack_session_id))
+                session_info = await get_slack_session_info(slack_session_id)
                 
                 if session_info:
                     response_text = f"Active Session: {session_info['name']}\n" \
@@ -399,17 +394,14 @@ class SlackCommandProcessor:
             )
         }
         
-        # Process AI request asynchronously  
-        try:
-            from app import process_slack_ai_request
-            asyncio.run(process_slack_ai_request(
-                session_id=context['slack_session_id'],
-                user_id=context['user_id'],
-                message=message,
-                channel_id=context['channel_id']
-            ))
-        except Exception as e:
-            print(f"Error processing AI request: {e}")
+        # Process AI request in the background; Slack wants the reply within 3 seconds
+        from app import process_slack_ai_request, run_in_background
+        run_in_background(process_slack_ai_request(
+            session_id=context['slack_session_id'],
+            user_id=context['user_id'],
+            message=message,
+            channel_id=context['channel_id']
+        ))
         
         return immediate_response
     
@@ -436,17 +428,14 @@ class SlackCommandProcessor:
             )
         }
         
-        # Process image generation asynchronously
-        try:
-            from app import process_slack_image_request
-            asyncio.run(process_slack_image_request(
-                session_id=context['slack_session_id'],
-                user_id=context['user_id'],
-                description=description,
-                channel_id=context['channel_id']
-            ))
-        except Exception as e:
-            print(f"Error processing image request: {e}")
+        # Process image generation in the background
+        from app import process_slack_image_request, run_in_background
+        run_in_background(process_slack_image_request(
+            session_id=context['slack_session_id'],
+            user_id=context['user_id'],
+            description=description,
+            channel_id=context['channel_id']
+        ))
         
         return immediate_response
     
@@ -0,0 +1,27 @@
+"""
+Shared test fixtures
+"""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app import app, db
+
+
+@pytest.fixture
+def count_queries():
+    """Record SQL statements issued inside a `with count_queries() as statements:` block"""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+    return counter
@@ -336,7 +336,7 @@ class TestOpenAIIntegration:
                 {"choices": [{"delta": {"content": "test."}}]}
             ]
             for chunk in chunks:
-                yield json.dumps(chunk)
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
         return mock_stream
     
     def test_api_key_loading(self):
@@ -372,7 +372,7 @@ class TestOpenAIIntegration:
         
         # Setup mock
         mock_response = AsyncMock()
-        mock_response.aiter_lines = mock_openai_stream
+        mock_response.aiter_bytes = mock_openai_stream
         mock_response.raise_for_status = MagicMock()
         mock_stream.return_value.__aenter__.return_value = mock_response
         
@@ -431,4 +431,49 @@ class TestOpenAIIntegration:
         with pytest.raises(Exception) as exc_info:
             await call_openai(messages)
         
-        assert "Rate limit exceeded" in str(exc_info.value) 
\ No newline at end of file
+        assert "Rate limit exceeded" in str(exc_info.value) 
+
+class TestLlmClient:
+    """Test the pooled LLM HTTP client and stream parsing"""
+
+    @pytest.mark.asyncio
+    async def test_client_shared_across_calls(self):
+        from llm_utils import _get_client, close_llm_client, call_deepseek, call_mistral
+        import httpx
+        request = httpx.Request('POST', 'https://api.deepseek.com')
+        clients = []
+
+        async def post(client, *args, **kwargs):
+            clients.append(client)
+            return httpx.Response(200, json={'choices': []}, request=request)
+        with patch('httpx.AsyncClient.post', new=post):
+            await call_deepseek([{'role': 'user', 'content': 'Hoi'}])
+            await call_mistral([{'role': 'user', 'content': 'Hoi'}])
+        assert clients == [_get_client(), _get_client()]
+
+        client = _get_client()
+        await close_llm_client()
+        assert client.is_closed
+        assert _get_client() is not client
+        await close_llm_client()
+
+    @pytest.mark.asyncio
+    async def test_stream_frames_split_across_chunks(self):
+        from llm_utils import call_openai_stream
+        body = b''.join(
+            b'data: ' + json.dumps({'choices': [{'delta': {'content': token}}]}, ensure_ascii=False).encode() + b'\r\n\r\n'
+            for token in ('Neon ', 'rain ', '\u00a5')
+        ) + b': keep-alive\n\ndata: {"choices": [{"delta": {}}]}\n\ndata: [DONE]\n\ndata: {"choices": []}\n\n'
+        # Deliberately awkward chunk boundaries, mid-frame and mid-character
+        chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+        response = MagicMock()
+        response.aiter_bytes = lambda: _aiter(chunks)
+        with patch('httpx.AsyncClient.stream') as stream:
+            stream.return_value.__aenter__.return_value = response
+            tokens = [token async for token in call_openai_stream([{'role': 'user', 'content': 'Hoi'}])]
+        assert tokens == ['Neon ', 'rain ', '\u00a5']
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
@@ -0,0 +1,161 @@
+"""
+Test character sheet CRUD endpoints
+"""
+import gzip
+import uuid
+import pytest
+from sqlalchemy import inspect, text, update
+from app import app, db, Session, Character, CHARACTER_SHEET_FIELDS, upgrade_schema
+
+
+class TestCharacterUpdate:
+    """Test the bulk UPDATE path of the character sheet endpoint"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def character(self, client):
+        session_id = f'char-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            char = Character(session_id=session_id, user_id='player-1', name='Original', handle='Ghost')
+            db.session.add(char)
+            db.session.commit()
+            return session_id, char.id
+
+    def test_update_writes_allowed_fields(self, client, character):
+        session_id, char_id = character
+        response = client.put(f'/api/session/{session_id}/character/{char_id}', json={
+            'name': 'Renamed',
+            'skills': '{"firearms": 5}',
+            'session_id': 'hijacked',  # Not an editable field
+        })
+        assert response.status_code == 200
+
+        with app.app_context():
+            char = db.session.get(Character, char_id)
+            assert char.name == 'Renamed'
+            assert char.skills == '{"firearms": 5}'
+            assert char.handle == 'Ghost'
+            assert char.session_id == session_id
+
+    def test_update_unknown_character(self, client, character):
+        session_id, char_id = character
+        response = client.put(f'/api/session/{session_id}/character/{char_id + 1000}', json={'name': 'X'})
+        assert response.status_code == 404
+
+        response = client.put(f'/api/session/other-session/character/{char_id}', json={'name': 'X'})
+        assert response.status_code == 404
+
+    def test_update_without_fields(self, client, character):
+        session_id, char_id = character
+        response = client.put(f'/api/session/{session_id}/character/{char_id}', json={'unknown': 1})
+        assert response.status_code == 200
+
+        response = client.put(f'/api/session/{session_id}/character/{char_id + 1000}', json={})
+        assert response.status_code == 404
+
+
+class TestCharacterRead:
+    """Test the character list and detail projections"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    def test_list_and_detail_share_projection(self, client):
+        session_id = f'char-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            char = Character(session_id=session_id, user_id='player-1', name='Kestrel', archetype='Decker')
+            db.session.add(char)
+            db.session.commit()
+            char_id = char.id
+
+        listing = client.get(f'/api/session/{session_id}/characters').get_json()
+        detail = client.get(f'/api/session/{session_id}/character/{char_id}').get_json()
+
+        assert listing == [detail]
+        assert detail['id'] == char_id
+        assert detail['name'] == 'Kestrel'
+        assert detail['archetype'] == 'Decker'
+        assert detail['handle'] is None
+        assert detail['created_at'] is not None
+        assert set(detail) == {'id', 'user_id', 'created_at', *CHARACTER_SHEET_FIELDS}
+
+    def test_cached_json_refreshed_after_edits(self, client):
+        session_id = f'char-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            char = Character(session_id=session_id, user_id='player-1', name='Kestrel')
+            db.session.add(char)
+            db.session.commit()
+            char_id = char.id
+        url = f'/api/session/{session_id}/character/{char_id}'
+
+        with app.app_context():
+            # Filled when the row is written, not on first read
+            assert db.session.get(Character, char_id).serialized_json is not None
+        assert client.get(url).get_json()['name'] == 'Kestrel'
+
+        # Bulk UPDATE path
+        client.put(url, json={'name': 'Magpie'})
+        assert client.get(url).get_json()['name'] == 'Magpie'
+
+        # ORM attribute edits
+        with app.app_context():
+            db.session.get(Character, char_id).handle = 'Nightjar'
+            db.session.commit()
+        assert client.get(url).get_json()['handle'] == 'Nightjar'
+        assert client.get(f'/api/session/{session_id}/characters').get_json()[0]['handle'] == 'Nightjar'
+
+    def test_reads_never_write(self, client, count_queries):
+        session_id = f'char-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            char = Character(session_id=session_id, user_id='player-1', name='Kestrel')
+            db.session.add(char)
+            db.session.commit()
+            char_id = char.id
+            # A Core write that clears the cache, as older rows also have it
+            db.session.execute(update(Character).where(Character.id == char_id).values(handle='Ghost', serialized_json=None))
+            db.session.commit()
+
+        url = f'/api/session/{session_id}/character/{char_id}'
+        with count_queries() as statements:
+            assert client.get(url).get_json()['handle'] == 'Ghost'
+            assert client.get(f'/api/session/{session_id}/characters').get_json()[0]['handle'] == 'Ghost'
+        assert all(s.split()[0] == 'SELECT' for s in statements)
+
+    def test_schema_upgrade_adds_cache_column(self, client):
+        with app.app_context():
+            db.session.execute(text('ALTER TABLE character DROP COLUMN serialized_json'))
+            db.session.commit()
+            upgrade_schema()
+            upgrade_schema()  # Idempotent
+            assert 'serialized_json' in {c['name'] for c in inspect(db.engine).get_columns('character')}
+
+    def test_large_listing_compressed(self, client):
+        session_id = f'char-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            db.session.add_all([
+                Character(session_id=session_id, user_id=f'player-{i}', name=f'Runner {i}', background_seed='Ex-corp. ' * 20)
+                for i in range(10)
+            ])
+            db.session.commit()
+
+        url = f'/api/session/{session_id}/characters'
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data) == client.get(url).data
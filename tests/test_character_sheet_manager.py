@@ -0,0 +1,335 @@
+"""
+Test the unified character sheet manager
+"""
+import asyncio
+import time
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app import app, db, Session, Character, SlackSession
+from integrations.character_sheet_manager import CharacterSheetManager, _RateLimiter, _load_extra, _store_extra
+
+
+class TestDiscovery:
+    """Test character sheet discovery across platforms"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def session_id(self, client):
+        session_id = f'sheet-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            db.session.add(SlackSession(slack_team_id='T1', slack_channel_id=f'C-{session_id}', session_id=session_id))
+            db.session.add_all([
+                Character(session_id=session_id, user_id='player-1', name='Kestrel', handle='Ghost'),
+                Character(session_id=session_id, user_id='player-2', name='Magpie'),
+            ])
+            db.session.commit()
+        return session_id
+
+    @pytest.fixture
+    def manager(self, client):
+        manager = CharacterSheetManager(db.session)
+        manager.google_docs, manager.google_available = MagicMock(), True
+        manager.slack, manager.slack_available = MagicMock(), True
+        return manager
+
+    @staticmethod
+    def slow(result, delay=0.1):
+        async def call(*args, **kwargs):
+            await asyncio.sleep(delay)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return AsyncMock(side_effect=call)
+
+    def test_sources_discovered_concurrently(self, session_id, manager):
+        manager.google_docs.list_accessible_documents = self.slow([
+            {'id': 'doc-1', 'name': 'Kestrel', 'modified': '2024-05-01', 'owner': 'p1@example.com'}
+        ])
+        manager.slack.find_character_sheets = self.slow([{'id': 'F1', 'name': 'sheet.pdf'}])
+
+        started = time.perf_counter()
+        sheets = asyncio.run(manager.discover_character_sheets(session_id, 'player-1'))
+        assert time.perf_counter() - started < 0.18
+
+        assert sheets['google_docs'][0]['id'] == 'doc-1'
+        assert sheets['google_docs'][0]['source'] == 'Google Docs'
+        assert sheets['slack'] == [{'id': 'F1', 'name': 'sheet.pdf', 'type': 'slack', 'source': 'Slack'}]
+        assert [c['name'] for c in sheets['local']] == ['Kestrel']
+        manager.slack.find_character_sheets.assert_awaited_once_with(f'C-{session_id}', 'player-1')
+
+    def test_failing_source_isolated(self, session_id, manager):
+        manager.google_docs.list_accessible_documents = self.slow(RuntimeError('quota'))
+        manager.slack.find_character_sheets = self.slow([])
+
+        sheets = asyncio.run(manager.discover_character_sheets(session_id))
+        assert sheets['google_docs'] == []
+        assert sheets['slack'] == []
+        assert sorted(c['name'] for c in sheets['local']) == ['Kestrel', 'Magpie']
+
+    def test_single_discovery_query(self, session_id, manager, count_queries):
+        manager.google_docs.list_accessible_documents = self.slow([], delay=0)
+        manager.slack.find_character_sheets = self.slow([], delay=0)
+
+        with count_queries() as statements:
+            sheets = asyncio.run(manager.discover_character_sheets(session_id))
+        assert len(statements) == 1
+        assert [c['handle'] for c in sheets['local']] == ['Ghost', None]
+        manager.slack.find_character_sheets.assert_awaited_once_with(f'C-{session_id}', None)
+
+    def test_unknown_session(self, client, manager):
+        manager.google_docs.list_accessible_documents = self.slow([{'id': 'doc-1'}], delay=0)
+        manager.slack.find_character_sheets = self.slow([], delay=0)
+
+        sheets = asyncio.run(manager.discover_character_sheets('no-such-session'))
+        assert sheets == {'google_docs': [], 'slack': [], 'local': []}
+        manager.google_docs.list_accessible_documents.assert_not_awaited()
+
+    def test_discovery_cached_until_invalidated(self, session_id, manager):
+        manager.google_docs.list_accessible_documents = self.slow([], delay=0)
+        manager.slack.find_character_sheets = self.slow([], delay=0)
+
+        first = asyncio.run(manager.discover_character_sheets(session_id, 'player-1'))
+        assert asyncio.run(manager.discover_character_sheets(session_id, 'player-1')) is first
+        assert manager.slack.find_character_sheets.await_count == 1
+
+        manager.invalidate_discovery(session_id)
+        asyncio.run(manager.discover_character_sheets(session_id, 'player-1'))
+        assert manager.slack.find_character_sheets.await_count == 2
+
+    def test_partial_results_not_cached(self, session_id, manager):
+        manager.google_docs.list_accessible_documents = self.slow(RuntimeError('quota'), delay=0)
+        manager.slack.find_character_sheets = self.slow([], delay=0)
+
+        asyncio.run(manager.discover_character_sheets(session_id))
+        asyncio.run(manager.discover_character_sheets(session_id))
+        assert manager.google_docs.list_accessible_documents.await_count == 2
+
+
+class TestSyncAll:
+    """Test pulling every character's external sheet"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    def test_characters_synced_concurrently(self, client, count_queries):
+        session_id = f'sync-test-{uuid.uuid4()}'
+        db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+        characters = [Character(session_id=session_id, user_id=f'player-{i}', name=f'Runner {i}') for i in range(4)]
+        db.session.add_all(characters)
+        db.session.commit()
+        for i, character in enumerate(characters):
+            # Integration references are not a mapped column in this schema
+            character.extra_data = f'{{"google_docs": {{"document_id": "doc-{i}"}}}}'
+
+        manager = CharacterSheetManager(db.session)
+        manager.google_docs, manager.google_available = MagicMock(), True
+        manager.slack_available = False
+
+        async def parse(document_id):
+            await asyncio.sleep(0.1)
+            return {'handle': f'handle-{document_id}'}
+        manager.google_docs.parse_character_sheet = AsyncMock(side_effect=parse)
+
+        started = time.perf_counter()
+        with count_queries() as statements:
+            result = asyncio.run(manager.sync_all_character_sheets(session_id))
+        assert time.perf_counter() - started < 0.3
+        # One SELECT for the roster, then all rows flushed as one executemany UPDATE
+        assert [s.split()[0] for s in statements] == ['SELECT', 'UPDATE']
+
+        assert result['total_characters'] == 4
+        assert {r['google_docs'] for r in result['sync_results'].values()} == {'success'}
+        db.session.expire_all()
+        assert sorted(c.handle for c in Character.query.filter_by(session_id=session_id)) == [
+            f'handle-doc-{i}' for i in range(4)
+        ]
+
+    def test_shared_document_fetched_once(self, client):
+        session_id = f'sync-test-{uuid.uuid4()}'
+        db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+        characters = [Character(session_id=session_id, user_id=f'player-{i}', name=f'Runner {i}') for i in range(3)]
+        db.session.add_all(characters)
+        db.session.commit()
+        for character in characters:
+            character.extra_data = '{"google_docs": {"document_id": "template"}}'
+
+        manager = CharacterSheetManager(db.session)
+        manager.google_docs, manager.google_available = MagicMock(), True
+        manager.slack_available = False
+        manager.google_docs.parse_character_sheet = TestDiscovery.slow({'archetype': 'Decker'}, delay=0.05)
+
+        result = asyncio.run(manager.sync_all_character_sheets(session_id))
+        assert {r['google_docs'] for r in result['sync_results'].values()} == {'success'}
+        manager.google_docs.parse_character_sheet.assert_awaited_once_with('template')
+        assert {c.archetype for c in characters} == {'Decker'}
+
+
+class TestExternalWrites:
+    """Test pushes and WREN copies fanned out to both platforms"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def character(self, client):
+        session_id = f'push-test-{uuid.uuid4()}'
+        db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+        character = Character(session_id=session_id, user_id='player-1', name='Kestrel')
+        db.session.add(character)
+        db.session.commit()
+        character.extra_data = '{"google_docs": {"document_id": "doc-1"}, "slack": {"channel_id": "C1"}}'
+        return character
+
+    @pytest.fixture
+    def manager(self, client):
+        manager = CharacterSheetManager(db.session)
+        manager.google_docs, manager.google_sync, manager.google_available = MagicMock(), MagicMock(), True
+        manager.slack, manager.slack_sync, manager.slack_available = MagicMock(), MagicMock(), True
+        return manager
+
+    def test_pushes_run_concurrently(self, character, manager):
+        manager.google_sync.push_updates_to_docs = TestDiscovery.slow(True)
+        manager.slack_sync.push_updates_to_slack = TestDiscovery.slow(RuntimeError('token revoked'))
+
+        started = time.perf_counter()
+        result = asyncio.run(manager.update_character_sheet(character.id, {'handle': 'Ghost'}))
+        assert time.perf_counter() - started < 0.18
+
+        assert result['updates_applied'] == 1
+        assert result['sync_results'] == {
+            'google_docs': True,
+            'slack': {'status': 'error', 'error': 'token revoked'},
+        }
+
+    def test_wren_copies_created_concurrently(self, character, manager):
+        manager.google_docs.create_character_sheet_copy = TestDiscovery.slow('copy-1')
+        manager.slack.create_character_sheet_thread = TestDiscovery.slow('1700000000.0001')
+
+        started = time.perf_counter()
+        result = asyncio.run(manager.create_wren_managed_copy(character.id))
+        assert time.perf_counter() - started < 0.18
+
+        assert result['copies_created'] == {'google_docs': 'copy-1', 'slack': '1700000000.0001'}
+        extra = _load_extra(character)
+        assert extra['google_docs']['wren_copy_id'] == 'copy-1'
+        assert extra['slack']['wren_thread_ts'] == '1700000000.0001'
+        channel, data = manager.slack.create_character_sheet_thread.await_args.args
+        assert channel == 'C1' and data['name'] == 'Kestrel'
+
+    def test_wren_copy_loads_character_once(self, character, manager, count_queries):
+        manager.google_docs.create_character_sheet_copy = TestDiscovery.slow('copy-1')
+        manager.slack.create_character_sheet_thread = TestDiscovery.slow('1700000000.0001')
+        character_id = character.id
+        db.session.expunge_all()
+        with count_queries() as statements:
+            asyncio.run(manager.create_wren_managed_copy(character_id))
+        character_selects = [s for s in statements if s.startswith('SELECT') and 'FROM character' in s]
+        assert len(character_selects) == 1
+
+    def test_integration_info_skips_sheet_columns(self, character, manager, count_queries):
+        character_id = character.id
+        db.session.expunge_all()
+        with count_queries() as statements:
+            info = asyncio.run(manager.get_character_integration_info(character_id))
+        assert len(statements) == 1
+        assert 'skills' not in statements[0] and 'gear' not in statements[0]
+        assert info['character_name'] == 'Kestrel'
+        assert info['integrations'] == {'google_docs': {'connected': False}, 'slack': {'connected': False}}
+        assert asyncio.run(manager.get_character_integration_info(character_id + 1000))['status'] == 'error'
+
+    def test_only_sheet_fields_written(self, character, manager):
+        result = asyncio.run(manager.update_character_sheet(character.id, {
+            'handle': 'Ghost',
+            'skills': {'firearms': 5},
+            'session_id': 'hijacked',
+            'commit': 'not a column',
+        }, sync_to_external=False))
+        assert result['updates_applied'] == 2
+
+        db.session.expire_all()
+        stored = db.session.get(Character, character.id)
+        assert stored.handle == 'Ghost'
+        assert stored.skills == '{"firearms":5}'
+        assert stored.session_id.startswith('push-test-')
+
+
+class TestExtraData:
+    """Test the memoized extra_data parse"""
+
+    def test_parse_memoized_until_raw_changes(self):
+        character = Character(name='Kestrel')
+        character.extra_data = '{"slack": {"channel_id": "C1"}}'
+        extra = _load_extra(character)
+        assert extra == {'slack': {'channel_id': 'C1'}}
+        assert _load_extra(character) is extra
+
+        extra['google_docs'] = {'document_id': 'doc-1'}
+        _store_extra(character, extra)
+        assert _load_extra(character) is extra
+        assert '"document_id":"doc-1"' in character.extra_data
+
+        character.extra_data = '{}'
+        assert _load_extra(character) == {}
+
+
+class TestIntegrationStatus:
+    """Test the precomputed integration status"""
+
+    def test_status_snapshot(self):
+        app.config['TESTING'] = True
+        with app.app_context():
+            manager = CharacterSheetManager(db.session)
+        status = manager.get_integration_status()
+        assert manager.get_integration_status() is status
+        assert status['slack']['available'] is manager.slack_available
+
+        manager.slack, manager.slack_available = MagicMock(), True
+        manager._refresh_integration_status()
+        assert manager.get_integration_status()['slack'] == {
+            'available': True, 'authenticated': True, 'service_status': 'ready'
+        }
+
+
+class TestRateLimiter:
+    """Test the per-service token bucket"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_paced(self):
+        limiter = _RateLimiter(3, period=1.0)
+        with patch('integrations.character_sheet_manager.asyncio.sleep', new=AsyncMock()) as sleep:
+            for _ in range(5):
+                await limiter.acquire()
+        # Three tokens spent freely, then each caller waits its turn behind the last
+        delays = [call.args[0] for call in sleep.await_args_list]
+        assert len(delays) == 2
+        assert 0.3 < delays[0] <= 1 / 3 and 0.6 < delays[1] <= 2 / 3
+
+    def test_external_calls_paced(self):
+        app.config['TESTING'] = True
+        with app.app_context():
+            manager = CharacterSheetManager(db.session)
+        manager.slack, manager.slack_available = MagicMock(), True
+        manager.slack.find_character_sheets = AsyncMock(return_value=[])
+        manager._slack_limiter = MagicMock(acquire=AsyncMock())
+
+        asyncio.run(manager._discover_slack('C1', None))
+        manager._slack_limiter.acquire.assert_awaited_once()
@@ -0,0 +1,177 @@
+"""
+Test append-only chat memory storage
+"""
+import asyncio
+import threading
+import uuid
+import pytest
+from unittest.mock import patch
+import app as app_module
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from app import (
+    app, db, Session, ChatMemory, ChatMessage, flush_chat_writes, import_legacy_chat_history, pack_list,
+    queue_chat_turn, unpack_list, upgrade_schema,
+)
+
+
+class TestChatMemory:
+    """Test chat history rows and legacy blob import"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    def test_import_legacy_history(self, client):
+        session_id = f'chat-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            memory = ChatMemory(session_id=session_id, user_id='player-1', role='player', messages=pack_list([
+                {'role': 'system', 'content': 'You are a GM'},
+                {'role': 'user', 'content': 'I check the door'},
+                {'role': 'assistant', 'content': 'It is locked'},
+            ]))
+            db.session.add(memory)
+            db.session.commit()
+
+            import_legacy_chat_history(memory, unpack_list(memory.messages))
+
+            memory = ChatMemory.query.filter_by(session_id=session_id).one()
+            assert unpack_list(memory.messages) == []
+            assert [(m.seq, m.role, m.content) for m in memory.chat_messages] == [
+                (0, 'user', 'I check the door'),
+                (1, 'assistant', 'It is locked'),
+            ]
+            assert ChatMessage.query.filter_by(memory_id=memory.id).count() == 2
+
+    def test_chat_appends_turns(self, client):
+        session_id = f'chat-test-{uuid.uuid4()}'
+        sent = []
+
+        async def fake_stream(messages):
+            sent.append(list(messages))
+            for chunk in ('Hoi ', 'chummer'):
+                yield chunk
+
+        with patch('app.call_openai_stream', fake_stream):
+            for text in ('Hello', 'Again'):
+                response = client.post('/api/chat', json={'input': text, 'session_id': session_id, 'user_id': 'player-1'})
+                # Written behind the response; the next turn waits for it before reading history
+                assert response.get_data(as_text=True) == 'data: Hoi \n\ndata: chummer\n\n'
+        flush_chat_writes()
+
+        assert [m['role'] for m in sent[1]] == ['system', 'user', 'assistant', 'user']
+        assert sent[1][2]['content'] == 'Hoi chummer'
+        with app.app_context():
+            memory = ChatMemory.query.filter_by(session_id=session_id).one()
+            assert [(m.seq, m.content) for m in memory.chat_messages] == [
+                (0, 'Hello'), (1, 'Hoi chummer'), (2, 'Again'), (3, 'Hoi chummer'),
+            ]
+
+    def test_concurrent_turns_keep_both(self, client):
+        session_id = f'chat-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(ChatMemory(session_id=session_id, user_id='p1', role='player'))
+            db.session.commit()
+        second_read = threading.Event()
+        histories = {}
+
+        async def fake_stream(messages):
+            text = messages[-1]['content']
+            histories[text] = len(messages)
+            if text == 'one':
+                await asyncio.to_thread(second_read.wait, 5)
+            else:
+                second_read.set()
+            yield text.upper()
+
+        def tab(text):
+            with app.test_client() as tab_client:
+                tab_client.post('/api/chat', json={'input': text, 'session_id': session_id, 'user_id': 'p1'}).get_data()
+
+        # Two tabs: both read the same history before either turn is written
+        with patch('app.call_openai_stream', fake_stream):
+            tabs = [threading.Thread(target=tab, args=(text,)) for text in ('one', 'two')]
+            for thread in tabs:
+                thread.start()
+            for thread in tabs:
+                thread.join(5)
+        flush_chat_writes()
+
+        assert histories == {'one': 2, 'two': 2}
+        with app.app_context():
+            memory = ChatMemory.query.filter_by(session_id=session_id).one()
+            stored = [(m.seq, m.content) for m in memory.chat_messages]
+        # Either tab may finish first; each turn stays contiguous
+        assert [seq for seq, _ in stored] == [0, 1, 2, 3]
+        turns = {(stored[i][1], stored[i + 1][1]) for i in (0, 2)}
+        assert turns == {('one', 'ONE'), ('two', 'TWO')}
+
+    def test_turn_takes_seq_after_other_writers(self, client):
+        with app.app_context():
+            memory = ChatMemory(session_id=f'chat-test-{uuid.uuid4()}', user_id='player-1', role='player')
+            db.session.add(memory)
+            db.session.commit()
+            # Written by another process after this request read the history
+            db.session.add(ChatMessage(memory_id=memory.id, seq=0, role='user', content='Elsewhere'))
+            db.session.commit()
+            queue_chat_turn(memory.id, [{'role': 'user', 'content': 'Here'}]).result()
+            assert [(m.seq, m.content) for m in db.session.get(ChatMemory, memory.id).chat_messages] == [
+                (0, 'Elsewhere'), (1, 'Here'),
+            ]
+
+    def test_failed_turn_logged(self, client):
+        with app.app_context():
+            memory = ChatMemory(session_id=f'chat-test-{uuid.uuid4()}', user_id='player-1', role='player')
+            db.session.add(memory)
+            db.session.commit()
+            memory_id = memory.id
+        with patch.object(app_module.logger, 'error') as log_error:
+            future = queue_chat_turn(memory_id, [{'role': 'user', 'content': None}])
+            flush_chat_writes()
+        assert isinstance(future.exception(), IntegrityError)
+        assert log_error.call_args.args[0] == 'CHAT_TURN_WRITE_FAILED'
+        # The writer carries on with later turns
+        queue_chat_turn(memory_id, [{'role': 'user', 'content': 'Hello'}]).result()
+        with app.app_context():
+            assert [m.seq for m in db.session.get(ChatMemory, memory_id).chat_messages] == [0]
+
+    def test_seq_unique_per_memory(self, client):
+        with app.app_context():
+            memory = ChatMemory(session_id=f'chat-test-{uuid.uuid4()}', user_id='player-1', role='player')
+            db.session.add(memory)
+            db.session.commit()
+            db.session.add_all([
+                ChatMessage(memory_id=memory.id, seq=0, role='user', content='Hello'),
+                ChatMessage(memory_id=memory.id, seq=0, role='user', content='Again'),
+            ])
+            with pytest.raises(IntegrityError):
+                db.session.commit()
+            db.session.rollback()
+
+    def test_schema_upgrade_renumbers_duplicates(self, client):
+        with app.app_context():
+            memory = ChatMemory(session_id=f'chat-test-{uuid.uuid4()}', user_id='player-1', role='player')
+            db.session.add(memory)
+            db.session.commit()
+            # A database from before the unique index, holding a duplicated turn
+            db.session.execute(text('DROP INDEX ix_chat_message_memory_seq'))
+            db.session.execute(text('CREATE INDEX ix_chat_message_memory_seq ON chat_message (memory_id, seq)'))
+            db.session.add_all([
+                ChatMessage(memory_id=memory.id, seq=seq, role=role, content=content)
+                for seq, role, content in ((0, 'user', 'Hello'), (1, 'assistant', 'Hoi'),
+                                           (0, 'user', 'Again'), (1, 'assistant', 'Chummer'))
+            ])
+            db.session.commit()
+
+            upgrade_schema()
+            indexes = {index['name']: index for index in inspect(db.engine).get_indexes('chat_message')}
+            assert indexes['ix_chat_message_memory_seq']['unique']
+            db.session.expire_all()
+            assert [(m.seq, m.content) for m in db.session.get(ChatMemory, memory.id).chat_messages] == [
+                (0, 'Hello'), (1, 'Hoi'), (2, 'Again'), (3, 'Chummer'),
+            ]
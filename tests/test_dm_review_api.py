@@ -0,0 +1,208 @@
+"""
+Test DM review queue and notification endpoints
+"""
+import json
+import threading
+import uuid
+import pytest
+from app import app, db, Session, PendingResponse, DmNotification, ReviewHistory, queue_insert, flush_write_queue
+
+
+class TestDmNotifications:
+    """Test marking DM notifications as read"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def notifications(self, client):
+        session_id = f'notify-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            pending = PendingResponse(
+                session_id=session_id, user_id='player-1', context='Q', ai_response='A', response_type='narrative'
+            )
+            db.session.add(pending)
+            db.session.flush()
+            rows = [
+                DmNotification(session_id=session_id, dm_user_id=dm, pending_response_id=pending.id,
+                               notification_type='new_review', message='Review me')
+                for dm in ('gm-123', 'gm-123', 'gm-123', 'someone-else')
+            ]
+            db.session.add_all(rows)
+            db.session.commit()
+            return session_id, [n.id for n in rows]
+
+    def unread_ids(self, session_id):
+        with app.app_context():
+            return {n.id for n in DmNotification.query.filter_by(session_id=session_id, is_read=False)}
+
+    def test_batch_mark_read(self, client, notifications):
+        session_id, ids = notifications
+        response = client.post(f'/api/session/{session_id}/dm/notifications/mark-read', json={
+            'user_id': 'gm-123',
+            'ids': ids,
+        })
+        assert response.status_code == 200
+        assert response.get_json()['updated'] == 3
+        # Notifications addressed to another DM are untouched
+        assert self.unread_ids(session_id) == {ids[3]}
+
+    def test_batch_mark_read_validation(self, client, notifications):
+        session_id, ids = notifications
+        url = f'/api/session/{session_id}/dm/notifications/mark-read'
+        assert client.post(url, json={'ids': ids}).status_code == 400
+        assert client.post(url, json={'user_id': 'gm-123', 'ids': 'all'}).status_code == 400
+        assert client.post(url, json={'user_id': 'gm-123', 'ids': ['1; DROP TABLE']}).status_code == 400
+
+        response = client.post(url, json={'user_id': 'gm-123', 'ids': []})
+        assert response.get_json()['updated'] == 0
+
+    def test_single_mark_read(self, client, notifications):
+        session_id, ids = notifications
+        url = f'/api/session/{session_id}/dm/notifications/{{}}/mark-read'
+        assert client.post(url.format(ids[0]), json={'user_id': 'gm-123'}).status_code == 200
+        assert client.post(url.format(ids[3]), json={'user_id': 'gm-123'}).status_code == 404
+        assert self.unread_ids(session_id) == {ids[1], ids[2], ids[3]}
+
+
+    def test_write_behind_notifications(self, client, notifications):
+        session_id, ids = notifications
+        with app.app_context():
+            pending_id = db.session.get(DmNotification, ids[0]).pending_response_id
+        for i in range(5):
+            queue_insert(DmNotification, session_id=session_id, dm_user_id='gm-123', pending_response_id=pending_id,
+                         notification_type='urgent_review', message=f'Queued {i}')
+        flush_write_queue()
+
+        with app.app_context():
+            queued = DmNotification.query.filter_by(session_id=session_id, notification_type='urgent_review').all()
+            assert sorted(n.message for n in queued) == [f'Queued {i}' for i in range(5)]
+            assert all(n.is_read is False and n.created_at is not None for n in queued)
+
+class TestReviewResponse:
+    """Test DM review actions and their audit trail"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def pending_id(self, client):
+        session_id = f'review-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            pending = PendingResponse(
+                session_id=session_id, user_id='player-1', context='Q', ai_response='Original', response_type='narrative'
+            )
+            db.session.add(pending)
+            db.session.commit()
+            return session_id, pending.id
+
+    @pytest.mark.parametrize('action,status,final', [
+        ('approve', 'approved', 'Original'),
+        ('edit', 'edited', 'Edited'),
+        ('reject', 'rejected', None),
+    ])
+    def test_review_actions(self, client, pending_id, action, status, final):
+        session_id, response_id = pending_id
+        response = client.post(f'/api/session/{session_id}/pending-response/{response_id}/review', json={
+            'user_id': 'gm-123',
+            'action': action,
+            'final_response': 'Edited',
+            'dm_notes': 'Looks good',
+        })
+        assert response.status_code == 200
+
+        with app.app_context():
+            pending = db.session.get(PendingResponse, response_id)
+            assert pending.status == status
+            assert pending.final_response == final
+            assert pending.dm_notes == 'Looks good'
+            assert pending.reviewed_at is not None
+
+            history = ReviewHistory.query.filter_by(pending_response_id=response_id).one()
+            assert history.dm_user_id == 'gm-123'
+            assert history.action == action
+            assert history.original_response == 'Original'
+            assert history.final_response == final
+            assert history.notes == 'Looks good'
+            assert history.created_at is not None
+
+    def test_review_rejects_bad_requests(self, client, pending_id):
+        session_id, response_id = pending_id
+        url = f'/api/session/{session_id}/pending-response/{{}}/review'
+        assert client.post(url.format(response_id), json={'user_id': 'player-1', 'action': 'approve'}).status_code == 403
+        assert client.post(url.format(response_id), json={'user_id': 'gm-123', 'action': 'shrug'}).status_code == 400
+        assert client.post(url.format('missing'), json={'user_id': 'gm-123', 'action': 'approve'}).status_code == 404
+
+        with app.app_context():
+            assert db.session.get(PendingResponse, response_id).status == 'pending'
+            assert ReviewHistory.query.filter_by(pending_response_id=response_id).count() == 0
+
+
+class TestReviewStatusStream:
+    """Test the push-based review status stream"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def pending_id(self, client):
+        session_id = f'stream-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            pending = PendingResponse(
+                session_id=session_id, user_id='player-1', context='Q', ai_response='A', response_type='narrative'
+            )
+            db.session.add(pending)
+            db.session.commit()
+            return session_id, pending.id
+
+    @staticmethod
+    def parse_frame(frame):
+        assert frame.startswith(b'data: ') and frame.endswith(b'\n\n')
+        return json.loads(frame[len(b'data: '):])
+
+    def test_unknown_response(self, client):
+        assert client.get('/api/pending-response/nope/status/stream').status_code == 404
+
+    def test_review_pushes_final_status(self, client, pending_id):
+        session_id, response_id = pending_id
+        response = client.get(f'/api/pending-response/{response_id}/status/stream')
+        assert response.mimetype == 'text/event-stream'
+        frames = iter(response.response)
+        assert self.parse_frame(next(frames))['status'] == 'pending'
+
+        review_status = []
+
+        def review():
+            # Separate client: the streaming request still owns this thread's context
+            result = app.test_client().post(f'/api/session/{session_id}/pending-response/{response_id}/review', json={
+                'user_id': 'gm-123',
+                'action': 'approve',
+            })
+            review_status.append(result.status_code)
+        reviewer = threading.Timer(0.1, review)
+        reviewer.start()
+
+        final = self.parse_frame(next(frames))
+        reviewer.join()
+        assert review_status == [200]
+        assert final['status'] == 'approved'
+        assert final['response'] == 'A'
+        assert list(frames) == []
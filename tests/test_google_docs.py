@@ -0,0 +1,350 @@
+"""
+Test Google Docs character sheet parsing
+"""
+import asyncio
+import re
+import threading
+import time
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app import app, db, Session, Character
+from integrations.character_sheet_manager import _load_extra
+from integrations.google_docs_integration import CharacterSheetSync, GoogleDocsCharacterSheet, _trie_pattern
+
+SHEET = """Character Sheet
+Name: Kestrel Vance
+Street Name: Ghost
+Archetype: Street Samurai
+Body: 5
+Agility: 6
+Reaction: 4
+Logic: 3
+Edge: 2
+Firearms: 6 (Pistols +2)
+Close Combat: 4
+Stealth: 3
+Karma: 12
+Nuyen: 15,250
+Qualities:
+  Ambidextrous
+  Guts
+
+Gear:
+Ares Predator
+"""
+
+
+def paragraph(*runs):
+    return {'paragraph': {'elements': [{'textRun': {'content': run}} for run in runs]}}
+
+
+class TestTextExtraction:
+    """Test flattening the Docs body structure to text"""
+
+    def test_extract_text_runs(self):
+        docs = GoogleDocsCharacterSheet(credentials_file='missing.json', token_file='missing-token.json')
+        document = {'body': {'content': [
+            {'sectionBreak': {}},
+            paragraph('Name: ', 'Kestrel\n'),
+            {'table': {'rows': 1}},
+            {'paragraph': {'elements': [{'inlineObjectElement': {}}, {'textRun': {'content': 'Body: 5\n'}}]}},
+            paragraph(''),
+            {'paragraph': {}},
+        ]}}
+        assert docs._extract_text_content(document) == 'Name: Kestrel\nBody: 5\n'
+        assert docs._extract_text_content({}) == ''
+
+
+class TestUpdateRequests:
+    """Test the batchUpdate payload appended to a sheet"""
+
+    def test_single_insert_at_document_end(self):
+        docs = GoogleDocsCharacterSheet(credentials_file='missing.json', token_file='missing-token.json')
+        document = {'body': {'content': [
+            {'endIndex': 1, 'sectionBreak': {}},
+            {'endIndex': 40, 'table': {}},
+            {'endIndex': 52, **paragraph('Body: 5\n')},
+        ]}}
+        requests = docs._build_update_requests(document, {'current_edge': 2, 'edge': 4})
+        assert len(requests) == 1
+        insert = requests[0]['insertText']
+        # Table structure counts towards the index; plain text length would give 8
+        assert insert['location'] == {'index': 51}
+        assert insert['text'].startswith('\n\nLast updated by WREN: ')
+        assert insert['text'].endswith('\nCurrent Edge: 2/4')
+
+        assert docs._build_update_requests({}, {})[0]['insertText']['location'] == {'index': 1}
+
+
+class TestSheetParsing:
+    """Test extraction of SR6E fields from document text"""
+
+    @pytest.fixture
+    def docs(self):
+        # No credentials in tests: the instance never talks to Google
+        return GoogleDocsCharacterSheet(credentials_file='missing.json', token_file='missing-token.json')
+
+    def test_parse_sheet(self, docs):
+        data = docs._parse_shadowrun_data(SHEET)
+        assert data['name'] == 'Kestrel Vance'
+        assert data['handle'] == 'Ghost'
+        assert data['archetype'] == 'Street Samurai'
+        assert data['attributes'] == {'body': 5, 'agility': 6, 'reaction': 4, 'logic': 3, 'edge': 2}
+        assert data['skills'] == {'firearms': 6, 'close_combat': 4, 'stealth': 3}
+        assert (data['edge'], data['karma'], data['nuyen']) == (2, 12, 15250)
+        assert data['qualities']['positive'] == ['Ambidextrous', 'Guts']
+
+    def test_attribute_needs_word_boundary(self, docs):
+        data = docs._parse_shadowrun_data('Antibody: 9\nBody : 4\nMetalogic: 7\n')
+        assert data['attributes'] == {'body': 4}
+
+    def test_single_pass_fields(self, docs):
+        data = docs._parse_shadowrun_data('Street Name: Ghost\nName: Kestrel\nKarma: 3\nKarma: 40\nEdge: 4\n')
+        # "Street Name:" is consumed as the handle, not mistaken for the name
+        assert (data['name'], data['handle']) == ('Kestrel', 'Ghost')
+        assert data['karma'] == 3
+        assert data['edge'] == data['attributes']['edge'] == 4
+
+    def test_only_known_skills(self, docs):
+        data = docs._parse_shadowrun_data(
+            'Skills: firearms: 5, Conjuring: 2\nLast updated by WREN: 2024\nContacts: 3\nCon: 4\n'
+        )
+        assert data['skills'] == {'firearms': 5, 'conjuring': 2, 'con': 4}
+
+    def test_trie_pattern(self):
+        words = ('Con', 'Conjuring', 'Close Combat', 'Cracking', 'Stealth')
+        pattern = re.compile(_trie_pattern(words), re.IGNORECASE)
+        assert all(pattern.fullmatch(word) for word in words)
+        assert not any(pattern.fullmatch(text) for text in ('Co', 'Conj', 'Close', 'Stealthy', ''))
+
+    def test_skill_rating_on_same_line(self, docs):
+        data = docs._parse_shadowrun_data('Stealth:\n4 hours of sleep\nAthletics : 3\n')
+        assert data['skills'] == {'athletics': 3}
+
+    def test_adversarial_text_parses_quickly(self, docs):
+        started = time.perf_counter()
+        docs._parse_shadowrun_data('Firearms ' * 20000 + 'Close ' * 20000 + ' ' * 100000 + 'a ' * 50000)
+        assert time.perf_counter() - started < 1
+
+    def test_quality_lines_trimmed(self, docs):
+        data = docs._parse_shadowrun_data('Qualities: Lucky\n\t Ambidextrous  \r\n   \n  High Pain Tolerance\nGear:\n')
+        assert data['qualities']['positive'] == ['Lucky', 'Ambidextrous', 'High Pain Tolerance']
+
+    @pytest.mark.parametrize('line,nuyen', [
+        ('Nuyen: 15,250', 15250),
+        ('\u00a5: 2 500 000', 2500000),
+        ('nuyen : 12\u00a0000\nKarma: 3', 12000),
+        ('Nuyen: 1_000 ', 1000),
+    ])
+    def test_nuyen_grouping(self, docs, line, nuyen):
+        assert docs._parse_shadowrun_data(line)['nuyen'] == nuyen
+
+    def test_qualities_end_at_gear_heading(self, docs):
+        data = docs._parse_shadowrun_data('Qualities:\nGearhead\nGuts\n  Equipment\nAres Predator\n')
+        assert data['qualities']['positive'] == ['Gearhead', 'Guts']
+        data = docs._parse_shadowrun_data('qualities: Lucky\nToughness')
+        assert data['qualities']['positive'] == ['Lucky', 'Toughness']
+
+    def test_parse_empty(self, docs):
+        data = docs._parse_shadowrun_data('')
+        assert data['name'] == '' and data['attributes'] == {} and data['skills'] == {}
+        assert data['nuyen'] == 0
+
+
+class TestParseCache:
+    """Test reuse of parsed sheets across unchanged revisions"""
+
+    @pytest.fixture
+    def docs(self):
+        docs = GoogleDocsCharacterSheet(credentials_file='missing.json', token_file='missing-token.json')
+        docs.revision = 'rev-1'
+        docs.downloads = 0
+        docs.threads = set()
+        docs.masks = []
+        docs.connections = []
+
+        def get(documentId, fields=None):
+            docs.masks.append(fields)
+
+            def execute(http=None):
+                docs.threads.add(threading.get_ident())
+                docs.connections.append((threading.get_ident(), http))
+                if fields == 'revisionId':
+                    return {'revisionId': docs.revision}
+                docs.downloads += 1
+                return {'revisionId': docs.revision, 'body': {'content': [paragraph(SHEET)]}}
+            return MagicMock(execute=execute)
+        docs.service = MagicMock()
+        docs.service.documents.return_value.get.side_effect = get
+        return docs
+
+    def test_unchanged_revision_reused(self, docs):
+        first = asyncio.run(docs.parse_character_sheet('doc-1'))
+        first['attributes']['body'] = 99
+        second = asyncio.run(docs.parse_character_sheet('doc-1'))
+        assert docs.downloads == 1
+        assert second['attributes']['body'] == 5
+        assert second['document_id'] == 'doc-1' and second['last_updated']
+
+        docs.revision = 'rev-2'
+        asyncio.run(docs.parse_character_sheet('doc-1'))
+        asyncio.run(docs.parse_character_sheet('doc-1'))
+        assert docs.downloads == 2
+        # One entry per document; the old revision was replaced, not kept alongside
+        assert dict(docs._parsed_sheets)['doc-1'][0] == 'rev-2' and len(docs._parsed_sheets) == 1
+
+    def test_field_masks(self, docs):
+        asyncio.run(docs.parse_character_sheet('doc-1'))
+        assert docs.masks == ['revisionId', 'revisionId,body(content(endIndex,paragraph(elements(textRun(content)))))']
+
+    def test_requests_run_off_loop(self, docs):
+        asyncio.run(docs.parse_character_sheet('doc-1'))
+        assert docs.threads and threading.get_ident() not in docs.threads
+
+    def test_parse_runs_off_loop(self, docs, monkeypatch):
+        parse = docs._parse_shadowrun_data
+        parsed_on = []
+
+        def record(content):
+            parsed_on.append(threading.get_ident())
+            return parse(content)
+        monkeypatch.setattr(docs, '_parse_shadowrun_data', record)
+        assert asyncio.run(docs.parse_character_sheet('doc-1'))['name'] == 'Kestrel Vance'
+        assert parsed_on and threading.get_ident() not in parsed_on
+
+    def test_connection_reused_per_thread(self, docs):
+        async def run():
+            for i in range(3):
+                await docs.parse_character_sheet(f'doc-{i}')
+        asyncio.run(run())
+        by_thread = {}
+        for thread, http in docs.connections:
+            assert http is not None
+            by_thread.setdefault(thread, set()).add(id(http))
+        # Each worker thread authorizes one connection and keeps it
+        assert all(len(connections) == 1 for connections in by_thread.values())
+
+
+class TestDriveCalls:
+    """Test that blocking Drive requests run concurrently off the event loop"""
+
+    @pytest.fixture
+    def docs(self):
+        docs = GoogleDocsCharacterSheet(credentials_file='missing.json', token_file='missing-token.json')
+
+        def blocking(result):
+            def execute(http=None):
+                time.sleep(0.1)
+                return result
+            return MagicMock(execute=execute)
+        files = docs.drive_service = MagicMock()
+        files.files.return_value.list.side_effect = lambda **kwargs: blocking({'files': [
+            {'id': 'doc-1', 'name': 'Kestrel', 'modifiedTime': '2024-05-01', 'owners': [{'emailAddress': 'p1@example.com'}]}
+        ]})
+        files.files.return_value.get.side_effect = lambda **kwargs: blocking({'name': 'Kestrel', 'parents': ['folder']})
+        files.files.return_value.copy.side_effect = lambda **kwargs: blocking({'id': 'copy-1'})
+        return docs
+
+    def test_calls_overlap(self, docs):
+        async def run():
+            return await asyncio.gather(
+                docs.list_accessible_documents(),
+                docs.list_accessible_documents('p1@example.com'),
+                docs.create_character_sheet_copy('doc-1', 'session-1'),
+            )
+        started = time.perf_counter()
+        listed, _, copy_id = asyncio.run(run())
+        # Three lists/copies at 0.1-0.2s each would take 0.4s serially
+        assert time.perf_counter() - started < 0.3
+        assert listed == [{'id': 'doc-1', 'name': 'Kestrel', 'modified': '2024-05-01', 'owner': 'p1@example.com'}]
+        assert copy_id == 'copy-1'
+
+    def test_listing_paginated(self, docs):
+        pages = {
+            None: {'files': [{'id': 'doc-1', 'name': 'A', 'modifiedTime': 't1'}], 'nextPageToken': 'p2'},
+            'p2': {'files': [{'id': 'doc-2', 'name': 'B', 'modifiedTime': 't2'}]},
+        }
+        calls = []
+
+        def list_files(**kwargs):
+            calls.append(kwargs)
+            return MagicMock(execute=lambda http=None: pages[kwargs['pageToken']])
+        docs.drive_service.files.return_value.list.side_effect = list_files
+
+        documents = asyncio.run(docs.list_accessible_documents("o'brien@example.com"))
+        assert [d['id'] for d in documents] == ['doc-1', 'doc-2']
+        assert documents[0]['owner'] == 'Unknown'
+        assert len(calls) == 2
+        query = calls[0]['q']
+        assert query.startswith("mimeType = 'application/vnd.google-apps.document' and (")
+        assert query.endswith("and 'o\\'brien@example.com' in writers")
+
+
+class TestDocsSync:
+    """Test writing sync metadata back to the character"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def character(self, client):
+        session_id = f'docs-test-{uuid.uuid4()}'
+        db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+        character = Character(session_id=session_id, user_id='player-1', name='Kestrel')
+        db.session.add(character)
+        db.session.commit()
+        # Integration references are not a mapped column in this schema
+        character.extra_data = '{"google_docs": {"document_id": "doc-1"}}'
+        return character
+
+    def test_push_records_timestamp(self, character):
+        docs = MagicMock(update_character_sheet=AsyncMock(return_value=True))
+        sync = CharacterSheetSync(docs, db.session)
+        assert asyncio.run(sync.push_updates_to_docs(character.id, {'current_edge': 1})) is True
+        docs.update_character_sheet.assert_awaited_once_with('doc-1', {'current_edge': 1})
+        assert _load_extra(character)['google_docs']['last_update_push']
+        assert '"document_id":"doc-1"' in character.extra_data
+
+    def test_sync_updates_existing_character(self, character, count_queries):
+        docs = MagicMock(parse_character_sheet=AsyncMock(return_value={
+            'name': 'Kestrel Vance', 'handle': 'Ghost', 'archetype': 'Decker',
+            'attributes': {'logic': 6}, 'skills': {'cracking': 5}, 'qualities': {'positive': ['Guts']},
+        }))
+        sync = CharacterSheetSync(docs, db.session)
+        with count_queries() as statements:
+            result = asyncio.run(sync.sync_character_sheet('doc-2', character.session_id, 'player-1'))
+        assert result['status'] == 'success' and result['character_id'] == character.id
+        assert result['sync_time'].endswith('+00:00')
+        assert _load_extra(character)['google_docs'] == {'document_id': 'doc-2', 'last_sync': result['sync_time']}
+        assert [s.split()[0] for s in statements].count('UPDATE') == 1
+
+        db.session.expire_all()
+        stored = db.session.get(Character, character.id)
+        assert (stored.name, stored.handle, stored.archetype) == ('Kestrel Vance', 'Ghost', 'Decker')
+        assert stored.skills == '{"cracking":5}'
+
+    def test_sync_creates_missing_character(self, character):
+        docs = MagicMock(parse_character_sheet=AsyncMock(return_value={
+            'name': 'Magpie', 'handle': 'Wire', 'archetype': 'Rigger',
+            'attributes': {'reaction': 5}, 'skills': {'pilot_ground': 6}, 'qualities': {},
+        }))
+        sync = CharacterSheetSync(docs, db.session)
+        # Hold the new row: its unmapped extra_data only lives on this instance
+        with patch.object(db.session, 'add', wraps=db.session.add) as add:
+            result = asyncio.run(sync.sync_character_sheet('doc-3', character.session_id, 'player-2'))
+        assert result['status'] == 'success' and result['character_name'] == 'Magpie'
+
+        created = add.call_args.args[0]
+        assert created.id == result['character_id'] != character.id
+        assert created.user_id == 'player-2'
+        assert _load_extra(created)['google_docs'] == {'document_id': 'doc-3', 'last_sync': result['sync_time']}
+        db.session.expire_all()
+        stored = db.session.get(Character, result['character_id'])
+        assert (stored.handle, stored.archetype) == ('Wire', 'Rigger')
+        assert stored.skills == '{"pilot_ground":6}'
@@ -0,0 +1,214 @@
+"""
+Test generated image listing and detail endpoints
+"""
+import asyncio
+import uuid
+from datetime import datetime
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import literal, update
+from app import app, db, Session, GeneratedImage, ImageGeneration, pack_list, available_image_providers
+from image_gen_utils import ImageGenerationError, get_session_images, image_generator, process_image_generation
+
+
+class TestImageRead:
+    """Test image list and detail payloads"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def session_id(self, client):
+        session_id = f'image-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            db.session.add_all([
+                GeneratedImage(id=f'{session_id}-{i}', session_id=session_id, user_id='player-1',
+                               prompt=f'Neon alley {i}', provider='dalle', status='completed',
+                               tags=pack_list(['alley', 'night']) if i % 2 else None,
+                               created_at=datetime(2024, 5, 1, 12, 0, i, 250000))
+                for i in range(3)
+            ])
+            db.session.commit()
+        return session_id
+
+    def test_list_images(self, client, session_id):
+        data = client.get(f'/api/session/{session_id}/images').get_json()
+        assert data['status'] == 'success'
+        assert data['count'] == 3
+        newest = data['images'][0]
+        assert newest['prompt'] == 'Neon alley 2'
+        assert newest['created_at'] == '2024-05-01T12:00:02.250000'
+        assert newest['tags'] == []
+        assert data['images'][1]['tags'] == ['alley', 'night']
+
+    def test_image_details(self, client, session_id):
+        data = client.get(f'/api/session/{session_id}/image/{session_id}-1').get_json()
+        assert data['image']['tags'] == ['alley', 'night']
+        assert data['image']['created_at'] == '2024-05-01T12:00:01.250000'
+
+        assert client.get(f'/api/session/other/image/{session_id}-1').status_code == 404
+
+    def test_legacy_json_tags(self, client, session_id):
+        with app.app_context():
+            # Rows written before the MessagePack switch hold JSON text
+            db.session.execute(
+                update(GeneratedImage).where(GeneratedImage.id == f'{session_id}-0').values(tags=literal('["rooftop"]'))
+            )
+            db.session.commit()
+        data = client.get(f'/api/session/{session_id}/image/{session_id}-0').get_json()
+        assert data['image']['tags'] == ['rooftop']
+
+    def test_list_images_for_user(self, client, session_id):
+        with app.app_context():
+            db.session.add(GeneratedImage(session_id=session_id, user_id='player-2', prompt='Rooftop',
+                                          provider='dalle', status='completed'))
+            db.session.commit()
+        data = client.get(f'/api/session/{session_id}/images?user_id=player-2').get_json()
+        assert [img['prompt'] for img in data['images']] == ['Rooftop']
+        assert client.get(f'/api/session/{session_id}/images?limit=2').get_json()['count'] == 2
+
+    def test_providers_cached(self, client, session_id):
+        available_image_providers.cache_clear()
+        with patch('image_gen_utils.ImageGenerator.get_available_providers', return_value=['stability']) as probe:
+            for _ in range(3):
+                data = client.get(f'/api/session/{session_id}/image-providers').get_json()
+                assert data['providers'] == ['stability']
+                assert data['default'] == 'stability'
+        assert probe.call_count == 1
+        available_image_providers.cache_clear()
+
+    def test_single_row_queries(self, client, session_id, count_queries):
+        image_id = f'{session_id}-1'
+        with count_queries() as statements:
+            client.get(f'/api/session/{session_id}/image/{image_id}')
+        assert len(statements) == 1
+
+        with count_queries() as statements:
+            response = client.post(f'/api/session/{session_id}/image/{image_id}/favorite',
+                                   json={'user_id': 'player-1', 'is_favorite': True})
+        assert response.get_json()['is_favorite'] is True
+        assert len(statements) == 2  # SELECT + UPDATE
+
+    def test_tags_list_memoized(self, client, session_id):
+        with app.app_context():
+            image = db.session.get(GeneratedImage, f'{session_id}-1')
+            assert image.tags_list == ['alley', 'night']
+            assert image.tags_list is image.tags_list
+
+            image.tags = pack_list(['rooftop'])
+            assert image.tags_list == ['rooftop']
+            assert db.session.get(GeneratedImage, f'{session_id}-0').tags_list == []
+
+    def test_keyset_pagination(self, client, session_id):
+        with app.app_context():
+            # Same timestamp as image 2: the id breaks the tie
+            db.session.add(GeneratedImage(id=f'{session_id}-9', session_id=session_id, user_id='player-1',
+                                          prompt='Tie', provider='dalle', status='completed',
+                                          created_at=datetime(2024, 5, 1, 12, 0, 2, 250000)))
+            db.session.commit()
+        url = f'/api/session/{session_id}/images'
+
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 2, 'before': cursor} if cursor else {'limit': 2}
+            response = client.get(url, query_string=params).get_json()
+            seen += [img['id'] for img in response['images']]
+            cursor = response['next_cursor']
+            if cursor is None:
+                break
+        assert seen == [f'{session_id}-{i}' for i in (9, 2, 1, 0)]
+
+        assert client.get(url, query_string={'before': 'yesterday'}).status_code == 400
+        older = client.get(url, query_string={'before': '2024-05-01T12:00:01.250000'}).get_json()
+        assert [img['id'] for img in older['images']] == [f'{session_id}-0']
+
+    def test_keyset_pagination_server_timestamps(self, client):
+        session_id = f'img-default-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            # created_at left to CURRENT_TIMESTAMP: whole seconds, so every row ties with its neighbours
+            db.session.add_all([
+                GeneratedImage(id=f'{session_id}-{i}', session_id=session_id, user_id='player-1',
+                               prompt=f'Scene {i}', provider='dalle', status='completed')
+                for i in range(5)
+            ])
+            # One row written from Python with an explicit whole-second timestamp
+            db.session.add(GeneratedImage(id=f'{session_id}-5', session_id=session_id, user_id='player-1',
+                                          prompt='Scene 5', provider='dalle', status='completed',
+                                          created_at=datetime(2024, 5, 1, 12, 0, 0)))
+            db.session.commit()
+        url = f'/api/session/{session_id}/images'
+
+        seen, cursor = [], None
+        for _ in range(10):
+            params = {'limit': 2, 'before': cursor} if cursor else {'limit': 2}
+            response = client.get(url, query_string=params).get_json()
+            seen += [img['id'] for img in response['images']]
+            cursor = response['next_cursor']
+            if cursor is None:
+                break
+        assert seen == [f'{session_id}-{i}' for i in (4, 3, 2, 1, 0, 5)]
+
+    def test_session_images_helper(self, client, session_id, count_queries):
+        with app.app_context():
+            with count_queries() as statements:
+                images = asyncio.run(get_session_images(session_id, limit=2))
+            assert len(statements) == 1
+            assert 'enhanced_prompt' not in statements[0]
+        assert [img['prompt'] for img in images] == ['Neon alley 2', 'Neon alley 1']
+        assert images[1]['tags'] == ['alley', 'night']
+        assert images[0]['created_at'] == '2024-05-01T12:00:02.250000'
+
+
+class TestImageQueue:
+    """Test processing of queued generation requests"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def request_id(self, client):
+        session_id = f'queue-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            generation = ImageGeneration(session_id=session_id, user_id='player-1', request_type='scene', context='Alley')
+            db.session.add(generation)
+            db.session.commit()
+            return generation.id
+
+    def test_success_single_commit(self, client, request_id, count_queries):
+        result = {'image_url': 'https://img/1.png', 'provider': 'dalle', 'generation_time': 1.5}
+        with app.app_context(), patch.object(image_generator, 'generate_image', new=AsyncMock(return_value=result)):
+            with count_queries() as statements:
+                outcome = asyncio.run(process_image_generation(request_id))
+            assert [s.split()[0] for s in statements] == ['SELECT', 'INSERT', 'UPDATE']
+
+        with app.app_context():
+            generation = db.session.get(ImageGeneration, request_id)
+            assert generation.status == 'completed'
+            assert generation.started_at is not None
+            assert generation.result_image_id == outcome['image_id']
+            assert db.session.get(GeneratedImage, outcome['image_id']).image_url == 'https://img/1.png'
+
+    def test_failure_recorded(self, client, request_id):
+        with app.app_context(), patch.object(image_generator, 'generate_image',
+                                             new=AsyncMock(side_effect=ImageGenerationError('down'))):
+            outcome = asyncio.run(process_image_generation(request_id))
+        assert outcome == {'success': False, 'request_id': request_id, 'error': 'down'}
+
+        with app.app_context():
+            generation = db.session.get(ImageGeneration, request_id)
+            assert generation.status == 'failed'
+            assert generation.retry_count == 1
+            assert db.session.get(GeneratedImage, generation.result_image_id).error_message == 'down'
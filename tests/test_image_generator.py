@@ -0,0 +1,298 @@
+"""
+Test ImageGenerator provider calls and caching
+"""
+import asyncio
+import base64
+import httpx
+import pytest
+import image_gen_utils
+from unittest.mock import AsyncMock, patch
+from image_gen_utils import ImageGenerator, ImageGenerationError, ImageResultCache, _Breaker, _get_client, close_http_client
+
+
+class TestEnhancementCache:
+    """Test the prompt enhancement cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_prompts_hit_cache(self):
+        generator = ImageGenerator()
+        with patch('llm_utils.call_llm', new=AsyncMock(return_value=' Neon-lit alley ')) as llm:
+            assert await generator.enhance_prompt_for_shadowrun('A dark alley', 'Session: s1') == 'Neon-lit alley'
+            # Case, punctuation and spacing differences still hit
+            assert await generator.enhance_prompt_for_shadowrun('a dark  alley!', 'Session: s1') == 'Neon-lit alley'
+            await generator.enhance_prompt_for_shadowrun('A dark alley', 'Session: s2')
+        assert llm.await_count == 2
+        assert generator.enhancement_stats == {'hits': 1, 'misses': 2}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_call(self):
+        generator = ImageGenerator()
+
+        async def slow_llm(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return 'Rooftop chase'
+        with patch('llm_utils.call_llm', new=AsyncMock(side_effect=slow_llm)) as llm:
+            results = await asyncio.gather(*(generator.enhance_prompt_for_shadowrun('Rooftop') for _ in range(5)))
+        assert results == ['Rooftop chase'] * 5
+        assert llm.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_not_cached(self):
+        generator = ImageGenerator()
+        with patch('llm_utils.call_llm', new=AsyncMock(side_effect=RuntimeError('down'))):
+            fallback = await generator.enhance_prompt_for_shadowrun('Street market')
+        assert fallback.startswith('Street market, cyberpunk aesthetic')
+
+        with patch('llm_utils.call_llm', new=AsyncMock(return_value='Bustling market')):
+            assert await generator.enhance_prompt_for_shadowrun('Street market') == 'Bustling market'
+
+
+class TestResultCache:
+    """Test the provider result cache"""
+
+    @staticmethod
+    def dalle_response(url='https://img/1.png'):
+        request = httpx.Request('POST', 'https://api.openai.com/v1/images/generations')
+        return httpx.Response(200, json={'data': [{'url': url, 'revised_prompt': 'Revised'}]}, request=request)
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_cached(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=self.dalle_response())) as post:
+            first = await generator.generate_with_dalle('Neon alley')
+            second = await generator.generate_with_dalle('Neon alley')
+            await generator.generate_with_dalle('Neon alley', quality='hd')
+        assert post.await_count == 2
+        assert 'cached' not in first
+        assert second['cached'] is True
+        assert second['generation_time'] == 0
+        assert second['image_url'] == first['image_url']
+        assert generator.result_cache.stats == {'hits': 1, 'misses': 2}
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        failure = httpx.Response(400, text='bad prompt', request=httpx.Request('POST', 'https://api.openai.com'))
+        with patch('httpx.AsyncClient.post', new=AsyncMock(side_effect=[failure, self.dalle_response()])):
+            with pytest.raises(Exception):
+                await generator.generate_with_dalle('Neon alley')
+            assert (await generator.generate_with_dalle('Neon alley'))['image_url'] == 'https://img/1.png'
+
+    @pytest.mark.asyncio
+    async def test_stability_decodes_artifact(self):
+        generator = ImageGenerator()
+        generator.stability_api_key = 'test-key'
+        png = b'\x89PNG' + bytes(range(256))
+        encoded = base64.b64encode(png).decode()
+        response = httpx.Response(200, json={'artifacts': [{'base64': encoded}]},
+                                  request=httpx.Request('POST', 'https://api.stability.ai'))
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=response)):
+            result = await generator.generate_with_stability('Neon alley')
+        assert result['image_data'] == png
+        assert result['image_url'] == f'data:image/png;base64,{encoded}'
+
+    @pytest.mark.asyncio
+    async def test_images_stored_when_configured(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = generator.stability_api_key = 'test-key'
+        generator.image_store.bucket = 'renders'
+        generator.image_store.put = AsyncMock(side_effect=['https://cdn/gen/a.png', 'https://cdn/gen/b.png'])
+        request = httpx.Request('POST', 'https://api.stability.ai')
+        stability = httpx.Response(200, json={'artifacts': [{'base64': base64.b64encode(b'png').decode()}]}, request=request)
+        download = httpx.Response(200, content=b'dalle-png', headers={'Content-Type': 'image/png'}, request=request)
+        with patch('httpx.AsyncClient.post', new=AsyncMock(side_effect=[stability, self.dalle_response()])), \
+                patch('httpx.AsyncClient.get', new=AsyncMock(return_value=download)) as get:
+            assert (await generator.generate_with_stability('Alley'))['image_url'] == 'https://cdn/gen/a.png'
+            assert (await generator.generate_with_dalle('Alley'))['image_url'] == 'https://cdn/gen/b.png'
+        get.assert_awaited_once_with('https://img/1.png')
+        assert [call.args[0] for call in generator.image_store.put.await_args_list] == [b'png', b'dalle-png']
+
+    @pytest.mark.asyncio
+    async def test_provider_urls_expire_before_dalle_does(self):
+        now = [0.0]
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        generator.result_cache = ImageResultCache(timer=lambda: now[0])
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=self.dalle_response())) as post:
+            await generator.generate_with_dalle('Neon alley')
+            now[0] = ImageResultCache.PROVIDER_URL_TTL - 1
+            assert (await generator.generate_with_dalle('Neon alley'))['cached'] is True
+            now[0] = ImageResultCache.PROVIDER_URL_TTL + 1
+            assert 'cached' not in await generator.generate_with_dalle('Neon alley')
+        assert post.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_mirrored_urls_keep_full_ttl(self):
+        now = [0.0]
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        generator.result_cache = ImageResultCache(timer=lambda: now[0])
+        generator.image_store.bucket = 'renders'
+        generator.image_store.put = AsyncMock(return_value='https://cdn/gen/a.png')
+        download = httpx.Response(200, content=b'dalle-png', request=httpx.Request('GET', 'https://img/1.png'))
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=self.dalle_response())), \
+                patch('httpx.AsyncClient.get', new=AsyncMock(return_value=download)):
+            await generator.generate_with_dalle('Neon alley')
+            now[0] = 12 * 60 * 60
+            assert (await generator.generate_with_dalle('Neon alley'))['image_url'] == 'https://cdn/gen/a.png'
+        assert generator.result_cache.stats['hits'] == 1
+
+    def test_size_guard_counts_image_bytes(self):
+        cache = ImageResultCache()
+        cache.set('big', {'image_url': 'https://cdn/gen/a.png', 'image_data': bytes(ImageResultCache.MAX_ENTRY_BYTES)})
+        cache.set('small', {'image_url': 'https://cdn/gen/b.png', 'image_data': b'png'})
+        assert cache.get('big') is None
+        assert cache.get('small')['image_data'] == b'png'
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_retried(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        request = httpx.Request('POST', 'https://api.openai.com')
+        responses = [
+            httpx.Response(429, headers={'Retry-After': '3'}, request=request),
+            httpx.ConnectError('reset', request=request),
+            httpx.Response(503, request=request),
+            self.dalle_response(),
+        ]
+        with patch('httpx.AsyncClient.post', new=AsyncMock(side_effect=responses)) as post, \
+                patch('image_gen_utils.asyncio.sleep', new=AsyncMock()) as sleep:
+            result = await generator.generate_with_dalle('Neon alley')
+        assert result['image_url'] == 'https://img/1.png'
+        assert post.await_count == 4
+        delays = [call.args[0] for call in sleep.await_args_list]
+        assert delays[0] == 3  # Retry-After honoured
+        assert 2 <= delays[1] < 3 and 4 <= delays[2] < 5
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        overloaded = httpx.Response(503, text='busy', request=httpx.Request('POST', 'https://api.openai.com'))
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=overloaded)) as post, \
+                patch('image_gen_utils.asyncio.sleep', new=AsyncMock()):
+            with pytest.raises(ImageGenerationError, match='503'):
+                await generator.generate_with_dalle('Neon alley')
+        assert post.await_count == 4
+
+
+class TestProviderClient:
+    """Test the pooled provider HTTP client"""
+
+    @pytest.mark.asyncio
+    async def test_client_shared_per_loop(self):
+        client = _get_client()
+        assert _get_client() is client
+        await close_http_client()
+        assert client.is_closed
+        assert _get_client() is not client
+        await close_http_client()
+
+
+class TestProviderRace:
+    """Test racing several providers for one image"""
+
+    @pytest.fixture
+    def generator(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = generator.stability_api_key = 'test-key'
+        generator.enhance_prompt_for_shadowrun = AsyncMock(return_value='Enhanced')
+        return generator
+
+    @pytest.mark.asyncio
+    async def test_first_success_wins(self, generator):
+        cancelled = []
+
+        async def slow_dalle(prompt, **kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append('dalle')
+                raise
+
+        async def fast_stability(prompt, **kwargs):
+            return {'success': True, 'provider': 'stability', 'prompt': prompt}
+        generator.generate_with_dalle = slow_dalle
+        generator.generate_with_stability = fast_stability
+
+        result = await generator.generate_image('Alley', provider='auto', context='Session: s1')
+        assert result['provider'] == 'stability'
+        assert result['prompt'] == 'Enhanced'
+        await asyncio.sleep(0)
+        assert cancelled == ['dalle']
+        generator.enhance_prompt_for_shadowrun.assert_awaited_once_with('Alley', 'Session: s1')
+
+    @pytest.mark.asyncio
+    async def test_failover_and_total_failure(self, generator):
+        generator.generate_with_dalle = AsyncMock(side_effect=ImageGenerationError('rate limited'))
+        generator.generate_with_stability = AsyncMock(return_value={'success': True, 'provider': 'stability'})
+        assert (await generator.generate_image_race('Alley'))['provider'] == 'stability'
+
+        generator.generate_with_stability = AsyncMock(side_effect=ImageGenerationError('down'))
+        with pytest.raises(ImageGenerationError, match='All providers failed'):
+            await generator.generate_image_race('Alley')
+
+
+class TestProviderConcurrency:
+    """Test the per-provider in-flight limit"""
+
+    @pytest.mark.asyncio
+    async def test_requests_capped(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        in_flight = peak = 0
+
+        async def post(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={'data': [{'url': 'https://img/1.png'}]},
+                                  request=httpx.Request('POST', 'https://api.openai.com'))
+        with patch.dict('image_gen_utils.PROVIDER_CONCURRENCY', {'dalle': 2}), \
+                patch('httpx.AsyncClient.post', new=AsyncMock(side_effect=post)):
+            await asyncio.gather(*(generator.generate_with_dalle(f'Alley {i}') for i in range(6)))
+        assert peak == 2
+
+
+class TestCircuitBreaker:
+    """Test fast-failing a provider during an outage"""
+
+    @pytest.fixture
+    def generator(self):
+        generator = ImageGenerator()
+        generator.openai_api_key = 'test-key'
+        with patch.dict('image_gen_utils._BREAKERS', {'dalle': _Breaker(), 'stability': _Breaker()}), \
+                patch('image_gen_utils.PROVIDER_MAX_ATTEMPTS', 1):
+            yield generator
+
+    @pytest.mark.asyncio
+    async def test_opens_after_outages(self, generator):
+        request = httpx.Request('POST', 'https://api.openai.com')
+        outage = httpx.Response(502, request=request)
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=outage)) as post:
+            for _ in range(5):
+                with pytest.raises(ImageGenerationError, match='502'):
+                    await generator.generate_with_dalle(f'Alley {_}')
+            with pytest.raises(ImageGenerationError, match='circuit open'):
+                await generator.generate_with_dalle('Alley 6')
+        assert post.await_count == 5
+
+        success = httpx.Response(200, json={'data': [{'url': 'https://img/1.png'}]}, request=request)
+        image_gen_utils._BREAKERS['dalle'].opened_at -= 31  # Cooldown elapsed
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=success)):
+            # Half-open trial succeeds and closes the circuit
+            assert (await generator.generate_with_dalle('Alley 7'))['image_url'] == 'https://img/1.png'
+            assert (await generator.generate_with_dalle('Alley 8'))['image_url'] == 'https://img/1.png'
+
+    @pytest.mark.asyncio
+    async def test_rejected_prompts_do_not_trip(self, generator):
+        rejected = httpx.Response(400, request=httpx.Request('POST', 'https://api.openai.com'))
+        with patch('httpx.AsyncClient.post', new=AsyncMock(return_value=rejected)) as post:
+            for i in range(7):
+                with pytest.raises(ImageGenerationError, match='400'):
+                    await generator.generate_with_dalle(f'Alley {i}')
+        assert post.await_count == 7
@@ -0,0 +1,85 @@
+"""
+Test the streaming LLM endpoint
+"""
+import json
+import uuid
+import pytest
+from unittest.mock import patch
+from app import app, db, Session, UserRole, invalidate_session_cache
+
+
+class TestLlmStream:
+    """Test SSE output of /api/llm"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def session_id(self, client):
+        session_id = f'llm-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+            db.session.add(UserRole(session_id=session_id, user_id='player-1', role='player'))
+            db.session.commit()
+        yield session_id
+        invalidate_session_cache(session_id)
+
+    def test_streams_every_chunk(self, client, session_id):
+        async def fake_stream():
+            for chunk in ('The ', 'rain ', 'falls.'):
+                yield chunk
+
+        async def fake_call_llm(*args, **kwargs):
+            return fake_stream()
+
+        with patch('app.call_llm', fake_call_llm):
+            response = client.post('/api/llm', json={
+                'session_id': session_id,
+                'user_id': 'player-1',
+                'input': 'Describe the street',
+            })
+            body = response.get_data(as_text=True)
+
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['X-Accel-Buffering'] == 'no'
+        frames = [json.loads(frame[len('data: '):]) for frame in body.split('\n\n') if frame]
+        assert frames == [{'speaker': 'AI', 'content': chunk} for chunk in ('The ', 'rain ', 'falls.')]
+
+    def test_stream_error_frame(self, client, session_id):
+        async def failing_call_llm(*args, **kwargs):
+            raise RuntimeError('provider down')
+
+        payload = {'session_id': session_id, 'user_id': 'player-1', 'input': 'Describe the street'}
+        with patch('app.call_llm', failing_call_llm):
+            body = client.post('/api/llm', json=payload).get_data(as_text=True)
+            debug_body = client.post('/api/llm?debug=1', json=payload).get_data(as_text=True)
+
+        frame = json.loads(body[len('data: '):])
+        assert frame['type'] == 'internal'
+        assert frame['details'] == 'provider down'
+        assert 'trace' not in frame
+        assert 'RuntimeError' in json.loads(debug_body[len('data: '):])['trace']
+
+
+class TestCommandRoute:
+    """Test the non-streaming /api/command endpoint"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            yield client
+
+    def test_command_response(self, client):
+        async def fake_call_llm(model, messages, model_name=None):
+            return f'{model}:{messages[0]["content"]}'
+
+        with patch('app.call_llm', fake_call_llm):
+            data = client.post('/api/command', json={'command': 'roll initiative', 'model': 'mistral'}).get_json()
+        assert data['status'] == 'success'
+        assert data['llm_response'] == 'mistral:roll initiative'
@@ -0,0 +1,83 @@
+"""
+Test the cached session / role lookups used by permission checks
+"""
+import uuid
+import pytest
+from app import app, db, Session, UserRole, get_session_info, get_user_role, invalidate_session_cache, invalidate_scene_cache
+
+
+class TestLookupCache:
+    """Test session and role lookup caching and invalidation"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def session_id(self, client):
+        session_id = f'cache-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Cached', gm_user_id='gm-123'))
+            db.session.commit()
+        yield session_id
+        invalidate_session_cache(session_id)
+        invalidate_scene_cache(session_id)
+
+    def test_session_info_snapshot(self, client, session_id):
+        with app.app_context():
+            info = get_session_info(session_id)
+            assert info.id == session_id
+            assert info.gm_user_id == 'gm-123'
+
+            # Served from cache even after the row changes underneath
+            db.session.get(Session, session_id).gm_user_id = 'gm-456'
+            db.session.commit()
+            assert get_session_info(session_id).gm_user_id == 'gm-123'
+
+            invalidate_session_cache(session_id)
+            assert get_session_info(session_id).gm_user_id == 'gm-456'
+
+    def test_missing_lookups_not_cached(self, client):
+        session_id = f'cache-test-{uuid.uuid4()}'
+        with app.app_context():
+            assert get_session_info(session_id) is None
+            db.session.add(Session(id=session_id, name='Late', gm_user_id='gm-123'))
+            db.session.commit()
+            assert get_session_info(session_id) is not None
+        invalidate_session_cache(session_id)
+
+    def test_join_invalidates_role(self, client, session_id):
+        with app.app_context():
+            assert get_user_role(session_id, 'player-1') is None
+
+        response = client.post(f'/api/session/{session_id}/join', json={'user_id': 'player-1'})
+        assert response.status_code == 200
+
+        with app.app_context():
+            assert get_user_role(session_id, 'player-1') == 'player'
+            role = UserRole.query.filter_by(session_id=session_id, user_id='player-1').first()
+            role.role = 'observer'
+            db.session.commit()
+            assert get_user_role(session_id, 'player-1') == 'player'
+
+            invalidate_session_cache(session_id, 'player-1')
+            assert get_user_role(session_id, 'player-1') == 'observer'
+
+    def test_scene_cache_invalidated_on_update(self, client, session_id):
+        url = f'/api/session/{session_id}/scene'
+        assert client.get(url).get_json()['summary'] == ''
+
+        response = client.post(url, json={'user_id': 'gm-123', 'summary': 'Rain over Seattle'})
+        assert response.status_code == 200
+        assert client.get(url).get_json()['summary'] == 'Rain over Seattle'
+
+    def test_session_users_invalidated_on_join(self, client, session_id):
+        url = f'/api/session/{session_id}/users'
+        assert client.get(url).get_json() == []
+
+        client.post(f'/api/session/{session_id}/join', json={'user_id': 'player-1'})
+        assert client.get(url).get_json() == [{'user_id': 'player-1', 'role': 'player'}]
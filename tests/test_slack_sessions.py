@@ -0,0 +1,161 @@
+"""
+Test Slack session helpers and request verification
+"""
+import asyncio
+import hashlib
+import hmac
+import threading
+import time
+import warnings
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.exc import SAWarning
+from app import (
+    app, db, Session, UserRole, SlackSession, PendingResponse, DmNotification, SLACK_NO_SESSION_TEXT,
+    create_session_for_slack, flush_write_queue, get_slack_session_info, get_user_role, lookup_slack_channel_session,
+    notify_slack_on_dm_review, process_slack_ai_request, run_async, slack_bot, slack_processor,
+)
+
+
+class TestSlackSessionInfo:
+    """Test looking up a session from its Slack channel"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    def test_session_info_with_players(self, client, count_queries):
+        team_id, channel_id = f'T{uuid.uuid4().hex[:8]}', f'C{uuid.uuid4().hex[:8]}'
+        session_id = f'slack-test-{uuid.uuid4()}'
+        with app.app_context():
+            db.session.add(Session(id=session_id, name='Docks Run', gm_user_id='U-GM'))
+            db.session.add(SlackSession(slack_team_id=team_id, slack_channel_id=channel_id, session_id=session_id))
+            db.session.add_all([
+                UserRole(session_id=session_id, user_id='U-GM', role='gm'),
+                UserRole(session_id=session_id, user_id='U-1', role='player'),
+            ])
+            db.session.commit()
+
+            db.session.expunge_all()
+            with count_queries() as statements:
+                info = asyncio.run(get_slack_session_info(f'{team_id}_{channel_id}'))
+            assert len(statements) == 1
+            assert info['session_id'] == session_id
+            assert info['name'] == 'Docks Run'
+            assert sorted(p['user_id'] for p in info['players']) == ['U-1', 'U-GM']
+            assert info['created_at'] is not None
+
+            assert asyncio.run(get_slack_session_info(f'{team_id}_unknown')) is None
+
+    def test_create_session_and_submit_ai_request(self, client):
+        team_id, channel_id = f'T{uuid.uuid4().hex[:8]}', f'C{uuid.uuid4().hex[:8]}'
+        with app.app_context():
+            created = asyncio.run(create_session_for_slack('Barrens', 'U-GM', channel_id, team_id))
+            assert lookup_slack_channel_session(f'{team_id}_{channel_id}') == created['session_id']
+            assert db.session.get(Session, created['session_id']).name == 'Barrens'
+            assert get_user_role(created['session_id'], 'U-GM') == 'gm'
+
+            llm_reply = {'choices': [{'message': {'content': 'The fixer nods.'}}]}
+            with patch('llm_utils.call_openai', AsyncMock(return_value=llm_reply)), \
+                    patch.object(slack_bot, 'send_message', AsyncMock()) as send:
+                asyncio.run(process_slack_ai_request(f'{team_id}_{channel_id}', 'U-1', 'I call my fixer', channel_id))
+            flush_write_queue()
+
+            pending = PendingResponse.query.filter_by(session_id=created['session_id']).one()
+            assert pending.ai_response == 'The fixer nods.'
+            assert pending.id[:8] in str(send.call_args.kwargs['blocks'])
+            assert DmNotification.query.filter_by(pending_response_id=pending.id, dm_user_id='U-GM').count() == 1
+
+    def test_ai_request_without_session(self, client):
+        with app.app_context(), patch.object(slack_bot, 'send_message', AsyncMock()) as send:
+            asyncio.run(process_slack_ai_request('T0_C0', 'U-1', 'Hello', 'C0'))
+        assert send.call_args.kwargs['text'] == SLACK_NO_SESSION_TEXT
+
+    def test_notify_on_dm_review(self, client, count_queries):
+        team_id, channel_id = f'T{uuid.uuid4().hex[:8]}', f'C{uuid.uuid4().hex[:8]}'
+        with app.app_context():
+            created = asyncio.run(create_session_for_slack('Barrens', 'U-GM', channel_id, team_id))
+            pending = PendingResponse(session_id=created['session_id'], user_id='U-1', context='Q',
+                                      ai_response='A', response_type='slack_ai')
+            db.session.add(pending)
+            db.session.commit()
+            pending_id = pending.id
+
+            with patch.object(slack_bot, 'send_message', AsyncMock()) as send, count_queries() as statements, \
+                    warnings.catch_warnings():
+                warnings.simplefilter('error', SAWarning)  # No cartesian product
+                asyncio.run(notify_slack_on_dm_review(created['session_id'], pending_id, 'rejected', None))
+            assert len(statements) == 1
+            assert send.call_args.kwargs['channel'] == channel_id
+            assert send.call_args.kwargs['ephemeral_user'] == 'U-1'
+
+            with patch.object(slack_bot, 'send_message', AsyncMock()) as send:
+                asyncio.run(notify_slack_on_dm_review(created['session_id'], 'missing', 'approved', 'A'))
+                # A response from another session is not announced in this channel
+                other = asyncio.run(create_session_for_slack('Redmond', 'U-GM', f'{channel_id}X', team_id))
+                asyncio.run(notify_slack_on_dm_review(other['session_id'], pending_id, 'approved', 'A'))
+            send.assert_not_called()
+
+
+class TestSlackCommands:
+    """Test that slash commands answer without waiting on the work they start"""
+
+    def test_ai_command_replies_before_processing(self):
+        started, release = threading.Event(), threading.Event()
+
+        async def slow_request(**kwargs):
+            started.set()
+            await asyncio.to_thread(release.wait, 5)
+
+        command = {'command': '/sr-ai', 'text': 'Scan the room', 'user_id': 'U-1', 'channel_id': 'C1', 'team_id': 'T1'}
+        try:
+            with patch('app.process_slack_ai_request', slow_request):
+                reply = run_async(slack_processor.process_command(command), timeout=2)
+                assert 'Processing request' in str(reply['blocks'])
+                assert started.wait(2)
+        finally:
+            release.set()
+
+    def test_send_message_runs_off_the_loop(self):
+        client = MagicMock()
+        client.chat_postMessage.side_effect = lambda **kwargs: MagicMock(data={'thread': threading.current_thread()})
+        with patch.object(slack_bot, 'client', client):
+            sent = run_async(slack_bot.send_message('C1', 'Hoi chummer'), timeout=2)
+        assert sent['thread'].name != 'async-loop'
+        assert client.chat_postMessage.call_args.kwargs['channel'] == 'C1'
+
+
+class TestSlackSignature:
+    """Test Slack request signing checks"""
+
+    SECRET = b'test-signing-secret'
+
+    def sign(self, body, timestamp):
+        digest = hmac.new(self.SECRET, f'v0:{timestamp}:'.encode() + body, hashlib.sha256).hexdigest()
+        return {'X-Slack-Request-Timestamp': str(timestamp), 'X-Slack-Signature': f'v0={digest}'}
+
+    def test_verify_raw_body(self):
+        body = b'token=abc&command=%2Fsr-roll&text=3d6'
+        now = int(time.time())
+        with patch.object(slack_bot, 'signing_key', self.SECRET):
+            assert slack_bot.verify_slack_request(self.sign(body, now), body)
+            assert slack_bot.verify_slack_request(self.sign(body, now), body.decode())
+            assert not slack_bot.verify_slack_request(self.sign(body, now), body + b'&x=1')
+            assert not slack_bot.verify_slack_request(self.sign(body, now - 400), body)
+            assert not slack_bot.verify_slack_request(self.sign(body, now + 120), body)
+            assert not slack_bot.verify_slack_request({'X-Slack-Request-Timestamp': 'soon'}, body)
+        with patch.object(slack_bot, 'signing_key', None):
+            assert not slack_bot.verify_slack_request(self.sign(body, now), body)
+
+    def test_events_endpoint_checks_signature(self):
+        body = b'{"type": "url_verification", "challenge": "xyz"}'
+        headers = {**self.sign(body, int(time.time())), 'Content-Type': 'application/json'}
+        with patch.object(slack_bot, 'signing_key', self.SECRET), app.test_client() as client:
+            assert client.post('/api/slack/events', data=body, headers=headers).get_json() == {'challenge': 'xyz'}
+            headers['X-Slack-Signature'] = 'v0=forged'
+            assert client.post('/api/slack/events', data=body, headers=headers).status_code == 401
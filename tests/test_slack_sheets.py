@@ -0,0 +1,269 @@
+"""
+Test Slack character sheet detection and parsing
+"""
+import asyncio
+import threading
+import time
+import uuid
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app import app, db, Session, Character
+from integrations.character_sheet_manager import _load_extra
+from integrations.slack_integration import SlackCharacterSheet, SlackCharacterSheetSync, _now_iso
+
+SHEET = """Kestrel Vance - Shadowrun 6E
+Handle: "Ghost"
+Archetype: Street Samurai
+Body: 5
+Agility = 6
+Reaction 4
+Edge: 2
+Firearms: 6 (Pistols +2)
+Close Combat: 4
+Stealth: 3
+Essence: 4.2
+Initiative: 9
+Karma: 12
+Nuyen: 15,250
+"""
+
+
+@pytest.fixture
+def slack():
+    return SlackCharacterSheet(slack_token='xoxb-test')
+
+
+class TestSheetDetection:
+    """Test recognising sheets posted as plain messages"""
+
+    def test_sheet_text(self, slack):
+        assert slack._is_character_sheet_text(SHEET)
+        # Greedy Handle/Archetype signals must not hide the lines after them
+        assert slack._is_character_sheet_text('Handle: Ghost\nArchetype: Samurai\nBody: 5')
+
+    def test_repeated_signal_counts_once(self, slack):
+        assert not slack._is_character_sheet_text('Body: 5 Agility: 6 Edge: 2')
+        assert not slack._is_character_sheet_text('Anyone up for a run tonight?')
+        assert not slack._is_character_sheet_text('Physical Monitor full, Stun Monitor too, 500 nuyen gone')
+
+    def test_stops_at_third_signal(self, slack):
+        matches = iter([MagicMock(lastgroup=f's{i}') for i in (0, 0, 7, 4, 5)])
+        with patch('integrations.slack_integration._SHEET_SIGNATURE_RE') as pattern:
+            pattern.finditer.return_value = matches
+            assert slack._is_character_sheet_text('Body: 5')
+            # Without a colon the scan never runs
+            assert not slack._is_character_sheet_text('Physical Monitor and nuyen')
+        assert pattern.finditer.call_count == 1
+        assert [match.lastgroup for match in matches] == ['s5']
+
+
+class TestSheetParsing:
+    """Test extracting character data from sheet text"""
+
+    def test_parse_sheet(self, slack):
+        data = slack._parse_shadowrun_data(SHEET)
+        assert data['name'] == 'Kestrel Vance'
+        assert data['handle'] == 'Ghost'
+        assert data['archetype'] == 'Street Samurai'
+        assert data['attributes'] == {'body': 5, 'agility': 6, 'reaction': 4, 'edge': 2}
+        assert data['skills'] == {'firearms': 6, 'close_combat': 4, 'stealth': 3}
+        assert (data['essence'], data['initiative'], data['karma'], data['nuyen']) == (4.2, 9, 12, 15250)
+
+    def test_attributes_single_scan(self, slack):
+        data = slack._parse_shadowrun_data('Street knowledge 3\nLOGIC=6 Edge 2\nBodyguard: 4\nLogic: 1')
+        assert data['attributes'] == {'logic': 6, 'edge': 2}
+
+    def test_fields_share_one_scan(self, slack):
+        data = slack._parse_shadowrun_data('Archetype: Decker Karma: 7\n¥: 900\nKarma: 99\nEssence: 5.5')
+        assert data['archetype'] == 'Decker Karma: 7'
+        assert (data['karma'], data['nuyen'], data['essence']) == (7, 900, 5.5)
+
+    def test_parse_empty(self, slack):
+        data = slack._parse_shadowrun_data('')
+        assert data['name'] == '' and data['attributes'] == {} and data['skills'] == {}
+        assert data['essence'] == 6.0
+
+    def test_only_known_skills(self, slack):
+        data = slack._parse_shadowrun_data('Conjuring = 5\nCon 2\nBasket Weaving: 4\nSTEALTH: 3\nPistols: 6')
+        assert data['skills'] == {'conjuring': 5, 'con': 2, 'stealth': 3}
+
+
+class TestSlackCalls:
+    """Test Slack API calls and file downloads"""
+
+    def test_searches_overlap(self, slack):
+        in_flight = peak = 0
+        lock = threading.Lock()
+
+        def search_messages(query, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            if 'runner profile' in query:
+                raise RuntimeError('search unavailable')
+            files = [{'id': 'F1', 'name': 'ghost-character.pdf', 'filetype': 'pdf'}]
+            return MagicMock(data={'messages': [
+                {'ts': '1700000000.1', 'user': 'U1', 'files': files},
+                {'ts': '1700000000.2', 'user': 'U2', 'text': SHEET},
+                {'ts': '1700000000.3', 'user': 'U2', 'text': 'Who has the nuyen?'},
+            ]})
+        slack.client.search_messages = search_messages
+
+        sheets = asyncio.run(slack.find_character_sheets('C1'))
+        assert peak > 1
+        assert [(sheet['type'], sheet['timestamp']) for sheet in sheets] == [
+            ('message', '1700000000.2'), ('file', '1700000000.1')
+        ]
+
+    def test_calls_run_off_loop(self, slack):
+        threads = []
+
+        def chat_update(**kwargs):
+            threads.append(threading.get_ident())
+            return {'ok': True}
+        slack.client.chat_update = chat_update
+        assert asyncio.run(slack.update_character_in_slack('C1', '1700000000.2', {'name': 'Ghost'}))
+        assert threads and threads[0] != threading.get_ident()
+
+    def test_download_streams_file(self, slack):
+        slack.client.files_info = MagicMock(return_value={'file': {'url_private': 'https://files.slack.com/F1', 'filetype': 'txt'}})
+        body = SHEET.encode() * 2000
+        seen = {}
+
+        def handler(request):
+            seen['auth'] = request.headers['Authorization']
+            return httpx.Response(200, content=body)
+
+        async def download():
+            transport = httpx.MockTransport(handler)
+            with patch('integrations.slack_integration._get_client', return_value=httpx.AsyncClient(transport=transport)):
+                return await slack.download_character_sheet_file('F1')
+        assert asyncio.run(download()) == (body, 'txt')
+        assert seen['auth'] == 'Bearer xoxb-test'
+
+
+class TestParseCache:
+    """Test reusing parses of unchanged sheets"""
+
+    def test_unchanged_file_reused(self, slack):
+        info = {'file': {'url_private': 'https://files.slack.com/F1', 'filetype': 'txt', 'updated': 1700000000}}
+        slack.client.files_info = MagicMock(return_value=info)
+        slack.download_character_sheet_file = AsyncMock(return_value=(SHEET.encode(), 'txt'))
+
+        first = asyncio.run(slack.parse_character_sheet_file('F1'))
+        first['name'] = 'Changed'
+        assert asyncio.run(slack.parse_character_sheet_file('F1'))['name'] == 'Kestrel Vance'
+        assert slack.download_character_sheet_file.await_count == 1
+
+        info['file']['updated'] = 1700000100
+        asyncio.run(slack.parse_character_sheet_file('F1'))
+        assert slack.download_character_sheet_file.await_count == 2
+
+    def test_edited_message_reparsed(self, slack):
+        message = {'ts': '1700000000.2', 'user': 'U2', 'text': SHEET}
+        slack.client.conversations_history = MagicMock(return_value={'messages': [message]})
+        with patch.object(slack, '_parse_shadowrun_data', wraps=slack._parse_shadowrun_data) as parse:
+            asyncio.run(slack.parse_character_sheet_from_message('C1', '1700000000.2'))
+            data = asyncio.run(slack.parse_character_sheet_from_message('C1', '1700000000.2'))
+            assert parse.call_count == 1
+            assert data['message_ts'] == '1700000000.2'
+
+            message.update(text=SHEET.replace('Karma: 12', 'Karma: 20'), edited={'ts': '1700000500.0'})
+            assert asyncio.run(slack.parse_character_sheet_from_message('C1', '1700000000.2'))['karma'] == 20
+            assert parse.call_count == 2
+
+
+class TestTimestamps:
+    """Test the per-second ISO timestamp"""
+
+    def test_formatted_once_per_second(self):
+        with patch('integrations.slack_integration.time.time', side_effect=[1700000000.1, 1700000000.9, 1700000001.0]):
+            first = _now_iso()
+            assert first == '2023-11-14T22:13:20+00:00'
+            assert _now_iso() is first
+            assert _now_iso() == '2023-11-14T22:13:21+00:00'
+
+    def test_update_footer(self, slack):
+        slack.client.chat_update = MagicMock(return_value={'ok': True})
+        with patch('integrations.slack_integration.time.time', return_value=1700000000.5):
+            asyncio.run(slack.update_character_in_slack('C1', '1.2', {'name': 'Ghost'}))
+        text = slack.client.chat_update.call_args.kwargs['text']
+        assert text.endswith('_Updated by WREN at 2023-11-14 22:13:20 UTC_')
+
+
+class TestSlackSync:
+    """Test writing Slack sheets and sync metadata to the character"""
+
+    @pytest.fixture
+    def client(self):
+        app.config['TESTING'] = True
+        with app.test_client() as client:
+            with app.app_context():
+                db.create_all()
+                yield client
+
+    @pytest.fixture
+    def character(self, client):
+        session_id = f'slack-sheet-test-{uuid.uuid4()}'
+        db.session.add(Session(id=session_id, name='Test', gm_user_id='gm-123'))
+        character = Character(session_id=session_id, user_id='player-1', name='Kestrel')
+        db.session.add(character)
+        db.session.commit()
+        # Integration references are not a mapped column in this schema
+        character.extra_data = '{"slack": {"channel_id": "C1", "reference": {"type": "message", "message_ts": "1.2"}}}'
+        return character
+
+    def test_push_records_timestamp(self, character):
+        slack = MagicMock(update_character_in_slack=AsyncMock(return_value=True))
+        sync = SlackCharacterSheetSync(slack, db.session)
+        assert asyncio.run(sync.push_updates_to_slack(character.id, {'name': 'Ghost'})) is True
+        slack.update_character_in_slack.assert_awaited_once_with('C1', '1.2', {'name': 'Ghost'})
+        assert _load_extra(character)['slack']['last_update_push']
+        assert '"channel_id":"C1"' in character.extra_data
+
+    def test_sync_updates_existing_character(self, character):
+        slack = MagicMock(parse_character_sheet_from_message=AsyncMock(return_value={
+            'name': 'Kestrel Vance', 'handle': 'Ghost', 'archetype': 'Decker',
+            'attributes': {'logic': 6}, 'skills': {'cracking': 5}, 'qualities': {'positive': ['Guts']},
+        }))
+        sync = SlackCharacterSheetSync(slack, db.session)
+        reference = {'type': 'message', 'message_ts': '1.3'}
+        result = asyncio.run(sync.sync_from_slack('C2', 'player-1', character.session_id, reference))
+        assert result['status'] == 'success' and result['character_id'] == character.id
+        assert result['sync_time'].endswith('+00:00')
+        assert _load_extra(character)['slack'] == {'channel_id': 'C2', 'reference': reference, 'last_sync': result['sync_time']}
+
+        db.session.expire_all()
+        stored = db.session.get(Character, character.id)
+        assert (stored.name, stored.handle, stored.archetype) == ('Kestrel Vance', 'Ghost', 'Decker')
+        assert stored.skills == '{"cracking":5}'
+
+    def test_sync_many_single_commit(self, character, count_queries):
+        parsed = {'1.3': {'name': 'Kestrel Vance', 'skills': {'stealth': 4}}, '1.4': {'name': 'Rook'}}
+
+        async def parse_message(channel_id, message_ts):
+            if message_ts not in parsed:
+                raise ValueError('Message not found')
+            return parsed[message_ts]
+        slack = MagicMock(parse_character_sheet_from_message=AsyncMock(side_effect=parse_message))
+        sync = SlackCharacterSheetSync(slack, db.session)
+        sheets = [(user_id, {'type': 'message', 'message_ts': ts})
+                  for user_id, ts in (('player-1', '1.3'), ('player-2', '1.4'), ('player-3', '1.5'))]
+        with count_queries() as statements:
+            results = asyncio.run(sync.sync_many_from_slack('C1', character.session_id, sheets))
+        kinds = [s.split()[0] for s in statements]
+        # One UPDATE for the existing sheet, one storing the new row's cached JSON
+        assert (kinds.count('INSERT'), kinds.count('UPDATE')) == (1, 2)
+        assert sum(' IN (' in s for s in statements) == 1
+
+        assert [r['status'] for r in results] == ['success', 'success', 'error']
+        assert results[0]['character_id'] == character.id
+        assert results[1]['character_name'] == 'Rook'
+        assert results[2]['error'] == 'Message not found'
+        assert Character.query.filter_by(session_id=character.session_id).count() == 2
+        assert db.session.get(Character, character.id).skills == '{"stealth":4}'
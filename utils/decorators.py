@@ -155,10 +155,10 @@ def validate_session_access():
                 return jsonify({'error': 'Session ID required'}), 400
             
             # Import here to avoid circular imports
-            from app import Session, UserRole
+            from app import get_session_info, get_user_role
             
             # Check if session exists
-            session = Session.query.filter_by(id=session_id).first()
+            session = get_session_info(session_id)
             if not session:
                 return jsonify({'error': 'Session not found'}), 404
             
@@ -173,16 +173,13 @@ def validate_session_access():
                 return f(*args, **kwargs)
             
             # Check if user is a participant
-            user_role = UserRole.query.filter_by(
-                session_id=session_id,
-                user_id=user_id
-            ).first()
+            user_role = get_user_role(session_id, user_id)
             
             if not user_role:
                 return jsonify({'error': 'Access denied to this session'}), 403
             
             g.is_gm = False
-            g.user_session_role = user_role.role
+            g.user_session_role = user_role
             
             return f(*args, **kwargs)
         